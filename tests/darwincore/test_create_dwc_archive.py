@@ -1,18 +1,158 @@
 """
 Test cases for the wiutils.darwincore.create_dwc_archive function.
 """
+import numpy as np
+import pandas as pd
+import pytest
 
 import wiutils.darwincore
-from wiutils.darwincore import create_dwc_archive
+from wiutils.darwincore import create_dwc_archive, validate_dwc_archive
+
+
+@pytest.fixture(scope="function")
+def cameras():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001"],
+            "camera_id": [1, 2],
+            "make": ["Bushnell", "Reconyx"],
+            "serial_number": ["ABC", np.nan],
+            "year_purchased": [2018, 2019],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001", "AAA001"],
+            "deployment_id": ["001", "002", "003"],
+            "placename": ["AAA01", "AAA02", "AAA03"],
+            "camera_id": [1, 2, 1],
+            "start_date": ["2020-01-01", "2020-01-01", "2020-02-01"],
+            "end_date": ["2020-01-31", "2020-01-31", "2020-02-28"],
+            "latitude": [4.5, 4.6, 4.7],
+            "longitude": [-74.1, -74.2, -74.3],
+            "recorded_by": ["John Doe", "John Doe", "Jane Doe"],
+            "bait_type": ["None", "None", "Scent"],
+            "bait_description": [np.nan, np.nan, "Cat food"],
+            "quiet_period": [0, 0, 30],
+            "camera_functioning": ["Camera Functioning"] * 3,
+            "sensor_height": ["Knee height"] * 3,
+            "height_other": [np.nan] * 3,
+            "sensor_orientation": ["Parallel"] * 3,
+            "orientation_other": [np.nan] * 3,
+            "plot_treatment": [np.nan] * 3,
+            "plot_treatment_description": [np.nan] * 3,
+            "detection_distance": [np.nan, 5.0, np.nan],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001"] * 6,
+            "deployment_id": ["001", "001", "002", "002", "003", "003"],
+            "image_id": ["a1", "a2", "b1", "b2", "c1", "c2"],
+            "location": [
+                "gs://bucket/deployment/001/a1.jpg",
+                "gs://bucket/deployment/001/a2.jpg",
+                "gs://bucket/deployment/002/b1.jpg",
+                "gs://bucket/deployment/002/b2.jpg",
+                "gs://bucket/deployment/003/c1.jpg",
+                "gs://bucket/deployment/003/c2.jpg",
+            ],
+            "class": ["Mammalia", "Mammalia", np.nan, "Aves", "Mammalia", "Aves"],
+            "order": ["Carnivora", "Carnivora", np.nan, "Tinamiformes", np.nan, np.nan],
+            "family": ["Felidae", "Felidae", np.nan, "Tinamidae", np.nan, np.nan],
+            "genus": ["Panthera", "Panthera", np.nan, np.nan, np.nan, np.nan],
+            "species": ["onca", "onca", np.nan, np.nan, np.nan, np.nan],
+            "timestamp": [
+                "2020-01-02 10:00:00",
+                "2020-01-02 10:01:00",
+                "2020-01-03 12:00:00",
+                "2020-01-04 12:00:00",
+                "2020-02-05 08:00:00",
+                "2020-02-06 08:00:00",
+            ],
+            "number_of_objects": [1, 1, 0, 2, 1, 1],
+            "license": ["CC-BY"] * 6,
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def projects():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001"],
+            "project_admin_organization": ["Instituto Humboldt"],
+            "country_code": ["COL"],
+            "metadata_license": ["CC-BY"],
+        }
+    )
 
 
 def test_calls(mocker):
-    mocker.patch("wiutils.darwincore.create_dwc_event")
+    mocker.patch("wiutils.darwincore._build_dwc_event")
     mocker.patch("wiutils.darwincore.create_dwc_measurement")
-    mocker.patch("wiutils.darwincore.create_dwc_multimedia")
-    mocker.patch("wiutils.darwincore.create_dwc_occurrence")
+    mocker.patch("wiutils.darwincore._build_dwc_multimedia")
+    mocker.patch("wiutils.darwincore._build_dwc_occurrence")
+    mocker.patch("wiutils.darwincore._prepare_dwc_images")
     create_dwc_archive(None, None, None, None)
-    wiutils.darwincore.create_dwc_event.assert_called_once()
+    wiutils.darwincore._build_dwc_event.assert_called_once()
     wiutils.darwincore.create_dwc_measurement.assert_called_once()
-    wiutils.darwincore.create_dwc_multimedia.assert_called_once()
-    wiutils.darwincore.create_dwc_occurrence.assert_called_once()
+    wiutils.darwincore._build_dwc_multimedia.assert_called_once()
+    wiutils.darwincore._build_dwc_occurrence.assert_called_once()
+    wiutils.darwincore._prepare_dwc_images.assert_called_once()
+
+
+def test_measurement_arguments(mocker):
+    mocker.patch("wiutils.darwincore._build_dwc_event")
+    mocker.patch("wiutils.darwincore.create_dwc_measurement")
+    mocker.patch("wiutils.darwincore._build_dwc_multimedia")
+    mocker.patch("wiutils.darwincore._build_dwc_occurrence")
+    mocker.patch("wiutils.darwincore._prepare_dwc_images")
+    create_dwc_archive("cameras", "deployments", "images", "projects")
+    wiutils.darwincore.create_dwc_measurement.assert_called_once_with(
+        "deployments", "cameras"
+    )
+
+
+def test_event_ids(cameras, deployments, images, projects):
+    event, occurrence, measurement, multimedia = create_dwc_archive(
+        cameras, deployments, images, projects
+    )
+    assert event["eventID"].tolist() == ["001", "002", "003"]
+    assert occurrence["eventID"].tolist() == ["001", "002", "003", "003"]
+
+
+def test_valid(cameras, deployments, images, projects):
+    deployments.loc[2, "placename"] = "AAA01"
+    archive = create_dwc_archive(cameras, deployments, images, projects)
+    report = validate_dwc_archive(archive)
+    assert report.empty
+
+
+def test_duplicated_projects(cameras, deployments, images, projects):
+    result = create_dwc_archive(
+        cameras, deployments, images, pd.concat([projects, projects])
+    )
+    expected = create_dwc_archive(cameras, deployments, images, projects)
+    for result_table, expected_table in zip(result, expected):
+        pd.testing.assert_frame_equal(result_table, expected_table)
+
+
+def test_intact_input(cameras, deployments, images, projects):
+    cameras_original = cameras.copy()
+    deployments_original = deployments.copy()
+    images_original = images.copy()
+    projects_original = projects.copy()
+    create_dwc_archive(cameras, deployments, images, projects)
+    pd.testing.assert_frame_equal(cameras_original, cameras)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(projects_original, projects)
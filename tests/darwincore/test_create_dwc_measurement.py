@@ -110,6 +110,15 @@ def test_defaults(deployments, cameras, mocker, mapping):
     pd.testing.assert_frame_equal(result, expected)
 
 
+def test_no_remarks(deployments, cameras, mocker, mapping):
+    for item in mapping:
+        item["remarks"] = None
+    mocker.patch("wiutils._dwc.measurement.mapping", mapping)
+    result = create_dwc_measurement(deployments, cameras)
+    expected = pd.Series(np.full(7, np.nan), name="measurementRemarks")
+    pd.testing.assert_series_equal(result["measurementRemarks"], expected)
+
+
 def test_intact_input(deployments, cameras, mocker, mapping):
     mocker.patch("wiutils._dwc.measurement.mapping", mapping)
     deployments_original = deployments.copy()
@@ -78,6 +78,36 @@ def test_defaults(images, deployments):
     pd.testing.assert_frame_equal(result, expected)
 
 
+def test_categorical_location(images, deployments):
+    gcs_base_url = "https://console.cloud.google.com/storage/browser/"
+    images["location"] = images["location"].astype("category")
+    result = create_dwc_multimedia(images, deployments)
+    expected = pd.Series(
+        [
+            gcs_base_url + "bucket/deployment/001/abc123.jpg",
+            gcs_base_url + "bucket/deployment/001/def456.jpg",
+            gcs_base_url + "bucket/deployment/002/hij789.jpg",
+        ],
+        name="references",
+    )
+    pd.testing.assert_series_equal(result["references"].astype(str), expected)
+
+
+def test_n_jobs(images, deployments):
+    images = images.sample(frac=1, random_state=0)
+    result = create_dwc_multimedia(images, deployments, n_jobs=2)
+    expected = create_dwc_multimedia(images, deployments, n_jobs=1)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_n_jobs_missing_deployment(images, deployments):
+    images.loc[0, "deployment_id"] = np.nan
+    result = create_dwc_multimedia(images, deployments, n_jobs=2)
+    expected = create_dwc_multimedia(images, deployments, n_jobs=1)
+    assert len(result) == len(images)
+    pd.testing.assert_frame_equal(result, expected)
+
+
 def test_intact_input(images, deployments):
     images_original = images.copy()
     deployments_original = deployments.copy()
@@ -57,6 +57,7 @@ def projects():
         {
             "project_id": ["AAA001"],
             "project_admin_organization": ["Instituto Humboldt"],
+            "metadata_license": ["CC-BY"],
         }
     )
 
@@ -197,6 +198,66 @@ def test_remove_duplicate_kws(
     pd.testing.assert_frame_equal(result, expected)
 
 
+def test_associated_media_unsorted(deployments, images, projects):
+    gcs_base_url = "https://console.cloud.google.com/storage/browser/"
+    images = images.iloc[::-1].reset_index(drop=True)
+    result = create_dwc_occurrence(
+        images,
+        deployments,
+        projects,
+        remove_duplicate_kws=dict(interval=60, unit="minutes"),
+    )
+    result = result.set_index("recordNumber")["associatedMedia"].sort_index()
+    expected = pd.Series(
+        [
+            gcs_base_url + "bucket/deployment/002/740e09f5.jpg",
+            gcs_base_url
+            + "bucket/deployment/001/bc6534f0.jpg"
+            + "|"
+            + gcs_base_url
+            + "bucket/deployment/001/003cb8eb.jpg",
+            gcs_base_url + "bucket/deployment/002/e09axa3q.jpg",
+        ],
+        index=pd.Index(["740e09f5", "bc6534f0", "e09axa3q"], name="recordNumber"),
+        name="associatedMedia",
+    )
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_max_media(deployments, images, projects):
+    gcs_base_url = "https://console.cloud.google.com/storage/browser/"
+    result = create_dwc_occurrence(
+        images,
+        deployments,
+        projects,
+        remove_duplicate_kws=dict(interval=60, unit="minutes"),
+        max_media=1,
+    )
+    expected = pd.Series(
+        [
+            gcs_base_url + "bucket/deployment/001/bc6534f0.jpg",
+            gcs_base_url + "bucket/deployment/002/740e09f5.jpg",
+            gcs_base_url + "bucket/deployment/002/e09axa3q.jpg",
+        ],
+        name="associatedMedia",
+    )
+    pd.testing.assert_series_equal(result["associatedMedia"], expected)
+
+
+def test_occurrence_id(deployments, images, projects):
+    result = create_dwc_occurrence(images, deployments, projects)
+    expected = "AAA001:" + result["recordNumber"]
+    pd.testing.assert_series_equal(result["occurrenceID"], expected, check_names=False)
+    assert result["occurrenceID"].is_unique
+
+
+def test_n_jobs(deployments, images, projects):
+    images = images.sample(frac=1, random_state=0)
+    result = create_dwc_occurrence(images, deployments, projects, n_jobs=2)
+    expected = create_dwc_occurrence(images, deployments, projects, n_jobs=1)
+    pd.testing.assert_frame_equal(result, expected)
+
+
 def test_intact_input(images, deployments, projects):
     images_original = images.copy()
     deployments_original = deployments.copy()
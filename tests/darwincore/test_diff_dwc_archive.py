@@ -0,0 +1,145 @@
+"""
+Test cases for the wiutils.darwincore.diff_dwc_archive function.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.darwincore import diff_dwc_archive
+
+
+@pytest.fixture(scope="function")
+def event():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E02"],
+            "eventDate": ["2020-01-01/2020-01-31", "2020-02-01/2020-02-28"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def occurrence():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E01", "E02"],
+            "recordNumber": ["a1", "a2", "b1"],
+            "scientificName": ["Panthera onca", "Tinamidae", "Cuniculus paca"],
+            "organismQuantity": [1, 2, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def measurement():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E01", "E02"],
+            "measurementType": ["camera make", "camera height", "camera make"],
+            "measurementValue": ["Bushnell", "0.5", "Reconyx"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def multimedia():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E01", "E02"],
+            "identifier": ["a1.jpg", "a2.jpg", "b1.jpg"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def archive(event, occurrence, measurement, multimedia):
+    return event, occurrence, measurement, multimedia
+
+
+def test_no_manifest(archive):
+    changes, _ = diff_dwc_archive(archive)
+    for result, table in zip(changes, archive):
+        expected = table.assign(change="added")
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_unchanged(archive):
+    _, manifest = diff_dwc_archive(archive)
+    changes, _ = diff_dwc_archive(archive, manifest)
+    assert all(result.empty for result in changes)
+
+
+def test_changed(archive, occurrence, measurement):
+    _, manifest = diff_dwc_archive(archive)
+    occurrence.loc[1, "scientificName"] = "Crypturellus soui"
+    measurement.loc[2, "measurementValue"] = "Browning"
+    changes, _ = diff_dwc_archive(archive, manifest)
+    pd.testing.assert_frame_equal(
+        changes[1], occurrence.loc[[1]].reset_index(drop=True).assign(change="changed")
+    )
+    pd.testing.assert_frame_equal(
+        changes[2], measurement.loc[[2]].reset_index(drop=True).assign(change="changed")
+    )
+
+
+def test_added_removed(archive, event, multimedia):
+    _, manifest = diff_dwc_archive(archive)
+    multimedia = multimedia.drop(index=[1]).reset_index(drop=True)
+    multimedia.loc[2] = ["E02", "b2.jpg"]
+    changes, _ = diff_dwc_archive((event, archive[1], archive[2], multimedia), manifest)
+    expected = pd.DataFrame(
+        {
+            "eventID": ["E02", np.nan],
+            "identifier": ["b2.jpg", "a2.jpg"],
+            "change": ["added", "removed"],
+        }
+    )
+    pd.testing.assert_frame_equal(changes[3], expected)
+
+
+def test_dtypes(archive, event):
+    event["eventRemarks"] = np.nan
+    _, manifest = diff_dwc_archive(archive)
+    event["eventRemarks"] = event["eventRemarks"].astype(object)
+    changes, _ = diff_dwc_archive(archive, manifest)
+    assert changes[0].empty
+
+
+def test_removed_missing_key(archive, multimedia):
+    multimedia.loc[2, "identifier"] = np.nan
+    _, manifest = diff_dwc_archive(archive)
+    changes, _ = diff_dwc_archive(
+        (archive[0], archive[1], archive[2], multimedia.drop(index=[2])), manifest
+    )
+    expected = pd.DataFrame(
+        {"eventID": [np.nan], "identifier": [np.nan], "change": ["removed"]}
+    )
+    pd.testing.assert_frame_equal(changes[3], expected, check_dtype=False)
+
+
+def test_repeated_keys(archive, occurrence):
+    occurrence["recordNumber"] = "a1"
+    _, manifest = diff_dwc_archive(archive)
+    occurrence.loc[2, "organismQuantity"] = 3
+    changes, _ = diff_dwc_archive(archive, manifest)
+    pd.testing.assert_frame_equal(
+        changes[1], occurrence.loc[[2]].reset_index(drop=True).assign(change="changed")
+    )
+
+
+def test_json_manifest(archive, event):
+    _, manifest = diff_dwc_archive(archive)
+    manifest = json.loads(json.dumps(manifest))
+    event.loc[0, "eventDate"] = "2020-01-01/2020-01-30"
+    changes, _ = diff_dwc_archive(archive, manifest)
+    assert changes[0]["eventID"].tolist() == ["E01"]
+    assert all(result.empty for result in changes[1:])
+
+
+def test_intact_input(archive, event, occurrence, measurement, multimedia):
+    originals = [table.copy() for table in archive]
+    diff_dwc_archive(archive)
+    for original, table in zip(originals, archive):
+        pd.testing.assert_frame_equal(original, table)
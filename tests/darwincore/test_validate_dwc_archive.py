@@ -0,0 +1,188 @@
+"""
+Test cases for the wiutils.darwincore.validate_dwc_archive function.
+"""
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.darwincore import validate_dwc_archive
+
+
+@pytest.fixture(scope="function")
+def event():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E02", "E03"],
+            "eventDate": ["2020-01-01/2020-01-31", "2020-02", "2020-03-01"],
+            "decimalLatitude": [4.5, -12.1, 0.0],
+            "decimalLongitude": [-74.1, -77.0, 180.0],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def occurrence():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E01", "E03"],
+            "basisOfRecord": ["MachineObservation"] * 3,
+            "scientificName": ["Panthera onca", "Tinamidae", "Cuniculus paca"],
+            "eventDate": ["2020-01-02", "2020-01-03", "2020-03-01"],
+            "occurrenceID": ["O01", "O02", "O03"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def measurement():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E02"],
+            "measurementType": ["camera make", "camera make"],
+            "measurementValue": ["Bushnell", "Reconyx"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def multimedia():
+    return pd.DataFrame(
+        {
+            "eventID": ["E01", "E02", "E03"],
+            "identifier": ["a1", "b1", "c1"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def meta():
+    return """<archive xmlns="http://rs.tdwg.org/text/">
+<core fieldsTerminatedBy="," ignoreHeaderLines="1" rowType="http://rs.tdwg.org/dwc/terms/Event">
+<files><location>event.csv</location></files>
+<id index="0" />
+<field index="0" term="http://rs.tdwg.org/dwc/terms/eventID" />
+<field index="1" term="http://rs.tdwg.org/dwc/terms/eventDate" />
+<field index="2" term="http://rs.tdwg.org/dwc/terms/decimalLatitude" />
+<field index="3" term="http://rs.tdwg.org/dwc/terms/decimalLongitude" />
+</core>
+<extension fieldsTerminatedBy="," ignoreHeaderLines="1" rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+<files><location>occurrence.csv</location></files>
+<coreid index="0" />
+<field index="0" term="http://rs.tdwg.org/dwc/terms/eventID" />
+<field index="1" term="http://rs.tdwg.org/dwc/terms/basisOfRecord" />
+<field index="2" term="http://rs.tdwg.org/dwc/terms/scientificName" />
+<field index="3" term="http://rs.tdwg.org/dwc/terms/eventDate" />
+<field index="4" term="http://rs.tdwg.org/dwc/terms/occurrenceID" />
+</extension>
+</archive>"""
+
+
+def test_valid(event, occurrence, measurement, multimedia):
+    result = validate_dwc_archive((event, occurrence, measurement, multimedia))
+    assert result.empty
+    assert result.columns.tolist() == ["table", "check", "term", "row"]
+
+
+def test_unique(event):
+    event.loc[2, "eventID"] = "E01"
+    result = validate_dwc_archive((event, None, None, None))
+    expected = pd.DataFrame(
+        {
+            "table": ["event"],
+            "check": ["unique"],
+            "term": ["eventID"],
+            "row": pd.array([2], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_reference(event, occurrence, multimedia):
+    occurrence.loc[1, "eventID"] = "E04"
+    multimedia.loc[0, "eventID"] = "E05"
+    result = validate_dwc_archive((event, occurrence, None, multimedia))
+    expected = pd.DataFrame(
+        {
+            "table": ["occurrence", "multimedia"],
+            "check": ["reference", "reference"],
+            "term": ["eventID", "eventID"],
+            "row": pd.array([1, 0], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_required(event, occurrence, measurement):
+    occurrence.loc[0, "scientificName"] = np.nan
+    measurement = measurement.drop(columns="measurementValue")
+    result = validate_dwc_archive((event, occurrence, measurement, None))
+    expected = pd.DataFrame(
+        {
+            "table": ["occurrence", "measurement"],
+            "check": ["required", "required"],
+            "term": ["scientificName", "measurementValue"],
+            "row": pd.array([0, pd.NA], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_required_occurrence_id(event, occurrence):
+    occurrence["occurrenceID"] = None
+    result = validate_dwc_archive((event, occurrence, None, None))
+    assert result["term"].eq("occurrenceID").all()
+    assert result["row"].tolist() == [0, 1, 2]
+
+
+def test_dates(event, occurrence):
+    event["eventDate"] = ["2020-01-31/2020-01-01", "2020-13", "2020-03-01T10:00"]
+    occurrence["eventDate"] = ["2020-02-30", "01/03/2020", "2020-03-01"]
+    result = validate_dwc_archive((event, occurrence, None, None))
+    expected = pd.DataFrame(
+        {
+            "table": ["event", "event", "occurrence", "occurrence"],
+            "check": ["date", "date", "date", "date"],
+            "term": ["eventDate", "eventDate", "eventDate", "eventDate"],
+            "row": pd.array([0, 1, 0, 1], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_coordinates(event):
+    event["decimalLatitude"] = [91.0, "north", -90.0]
+    event["decimalLongitude"] = [-180.0, np.nan, -180.5]
+    result = validate_dwc_archive((event, None, None, None))
+    expected = pd.DataFrame(
+        {
+            "table": ["event", "event", "event"],
+            "check": ["coordinates", "coordinates", "coordinates"],
+            "term": ["decimalLatitude", "decimalLatitude", "decimalLongitude"],
+            "row": pd.array([0, 1, 2], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_path(event, occurrence, meta, tmp_path):
+    event.loc[2, "eventID"] = "E01"
+    occurrence.loc[2, "eventID"] = "E04"
+    occurrence.loc[1, "eventDate"] = "2020-01-32"
+    path = tmp_path.joinpath("dwca.zip")
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("meta.xml", meta)
+        z.writestr("event.csv", event.to_csv(index=False))
+        z.writestr("occurrence.csv", occurrence.to_csv(index=False))
+    result = validate_dwc_archive(path, chunksize=2)
+    expected = validate_dwc_archive((event, occurrence, None, None))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_intact_input(event, occurrence, measurement, multimedia):
+    event_original = event.copy()
+    occurrence_original = occurrence.copy()
+    validate_dwc_archive((event, occurrence, measurement, multimedia))
+    pd.testing.assert_frame_equal(event_original, event)
+    pd.testing.assert_frame_equal(occurrence_original, occurrence)
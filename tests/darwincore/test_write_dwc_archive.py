@@ -0,0 +1,334 @@
+"""
+Test cases for the wiutils.darwincore.write_dwc_archive function.
+"""
+import io
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.darwincore import (
+    create_dwc_event,
+    create_dwc_measurement,
+    create_dwc_multimedia,
+    create_dwc_occurrence,
+    validate_dwc_archive,
+    write_dwc_archive,
+)
+
+
+@pytest.fixture(scope="function")
+def cameras():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001"],
+            "camera_id": [1, 2],
+            "make": ["Bushnell", "Reconyx"],
+            "serial_number": ["ABC", np.nan],
+            "year_purchased": [2018, 2019],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001", "AAA001"],
+            "deployment_id": ["001", "002", "003"],
+            "placename": ["AAA01", "AAA02", "AAA03"],
+            "camera_id": [1, 2, 1],
+            "start_date": ["2020-01-01", "2020-01-01", "2020-02-01"],
+            "end_date": ["2020-01-31", "2020-01-31", "2020-02-28"],
+            "latitude": [4.5, 4.6, 4.7],
+            "longitude": [-74.1, -74.2, -74.3],
+            "recorded_by": ["John Doe", "John Doe", "Jane Doe"],
+            "bait_type": ["None", "None", "Scent"],
+            "bait_description": [np.nan, np.nan, "Cat food"],
+            "quiet_period": [0, 0, 30],
+            "camera_functioning": ["Camera Functioning"] * 3,
+            "sensor_height": ["Knee height"] * 3,
+            "height_other": [np.nan] * 3,
+            "sensor_orientation": ["Parallel"] * 3,
+            "orientation_other": [np.nan] * 3,
+            "plot_treatment": [np.nan] * 3,
+            "plot_treatment_description": [np.nan] * 3,
+            "detection_distance": [np.nan, 5.0, np.nan],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001"] * 6,
+            "deployment_id": ["001", "001", "002", "002", "003", "003"],
+            "image_id": ["a1", "a2", "b1", "b2", "c1", "c2"],
+            "location": [
+                "gs://bucket/deployment/001/a1.jpg",
+                "gs://bucket/deployment/001/a2.jpg",
+                "gs://bucket/deployment/002/b1.jpg",
+                "gs://bucket/deployment/002/b2.jpg",
+                "gs://bucket/deployment/003/c1.jpg",
+                "gs://bucket/deployment/003/c2.jpg",
+            ],
+            "class": ["Mammalia", "Mammalia", np.nan, "Aves", "Mammalia", "Aves"],
+            "order": ["Carnivora", "Carnivora", np.nan, "Tinamiformes", np.nan, np.nan],
+            "family": ["Felidae", "Felidae", np.nan, "Tinamidae", np.nan, np.nan],
+            "genus": ["Panthera", "Panthera", np.nan, np.nan, np.nan, np.nan],
+            "species": ["onca", "onca", np.nan, np.nan, np.nan, np.nan],
+            "timestamp": [
+                "2020-01-02 10:00:00",
+                "2020-01-02 10:01:00",
+                "2020-01-03 12:00:00",
+                "2020-01-04 12:00:00",
+                "2020-02-05 08:00:00",
+                "2020-02-06 08:00:00",
+            ],
+            "number_of_objects": [1, 1, 0, 2, 1, 1],
+            "license": ["CC-BY"] * 6,
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def projects():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001"],
+            "project_admin_organization": ["Instituto Humboldt"],
+            "country_code": ["COL"],
+            "metadata_license": ["CC-BY"],
+        }
+    )
+
+
+def _read_member(path, name):
+    with zipfile.ZipFile(path) as z:
+        return pd.read_csv(z.open(name), dtype=str)
+
+
+def test_members(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    with zipfile.ZipFile(path) as z:
+        names = z.namelist()
+    assert sorted(names) == [
+        "event.csv",
+        "measurementorfact.csv",
+        "meta.xml",
+        "multimedia.csv",
+        "occurrence.csv",
+    ]
+
+
+def test_tables(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    tables = [
+        create_dwc_event(deployments, projects),
+        create_dwc_occurrence(images, deployments, projects),
+        create_dwc_measurement(deployments, cameras),
+        create_dwc_multimedia(images, deployments),
+    ]
+    tables[0]["eventID"] = ["001", "002", "003"]
+    tables[1]["eventID"] = ["001", "002", "003", "003"]
+    names = ["event.csv", "occurrence.csv", "measurementorfact.csv", "multimedia.csv"]
+    for name, table in zip(names, tables):
+        result = _read_member(path, name)
+        expected = pd.read_csv(io.StringIO(table.to_csv(index=False)), dtype=str)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_valid(cameras, deployments, images, projects, tmp_path):
+    deployments.loc[2, "placename"] = "AAA01"
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    report = validate_dwc_archive(path)
+    assert not report["check"].isin(["unique", "reference"]).any()
+
+
+def test_duplicated_projects(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    path_duplicated = tmp_path.joinpath("duplicated.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    write_dwc_archive(
+        (cameras, deployments, images, pd.concat([projects, projects])),
+        path_duplicated,
+    )
+    for name in ["event.csv", "occurrence.csv"]:
+        result = _read_member(path_duplicated, name)
+        expected = _read_member(path, name)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_empty(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images.iloc[:0], projects), path)
+    result = _read_member(path, "occurrence.csv")
+    assert result.empty
+    assert (
+        result.columns.tolist()
+        == create_dwc_occurrence(images, deployments, projects).columns.tolist()
+    )
+
+
+def test_line_terminator(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    with zipfile.ZipFile(path) as z:
+        content = z.read("occurrence.csv")
+    assert b"\r\n" not in content
+
+
+def test_chunksize(cameras, deployments, images, projects, tmp_path):
+    bundle = (cameras, deployments, images, projects)
+    path_small = tmp_path.joinpath("small.zip")
+    path_large = tmp_path.joinpath("large.zip")
+    write_dwc_archive(bundle, path_small, chunksize=1)
+    write_dwc_archive(bundle, path_large, chunksize=1000)
+    for name in ["occurrence.csv", "multimedia.csv"]:
+        result = _read_member(path_small, name)
+        expected = _read_member(path_large, name)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_chunksize_unsorted(cameras, deployments, images, projects, tmp_path):
+    images = images.iloc[[4, 0, 2, 5, 1, 3]]
+    bundle = (cameras, deployments, images, projects)
+    path_small = tmp_path.joinpath("small.zip")
+    path_large = tmp_path.joinpath("large.zip")
+    write_dwc_archive(bundle, path_small, chunksize=1)
+    write_dwc_archive(bundle, path_large, chunksize=1000)
+    for name, key in [
+        ("occurrence.csv", "occurrenceID"),
+        ("multimedia.csv", "identifier"),
+    ]:
+        result = _read_member(path_small, name)
+        expected = _read_member(path_large, name)
+        pd.testing.assert_frame_equal(
+            result.sort_values(key, ignore_index=True),
+            expected.sort_values(key, ignore_index=True),
+        )
+
+
+def test_meta(cameras, deployments, images, projects, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive((cameras, deployments, images, projects), path)
+    with zipfile.ZipFile(path) as z:
+        root = ET.fromstring(z.read("meta.xml"))
+        header = z.open("occurrence.csv").readline().decode().strip().split(",")
+    ns = {"dwca": "http://rs.tdwg.org/text/"}
+    core = root.find("dwca:core", ns)
+    assert core.get("rowType") == "http://rs.tdwg.org/dwc/terms/Event"
+    assert core.find("dwca:files/dwca:location", ns).text == "event.csv"
+    assert core.find("dwca:id", ns).get("index") == "0"
+    extensions = root.findall("dwca:extension", ns)
+    assert [e.get("rowType") for e in extensions] == [
+        "http://rs.tdwg.org/dwc/terms/Occurrence",
+        "http://rs.tdwg.org/dwc/terms/MeasurementOrFact",
+        "http://rs.gbif.org/terms/1.0/Multimedia",
+    ]
+    occurrence = extensions[0]
+    coreid = int(occurrence.find("dwca:coreid", ns).get("index"))
+    assert header[coreid] == "eventID"
+    terms = [f.get("term") for f in occurrence.findall("dwca:field", ns)]
+    assert len(terms) == len(header)
+    assert terms[header.index("type")] == "http://purl.org/dc/terms/type"
+    assert terms[header.index("scientificName")] == (
+        "http://rs.tdwg.org/dwc/terms/scientificName"
+    )
+
+
+@pytest.mark.parametrize("compression", ["stored", "deflated", "bzip2", "lzma"])
+def test_compression(cameras, deployments, images, projects, tmp_path, compression):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_archive(
+        (cameras, deployments, images, projects), path, compression=compression
+    )
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
+
+
+def test_invalid_compression(cameras, deployments, images, projects, tmp_path):
+    with pytest.raises(ValueError):
+        write_dwc_archive(
+            (cameras, deployments, images, projects),
+            tmp_path.joinpath("dwca.zip"),
+            compression="zstd",
+        )
+
+
+def test_parquet(cameras, deployments, images, projects, tmp_path):
+    pytest.importorskip("pyarrow")
+    write_dwc_archive(
+        (cameras, deployments, images, projects), tmp_path, file_format="parquet"
+    )
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "event.parquet",
+        "measurementorfact.parquet",
+        "multimedia.parquet",
+        "occurrence.parquet",
+    ]
+    result = pd.read_parquet(tmp_path.joinpath("occurrence.parquet"))
+    expected = create_dwc_occurrence(images, deployments, projects)
+    expected["eventID"] = ["001", "002", "003", "003"]
+    assert result["basisOfRecord"].dtype == "category"
+    assert result["taxonRank"].dtype == "category"
+    pd.testing.assert_frame_equal(
+        result.astype(object), expected.astype(object), check_dtype=False
+    )
+    result = pd.read_parquet(tmp_path.joinpath("measurementorfact.parquet"))
+    expected = create_dwc_measurement(deployments, cameras)
+    assert (
+        result["measurementValue"].tolist()
+        == expected["measurementValue"].astype(str).tolist()
+    )
+
+
+def test_parquet_chunksize(cameras, deployments, images, projects, tmp_path):
+    pytest.importorskip("pyarrow")
+    bundle = (cameras, deployments, images, projects)
+    path_small = tmp_path.joinpath("small")
+    path_large = tmp_path.joinpath("large")
+    write_dwc_archive(bundle, path_small, chunksize=1, file_format="parquet")
+    write_dwc_archive(bundle, path_large, chunksize=1000, file_format="parquet")
+    for name in ["occurrence.parquet", "multimedia.parquet"]:
+        result = pd.read_parquet(path_small.joinpath(name))
+        expected = pd.read_parquet(path_large.joinpath(name))
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parquet_empty(cameras, deployments, images, projects, tmp_path):
+    pytest.importorskip("pyarrow")
+    bundle = (cameras, deployments, images.iloc[:0], projects)
+    write_dwc_archive(bundle, tmp_path, file_format="parquet")
+    result = pd.read_parquet(tmp_path.joinpath("occurrence.parquet"))
+    assert result.empty
+    assert "occurrenceID" in result.columns
+
+
+def test_invalid_file_format(cameras, deployments, images, projects, tmp_path):
+    with pytest.raises(ValueError):
+        write_dwc_archive(
+            (cameras, deployments, images, projects),
+            tmp_path.joinpath("dwca.json"),
+            file_format="json",
+        )
+
+
+def test_intact_input(cameras, deployments, images, projects, tmp_path):
+    cameras_original = cameras.copy()
+    deployments_original = deployments.copy()
+    images_original = images.copy()
+    projects_original = projects.copy()
+    write_dwc_archive(
+        (cameras, deployments, images, projects), tmp_path.joinpath("dwca.zip")
+    )
+    pd.testing.assert_frame_equal(cameras_original, cameras)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(projects_original, projects)
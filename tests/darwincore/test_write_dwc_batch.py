@@ -0,0 +1,202 @@
+"""
+Test cases for the wiutils.darwincore.write_dwc_batch function.
+"""
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.darwincore import write_dwc_archive, write_dwc_batch
+
+
+@pytest.fixture(scope="function")
+def cameras():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "BBB001"],
+            "camera_id": [1, 1],
+            "make": ["Bushnell", "Reconyx"],
+            "serial_number": ["ABC", np.nan],
+            "year_purchased": [2018, 2019],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001", "BBB001"],
+            "deployment_id": ["001", "002", "003"],
+            "placename": ["P01", "P02", "P01"],
+            "camera_id": [1, 1, 1],
+            "start_date": ["2020-01-01", "2020-02-01", "2020-01-01"],
+            "end_date": ["2020-01-31", "2020-02-28", "2020-01-31"],
+            "latitude": [4.5, 4.6, 4.7],
+            "longitude": [-74.1, -74.2, -74.3],
+            "recorded_by": ["John Doe", "John Doe", "Jane Doe"],
+            "bait_type": ["None", "None", "Scent"],
+            "bait_description": [np.nan, np.nan, "Cat food"],
+            "quiet_period": [0, 0, 30],
+            "camera_functioning": ["Camera Functioning"] * 3,
+            "sensor_height": ["Knee height"] * 3,
+            "height_other": [np.nan] * 3,
+            "sensor_orientation": ["Parallel"] * 3,
+            "orientation_other": [np.nan] * 3,
+            "plot_treatment": [np.nan] * 3,
+            "plot_treatment_description": [np.nan] * 3,
+            "detection_distance": [np.nan, 5.0, np.nan],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "AAA001", "AAA001", "BBB001", "BBB001"],
+            "deployment_id": ["001", "001", "002", "003", "003"],
+            "image_id": ["a1", "a2", "b1", "c1", "c2"],
+            "location": [
+                "gs://bucket/deployment/001/a1.jpg",
+                "gs://bucket/deployment/001/a2.jpg",
+                "gs://bucket/deployment/002/b1.jpg",
+                "gs://bucket/deployment/003/c1.jpg",
+                "gs://bucket/deployment/003/c2.jpg",
+            ],
+            "class": ["Mammalia", "Mammalia", "Aves", "Mammalia", np.nan],
+            "order": ["Carnivora", "Carnivora", "Tinamiformes", "Rodentia", np.nan],
+            "family": ["Felidae", "Felidae", "Tinamidae", "Cuniculidae", np.nan],
+            "genus": ["Panthera", "Panthera", np.nan, "Cuniculus", np.nan],
+            "species": ["onca", "onca", np.nan, "paca", np.nan],
+            "timestamp": [
+                "2020-01-02 10:00:00",
+                "2020-01-02 10:01:00",
+                "2020-02-03 12:00:00",
+                "2020-01-05 08:00:00",
+                "2020-01-06 08:00:00",
+            ],
+            "number_of_objects": [1, 1, 2, 1, 0],
+            "license": ["CC-BY"] * 5,
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def projects():
+    return pd.DataFrame(
+        {
+            "project_id": ["AAA001", "BBB001"],
+            "project_admin_organization": ["Instituto Humboldt", "WCS"],
+            "country_code": ["COL", "PER"],
+            "metadata_license": ["CC-BY", "CC0"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def bundles(cameras, deployments, images, projects):
+    tables = (cameras, deployments, images, projects)
+    return [
+        tuple(table[table["project_id"] == "AAA001"] for table in tables),
+        tuple(table[table["project_id"] == "BBB001"] for table in tables),
+    ]
+
+
+def _read_member(path, name):
+    with zipfile.ZipFile(path) as z:
+        return pd.read_csv(z.open(name), dtype=str)
+
+
+def test_ids(bundles, tmp_path):
+    path = tmp_path.joinpath("dwca.zip")
+    write_dwc_batch(bundles, path)
+    event = _read_member(path, "event.csv")
+    assert event["eventID"].tolist() == ["AAA001:001", "AAA001:002", "BBB001:003"]
+    occurrence = _read_member(path, "occurrence.csv")
+    assert occurrence["occurrenceID"].tolist() == [
+        "AAA001:a1",
+        "AAA001:b1",
+        "BBB001:c1",
+    ]
+    assert occurrence["eventID"].tolist() == [
+        "AAA001:001",
+        "AAA001:002",
+        "BBB001:003",
+    ]
+    assert occurrence["accessRights"].tolist() == ["CC-BY", "CC-BY", "CC0"]
+    measurement = _read_member(path, "measurementorfact.csv")
+    assert measurement.loc[measurement["measurementType"] == "camera make"][
+        "measurementValue"
+    ].tolist() == ["Bushnell", "Bushnell", "Reconyx"]
+    multimedia = _read_member(path, "multimedia.csv")
+    assert multimedia["eventID"].tolist() == [
+        "AAA001:001",
+        "AAA001:001",
+        "AAA001:002",
+        "BBB001:003",
+        "BBB001:003",
+    ]
+
+
+def test_single_project(bundles, tmp_path):
+    path_batch = tmp_path.joinpath("batch.zip")
+    path_archive = tmp_path.joinpath("archive.zip")
+    write_dwc_batch(bundles[:1], path_batch)
+    write_dwc_archive(bundles[0], path_archive)
+    names = ["event.csv", "occurrence.csv", "measurementorfact.csv", "multimedia.csv"]
+    for name in names:
+        result = _read_member(path_batch, name)
+        expected = _read_member(path_archive, name)
+        result["eventID"] = result["eventID"].str.split(":").str[1]
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_concatenated(cameras, deployments, images, projects, bundles, tmp_path):
+    path_list = tmp_path.joinpath("list.zip")
+    path_tuple = tmp_path.joinpath("tuple.zip")
+    write_dwc_batch(bundles, path_list)
+    write_dwc_batch((cameras, deployments, images, projects), path_tuple)
+    for name in ["event.csv", "occurrence.csv", "measurementorfact.csv"]:
+        result = _read_member(path_tuple, name)
+        expected = _read_member(path_list, name)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_n_jobs(bundles, tmp_path):
+    path_serial = tmp_path.joinpath("serial.zip")
+    path_parallel = tmp_path.joinpath("parallel.zip")
+    write_dwc_batch(bundles, path_serial)
+    write_dwc_batch(bundles, path_parallel, chunksize=1, n_jobs=2)
+    for name in ["occurrence.csv", "multimedia.csv"]:
+        result = _read_member(path_parallel, name)
+        expected = _read_member(path_serial, name)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parquet(bundles, tmp_path):
+    pytest.importorskip("pyarrow")
+    path_csv = tmp_path.joinpath("dwca.zip")
+    path_parquet = tmp_path.joinpath("dwca")
+    write_dwc_batch(bundles, path_csv)
+    write_dwc_batch(bundles, path_parquet, file_format="parquet")
+    result = pd.read_parquet(path_parquet.joinpath("occurrence.parquet"))
+    expected = _read_member(path_csv, "occurrence.csv")
+    assert result["institutionCode"].dtype == "category"
+    assert result["occurrenceID"].tolist() == expected["occurrenceID"].tolist()
+    assert result["eventID"].tolist() == expected["eventID"].tolist()
+
+
+def test_intact_input(cameras, deployments, images, projects, tmp_path):
+    cameras_original = cameras.copy()
+    deployments_original = deployments.copy()
+    images_original = images.copy()
+    projects_original = projects.copy()
+    write_dwc_batch(
+        (cameras, deployments, images, projects), tmp_path.joinpath("dwca.zip")
+    )
+    pd.testing.assert_frame_equal(cameras_original, cameras)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(projects_original, projects)
@@ -0,0 +1,83 @@
+"""
+Test cases for the wiutils.extraction.get_detection_latency function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.extraction import get_detection_latency
+
+
+@pytest.fixture()
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "003"],
+            "class": ["Mammalia", "Mammalia", "Aves", "Mammalia", "Aves", "Aves"],
+            "order": [
+                "Carnivora",
+                "Carnivora",
+                np.nan,
+                "Carnivora",
+                "Galliformes",
+                "Galliformes",
+            ],
+            "family": [
+                "Felidae",
+                "Felidae",
+                np.nan,
+                "Felidae",
+                "Cracidae",
+                "Cracidae",
+            ],
+            "genus": ["Panthera", "Panthera", np.nan, "Panthera", "Crax", "Crax"],
+            "species": ["onca", "onca", np.nan, "onca", "rubra", "rubra"],
+            "timestamp": [
+                "2021-02-19 06:05:21",
+                "2021-02-16 20:54:42",
+                "2021-03-20 21:24:00",
+                "2021-02-03 16:32:04",
+                "2021-04-05 04:31:23",
+                "2021-03-23 15:03:09",
+            ],
+        }
+    )
+
+
+@pytest.fixture()
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["002", "001"],
+            "start_date": ["2021-02-01", "2021-02-13"],
+            "end_date": ["2021-04-03", "2021-03-23"],
+        }
+    )
+
+
+def test_latency(images, deployments):
+    result = get_detection_latency(images, deployments)
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "002"],
+            "taxon": [
+                "Aves",
+                "Crax rubra",
+                "Panthera onca",
+                "Aves",
+                "Crax rubra",
+                "Panthera onca",
+            ],
+            "duration": [35, 38, 3, 61, 61, 2],
+            "detected": [True, False, True, False, False, True],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_intact_input(images, deployments):
+    images_original = images.copy()
+    deployments_original = deployments.copy()
+    get_detection_latency(images, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
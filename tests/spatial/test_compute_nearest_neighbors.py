@@ -0,0 +1,78 @@
+"""
+Test cases for the wiutils.spatial.compute_nearest_neighbors function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.spatial import compute_nearest_neighbors
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003", "004"],
+            "latitude": [0.0, 0.0, 0.02, np.nan],
+            "longitude": [0.0, 0.01, 0.0, 0.05],
+        }
+    )
+
+
+def test_haversine(deployments):
+    result = compute_nearest_neighbors(deployments)
+    expected = pd.DataFrame(
+        {
+            "deployment_id_x": ["001", "002", "003"],
+            "deployment_id_y": ["002", "001", "001"],
+            "distance": [1.111951, 1.111951, 2.223902],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, atol=1e-6)
+
+
+def test_projected(deployments):
+    result = compute_nearest_neighbors(deployments, method="projected")
+    expected = pd.DataFrame(
+        {
+            "deployment_id_x": ["001", "002", "003"],
+            "deployment_id_y": ["002", "001", "001"],
+            "distance": [1.111951, 1.111951, 2.223902],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, atol=1e-5)
+
+
+def test_k(deployments):
+    result = compute_nearest_neighbors(deployments, k=2)
+    assert result["deployment_id_x"].tolist() == ["001", "001", "002", "002"] + [
+        "003",
+        "003",
+    ]
+    assert result["deployment_id_y"].tolist() == ["002", "003", "001", "003"] + [
+        "001",
+        "002",
+    ]
+
+
+def test_shared_coordinates(deployments):
+    deployments.loc[3, ["latitude", "longitude"]] = [0.0, 0.0]
+    result = compute_nearest_neighbors(deployments)
+    assert result["deployment_id_y"].tolist() == ["004", "001", "001", "001"]
+    assert result["distance"].tolist()[0] == 0
+
+
+def test_invalid_k(deployments):
+    with pytest.raises(ValueError):
+        compute_nearest_neighbors(deployments, k=3)
+
+
+def test_invalid_method(deployments):
+    with pytest.raises(ValueError):
+        compute_nearest_neighbors(deployments, method="manhattan")
+
+
+def test_intact_input(deployments):
+    deployments_original = deployments.copy()
+    compute_nearest_neighbors(deployments)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
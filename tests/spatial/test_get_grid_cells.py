@@ -0,0 +1,70 @@
+"""
+Test cases for the wiutils.spatial.get_grid_cells function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.spatial import get_grid_cells
+from wiutils.summarizing import compute_detection
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003", "004", "005"],
+            "latitude": [0.0, 0.0045, 0.0, 0.0135, np.nan],
+            "longitude": [0.0, 0.0045, 0.0135, 0.00675, 0.0],
+        }
+    )
+
+
+def test_square(deployments):
+    result = get_grid_cells(deployments, size=1)
+    expected = pd.Series(["0_0", "0_0", "1_0", "0_1", np.nan], name="cell")
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_square_origin(deployments):
+    result = get_grid_cells(deployments, size=1, origin=(-0.0045, -0.0045))
+    expected = pd.Series(["0_0", "1_1", "2_0", "1_2", np.nan], name="cell")
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_hexagon(deployments):
+    result = get_grid_cells(deployments, size=1.5, shape="hexagon")
+    expected = pd.Series(["0_0", "0_0", "1_0", "0_1", np.nan], name="cell")
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_invalid_shape(deployments):
+    with pytest.raises(ValueError):
+        get_grid_cells(deployments, size=1, shape="triangle")
+
+
+def test_groupby(deployments):
+    deployments["cell"] = get_grid_cells(deployments, size=1)
+    images = pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "class": ["Mammalia", "Mammalia", "Mammalia"],
+            "order": ["Carnivora", "Carnivora", "Carnivora"],
+            "family": ["Felidae", "Felidae", "Felidae"],
+            "genus": ["Panthera", "Panthera", "Panthera"],
+            "species": ["onca", "onca", "onca"],
+            "number_of_objects": [1, 2, 1],
+        }
+    )
+    result = compute_detection(images, deployments, groupby="cell")
+    expected = pd.DataFrame(
+        {"taxon": ["Panthera onca", "Panthera onca"], "cell": ["0_0", "1_0"]}
+    )
+    expected["value"] = [3, 1]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_intact_input(deployments):
+    deployments_original = deployments.copy()
+    get_grid_cells(deployments, size=1)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
@@ -0,0 +1,75 @@
+"""
+Test cases for the wiutils.summarizing.compute_accumulation_curve function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_accumulation_curve
+
+
+@pytest.fixture(scope="function")
+def detection():
+    return pd.DataFrame(
+        {
+            "taxon": [
+                "Cuniculus paca",
+                "Eira barbara",
+                "Leopardus pardalis",
+                "Momotus momota",
+            ],
+            "001": [1, 1, 0, 0],
+            "002": [1, 0, 1, 0],
+            "003": [1, 0, 0, 1],
+        }
+    )
+
+
+def test_exact(detection):
+    result = compute_accumulation_curve(detection, method="exact")
+    expected = pd.DataFrame({"sites": [1, 2, 3], "taxa": [2.0, 3.0, 4.0]})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_random(detection):
+    result = compute_accumulation_curve(detection, permutations=500, seed=0)
+    assert result.columns.tolist() == ["sites", "taxa", "sd", "lower", "upper"]
+    assert result["sites"].tolist() == [1, 2, 3]
+    np.testing.assert_allclose(result["taxa"], [2.0, 3.0, 4.0], atol=0.1)
+    assert result.loc[0, "sd"] == 0
+    assert result.loc[1, "sd"] == 0
+
+
+def test_batch_size(detection):
+    result = compute_accumulation_curve(
+        detection, permutations=50, batch_size=7, seed=0
+    )
+    expected = compute_accumulation_curve(
+        detection, permutations=50, batch_size=50, seed=0
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_abundance(detection):
+    abundance = detection.copy()
+    abundance.iloc[:, 1:] *= 5
+    result = compute_accumulation_curve(abundance, method="exact")
+    expected = compute_accumulation_curve(detection, method="exact")
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_effort(detection):
+    effort = pd.Series([10, 20, 30], index=["001", "002", "003"])
+    result = compute_accumulation_curve(detection, method="exact", effort=effort)
+    assert result["effort"].tolist() == [20.0, 40.0, 60.0]
+
+
+def test_invalid_method(detection):
+    with pytest.raises(ValueError):
+        compute_accumulation_curve(detection, method="rarefaction")
+
+
+def test_intact_input(detection):
+    detection_original = detection.copy()
+    compute_accumulation_curve(detection)
+    pd.testing.assert_frame_equal(detection_original, detection)
@@ -0,0 +1,100 @@
+"""
+Test cases for the wiutils.summarizing.compute_activity_overlap function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_activity_overlap
+
+
+@pytest.fixture(scope="function")
+def images():
+    hours = [6, 7, 8, 9, 10, 6, 7, 8, 9, 10, 18, 20, 22, 0, 2, 12]
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001"] * 16,
+            "class": ["Mammalia"] * 16,
+            "order": ["Carnivora"] * 5 + ["Rodentia"] * 5 + ["Chiroptera"] * 6,
+            "family": ["Felidae"] * 5 + ["Cuniculidae"] * 5 + ["Molossidae"] * 6,
+            "genus": ["Leopardus"] * 5 + ["Cuniculus"] * 5 + ["Molossus"] * 6,
+            "species": ["pardalis"] * 5 + ["paca"] * 5 + ["molossus"] * 6,
+            "timestamp": [
+                f"2020-12-{day:02} {hour:02}:15:00"
+                for day, hour in zip(range(1, 17), hours)
+            ],
+            "number_of_objects": [1] * 16,
+        }
+    )
+
+
+def test_identical_patterns(images):
+    result = compute_activity_overlap(images, min_records=5)
+    pair = (result["taxon_x"] == "Cuniculus paca") & (
+        result["taxon_y"] == "Leopardus pardalis"
+    )
+    assert result.loc[pair, "overlap"].item() == pytest.approx(1)
+
+
+def test_different_patterns(images):
+    for estimator in ("dhat1", "dhat4"):
+        result = compute_activity_overlap(images, estimator=estimator)
+        assert result["taxon_x"].tolist() == [
+            "Cuniculus paca",
+            "Cuniculus paca",
+            "Leopardus pardalis",
+        ]
+        assert result["taxon_y"].tolist() == [
+            "Leopardus pardalis",
+            "Molossus molossus",
+            "Molossus molossus",
+        ]
+        assert np.all(result["overlap"].iloc[1:] < 0.5)
+
+
+def test_pivot(images):
+    result = compute_activity_overlap(images, pivot=True)
+    assert result.columns.tolist() == [
+        "taxon",
+        "Cuniculus paca",
+        "Leopardus pardalis",
+        "Molossus molossus",
+    ]
+    matrix = result.iloc[:, 1:].to_numpy()
+    np.testing.assert_allclose(np.diag(matrix), 1)
+    np.testing.assert_allclose(matrix, matrix.T)
+
+
+def test_bootstrap(images):
+    result = compute_activity_overlap(images, bootstrap=50, seed=0)
+    assert result.columns.tolist() == [
+        "taxon_x",
+        "taxon_y",
+        "overlap",
+        "lower",
+        "upper",
+    ]
+    assert np.all(result["lower"] <= result["upper"])
+
+
+def test_min_records(images):
+    result = compute_activity_overlap(images, min_records=6)
+    assert len(result) == 0
+
+
+def test_missing_timestamps(images):
+    images.loc[[10, 11], "timestamp"] = np.nan
+    result = compute_activity_overlap(images)
+    expected = compute_activity_overlap(images.drop(index=[10, 11]))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_invalid_estimator(images):
+    with pytest.raises(ValueError):
+        compute_activity_overlap(images, estimator="dhat5")
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    compute_activity_overlap(images)
+    pd.testing.assert_frame_equal(images_original, images)
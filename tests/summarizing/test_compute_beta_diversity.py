@@ -0,0 +1,112 @@
+"""
+Test cases for the wiutils.summarizing.compute_beta_diversity function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_beta_diversity
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "003", "003"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Mammalia",
+                "Aves",
+                "No CV Result",
+                "Mammalia",
+            ],
+            "order": [
+                "Carnivora",
+                "Rodentia",
+                "Coraciiformes",
+                "Carnivora",
+                "Coraciiformes",
+                "No CV Result",
+                "Rodentia",
+            ],
+            "family": [
+                "Felidae",
+                "Cuniculidae",
+                "Momotidae",
+                "Felidae",
+                "Momotidae",
+                "No CV Result",
+                "Cuniculidae",
+            ],
+            "genus": [
+                "Leopardus",
+                "Cuniculus",
+                "Momotus",
+                "Leopardus",
+                "Momotus",
+                "No CV Result",
+                "Cuniculus",
+            ],
+            "species": [
+                "pardalis",
+                "paca",
+                "momota",
+                "pardalis",
+                "momota",
+                "No CV Result",
+                "paca",
+            ],
+            "number_of_objects": [1, 1, 2, 1, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {"deployment_id": ["001", "002", "003"], "placename": ["AAA", "AAA", "BBB"]}
+    )
+
+
+def test_jaccard(images):
+    result = compute_beta_diversity(images, index="jaccard")
+    expected = pd.DataFrame(
+        {
+            "deployment_id_x": ["001", "001", "002"],
+            "deployment_id_y": ["002", "003", "003"],
+            "dissimilarity": [1 / 3, 2 / 3, 1.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_sorensen(images):
+    result = compute_beta_diversity(images, index="sorensen")
+    expected = pd.DataFrame(
+        {
+            "deployment_id_x": ["001", "001", "002"],
+            "deployment_id_y": ["002", "003", "003"],
+            "dissimilarity": [0.2, 0.5, 1.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_pivot_location(images, deployments):
+    result = compute_beta_diversity(images, deployments, groupby="location", pivot=True)
+    expected = pd.DataFrame(
+        {"placename": ["AAA", "BBB"], "AAA": [0.0, 2 / 3], "BBB": [2 / 3, 0.0]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_invalid_index(images):
+    with pytest.raises(ValueError):
+        compute_beta_diversity(images, index="bray-curtis")
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    compute_beta_diversity(images)
+    pd.testing.assert_frame_equal(images_original, images)
@@ -0,0 +1,154 @@
+"""
+Test cases for the wiutils.summarizing.compute_codetections function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_codetections
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "001", "002", "002", "002"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+            ],
+            "order": [
+                "Rodentia",
+                "Carnivora",
+                "Rodentia",
+                "Galliformes",
+                "Rodentia",
+                "Rodentia",
+                "Carnivora",
+            ],
+            "family": [
+                "Cuniculidae",
+                "Felidae",
+                "Cuniculidae",
+                "Cracidae",
+                "Cuniculidae",
+                "Cuniculidae",
+                "Felidae",
+            ],
+            "genus": [
+                "Cuniculus",
+                "Leopardus",
+                "Cuniculus",
+                "Crax",
+                "Cuniculus",
+                "Cuniculus",
+                "Leopardus",
+            ],
+            "species": [
+                "paca",
+                "pardalis",
+                "paca",
+                "rubra",
+                "paca",
+                "paca",
+                "pardalis",
+            ],
+            "timestamp": [
+                "2020-12-01 20:00:00",
+                "2020-12-01 20:30:00",
+                "2020-12-02 21:00:00",
+                "2020-12-02 21:45:00",
+                "2020-12-01 19:50:00",
+                "2020-12-03 22:00:00",
+                "2020-12-03 23:30:00",
+            ],
+            "number_of_objects": [1, 1, 1, 1, 1, 1, 1],
+        }
+    )
+
+
+def test_window(images):
+    result = compute_codetections(images, window=60)
+    expected = pd.DataFrame(
+        {
+            "taxon_x": [
+                "Crax rubra",
+                "Crax rubra",
+                "Cuniculus paca",
+                "Cuniculus paca",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+            ],
+            "taxon_y": [
+                "Cuniculus paca",
+                "Leopardus pardalis",
+                "Crax rubra",
+                "Leopardus pardalis",
+                "Crax rubra",
+                "Cuniculus paca",
+            ],
+            "n": [0, 0, 1, 1, 0, 0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_unit(images):
+    result = compute_codetections(images, window=2, unit="hours")
+    assert result["n"].tolist() == [0, 0, 1, 2, 0, 0]
+
+
+def test_deployments_apart(images):
+    kws = {"interval": 1, "unit": "minutes"}
+    result = compute_codetections(images, window=60, remove_duplicates_kws=kws)
+    assert result["n"].tolist() == [0, 0, 1, 1, 0, 0]
+    images["deployment_id"] = "001"
+    result = compute_codetections(images, window=60, remove_duplicates_kws=kws)
+    assert result["n"].tolist() == [0, 0, 1, 2, 0, 0]
+
+
+def test_simultaneous(images):
+    images.loc[1, "timestamp"] = "2020-12-01 20:00:00"
+    result = compute_codetections(images, window=60)
+    assert result["n"].tolist() == [0, 0, 1, 1, 0, 1]
+
+
+def test_pivot(images):
+    result = compute_codetections(images, window=60, pivot=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Crax rubra", "Cuniculus paca", "Leopardus pardalis"],
+            "Crax rubra": [0, 1, 0],
+            "Cuniculus paca": [0, 0, 0],
+            "Leopardus pardalis": [0, 1, 0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_permutations(images):
+    result = compute_codetections(images, window=60, permutations=100, seed=0)
+    assert result.columns.tolist() == ["taxon_x", "taxon_y", "n", "expected", "p_value"]
+    assert result["expected"].between(0, 2).all()
+    assert result["p_value"].between(1 / 101, 1).all()
+
+
+def test_permutations_seed(images):
+    result_1 = compute_codetections(images, permutations=10, seed=42)
+    result_2 = compute_codetections(images, permutations=10, seed=42)
+    pd.testing.assert_frame_equal(result_1, result_2)
+
+
+def test_invalid_unit(images):
+    with pytest.raises(ValueError):
+        compute_codetections(images, unit="months")
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    compute_codetections(images, permutations=10)
+    pd.testing.assert_frame_equal(images_original, images)
@@ -0,0 +1,112 @@
+"""
+Test cases for the wiutils.summarizing.compute_cooccurrence function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_cooccurrence
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "003", "003"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Mammalia",
+                "Aves",
+                "No CV Result",
+                "Mammalia",
+            ],
+            "order": [
+                "Carnivora",
+                "Rodentia",
+                "Coraciiformes",
+                "Carnivora",
+                "Coraciiformes",
+                "No CV Result",
+                "Rodentia",
+            ],
+            "family": [
+                "Felidae",
+                "Cuniculidae",
+                "Momotidae",
+                "Felidae",
+                "Momotidae",
+                "No CV Result",
+                "Cuniculidae",
+            ],
+            "genus": [
+                "Leopardus",
+                "Cuniculus",
+                "Momotus",
+                "Leopardus",
+                "Momotus",
+                "No CV Result",
+                "Cuniculus",
+            ],
+            "species": [
+                "pardalis",
+                "paca",
+                "momota",
+                "pardalis",
+                "momota",
+                "No CV Result",
+                "paca",
+            ],
+            "number_of_objects": [1, 1, 2, 1, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {"deployment_id": ["001", "002", "003"], "placename": ["AAA", "AAA", "BBB"]}
+    )
+
+
+def test_long(images):
+    result = compute_cooccurrence(images)
+    expected = pd.DataFrame(
+        {
+            "taxon_x": ["Cuniculus paca", "Cuniculus paca", "Leopardus pardalis"],
+            "taxon_y": ["Leopardus pardalis", "Momotus momota", "Momotus momota"],
+            "sites": [1, 1, 2],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_pivot(images):
+    result = compute_cooccurrence(images, pivot=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Cuniculus paca", "Leopardus pardalis", "Momotus momota"],
+            "Cuniculus paca": [2, 1, 1],
+            "Leopardus pardalis": [1, 2, 2],
+            "Momotus momota": [1, 2, 2],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_groupby_location(images, deployments):
+    result = compute_cooccurrence(images, deployments, groupby="location")
+    expected = pd.DataFrame(
+        {
+            "taxon_x": ["Cuniculus paca", "Cuniculus paca", "Leopardus pardalis"],
+            "taxon_y": ["Leopardus pardalis", "Momotus momota", "Momotus momota"],
+            "sites": [1, 1, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    compute_cooccurrence(images)
+    pd.testing.assert_frame_equal(images_original, images)
@@ -127,6 +127,35 @@ def test_groupby_location(images, deployments):
     pd.testing.assert_frame_equal(result, expected, check_dtype=False)
 
 
+def test_groupby_month(images):
+    result = compute_count_summary(images, groupby="month")
+    expected = pd.DataFrame(
+        {
+            "month": pd.PeriodIndex(["2020-11", "2020-12"], freq="M"),
+            "total_images": [2, 7],
+            "identified_images": [2, 6],
+            "records": [2, 9],
+            "taxa": [1, 6],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_groupby_deployments_column(images, deployments):
+    deployments["region"] = ["North", "South"]
+    result = compute_count_summary(images, deployments, groupby="region")
+    expected = pd.DataFrame(
+        {
+            "region": ["North", "South"],
+            "total_images": [3, 6],
+            "identified_images": [3, 5],
+            "records": [4, 7],
+            "taxa": [2, 5],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
 def test_add_records_by_class_deployment(images):
     result = compute_count_summary(
         images, groupby="deployment", add_records_by_class=True
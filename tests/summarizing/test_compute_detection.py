@@ -191,6 +191,18 @@ def test_pivot_location(images, deployments):
     pd.testing.assert_frame_equal(result, expected)
 
 
+def test_groupby_camera(images, deployments):
+    deployments["camera_id"] = ["C01", "C01"]
+    result = compute_detection(images, deployments, groupby="camera", pivot=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Eira", "Galictis vittata", "Zentrygon linearis"],
+            "C01": [3, 7, 4],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
 def test_invalid_groupby(images, deployments):
     with pytest.raises(ValueError):
         compute_detection(images, deployments, groupby="placename")
@@ -274,3 +274,80 @@ def test_intact_input(images, deployments):
     compute_detection_history(images, deployments, days=7)
     pd.testing.assert_frame_equal(images_original, images)
     pd.testing.assert_frame_equal(deployments_original, deployments)
+
+
+def test_occasions_boundaries(images, deployments):
+    result = compute_detection_history(
+        images, deployments, occasions=["2020-11-20", "2020-12-01", "2020-12-10"]
+    )
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Leopardus",
+                "Leopardus",
+                "Leopardus",
+                "Leopardus",
+                "Panthera onca",
+                "Panthera onca",
+                "Panthera onca",
+                "Panthera onca",
+            ],
+            "deployment_id": ["001", "001", "002", "002", "001", "001", "002", "002"],
+            "timestamp": pd.to_datetime(
+                [
+                    "2020-11-20",
+                    "2020-12-01",
+                    "2020-11-20",
+                    "2020-12-01",
+                    "2020-11-20",
+                    "2020-12-01",
+                    "2020-11-20",
+                    "2020-12-01",
+                ]
+            ),
+            "value": [2, 4, 0, 0, 2, 3, 1, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_occasions_frequency(images, deployments):
+    result = compute_detection_history(
+        images, deployments, occasions="W", compute_abundance=False, pivot=True
+    )
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Leopardus", "Leopardus", "Panthera onca", "Panthera onca"],
+            "deployment_id": ["001", "002", "001", "002"],
+            "2020-11-23": [1, 0, 1, 0],
+            "2020-11-30": [1, 0, 1, 1],
+            "2020-12-07": [0, 0, 0, 1],
+            "2020-12-14": [np.nan, 0, np.nan, 0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_add_effort(images, deployments):
+    result = compute_detection_history(
+        images,
+        deployments,
+        occasions=["2020-11-20", "2020-12-01", "2020-12-10"],
+        add_effort=True,
+    )
+    expected = pd.Series(
+        [7 / 11, 7 / 9, 4 / 11, 1.0, 7 / 11, 7 / 9, 4 / 11, 1.0], name="effort"
+    )
+    pd.testing.assert_series_equal(result["effort"], expected)
+
+
+def test_add_effort_pivot(images, deployments):
+    with pytest.raises(ValueError):
+        compute_detection_history(images, deployments, pivot=True, add_effort=True)
+
+
+def test_unsorted_occasions(images, deployments):
+    with pytest.raises(ValueError):
+        compute_detection_history(
+            images, deployments, occasions=["2020-12-01", "2020-11-20"]
+        )
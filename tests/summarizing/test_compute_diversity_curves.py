@@ -0,0 +1,172 @@
+"""
+Test cases for the wiutils.summarizing.compute_diversity_curves function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_diversity_curves, compute_hill_numbers
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "001", "002", "002", "002"],
+            "class": [
+                "Aves",
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Mammalia",
+            ],
+            "order": [
+                "Coraciiformes",
+                "Carnivora",
+                "Rodentia",
+                "Didelphimorphia",
+                "Didelphimorphia",
+                "Coraciiformes",
+                "Carnivora",
+            ],
+            "family": [
+                "Momotidae",
+                "Mustelidae",
+                "Cuniculidae",
+                "Didelphidae",
+                "Didelphidae",
+                "Momotidae",
+                "Felidae",
+            ],
+            "genus": [
+                "Momotus",
+                "Eira",
+                "Cuniculus",
+                "Didelphis",
+                "Didelphis",
+                "Momotus",
+                "Leopardus",
+            ],
+            "species": [
+                "momota",
+                "barbara",
+                "paca",
+                "marsupialis",
+                "marsupialis",
+                "momota",
+                "pardalis",
+            ],
+            "number_of_objects": [5, 3, 1, 1, 2, 8, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame({"deployment_id": ["001", "002"], "placename": ["AAA", "AAA"]})
+
+
+def test_interpolation(images):
+    result = compute_diversity_curves(images, q_values=[0, 1, 2], sizes=[1, 4])
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001"] * 6 + ["002"] * 6,
+            "q": [0, 0, 1, 1, 2, 2] * 2,
+            "m": [1, 4] * 6,
+            "method": ["interpolated"] * 12,
+            "D": [
+                1.0,
+                2.610,
+                1.0,
+                2.365,
+                1.0,
+                2.143,
+                1.0,
+                1.982,
+                1.0,
+                1.728,
+                1.0,
+                1.549,
+            ],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, atol=1e-3)
+
+
+def test_observed(images):
+    result = compute_diversity_curves(images, q_values=[0, 1, 2])
+    result = result[result["method"] == "observed"].reset_index(drop=True)
+    expected = compute_hill_numbers(images, q_values=[0, 1, 2])
+    pd.testing.assert_frame_equal(result[["deployment_id", "q", "D"]], expected)
+
+
+def test_extrapolation(images):
+    result = compute_diversity_curves(images, q_values=0, sizes=[20, 1000])
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "002", "002"],
+            "q": [0, 0, 0, 0],
+            "m": [20, 1000, 20, 1000],
+            "method": ["extrapolated", "extrapolated", "extrapolated", "extrapolated"],
+            "D": [4.779, 4.9, 3.366, 3.455],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, atol=1e-3)
+
+
+def test_default_sizes(images):
+    result = compute_diversity_curves(images, q_values=0, knots=5)
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001"] * 5 + ["002"] * 6,
+            "q": [0] * 11,
+            "m": [1, 6, 10, 15, 20, 1, 6, 11, 12, 17, 22],
+        }
+    )
+    pd.testing.assert_frame_equal(result[["deployment_id", "q", "m"]], expected)
+
+
+def test_location(images, deployments):
+    result = compute_diversity_curves(
+        images, deployments, groupby="location", q_values=0, sizes=[21]
+    )
+    expected = pd.DataFrame(
+        {
+            "placename": ["AAA"],
+            "q": [0],
+            "m": [21],
+            "method": ["observed"],
+            "D": [5.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel(images):
+    result = compute_diversity_curves(images, n_jobs=2)
+    expected = compute_diversity_curves(images, n_jobs=1)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_invalid_q_values(images):
+    with pytest.raises(ValueError):
+        compute_diversity_curves(images, q_values=[0, 3])
+
+
+def test_invalid_sizes(images):
+    with pytest.raises(ValueError):
+        compute_diversity_curves(images, sizes=[0, 5, 10])
+
+
+def test_no_sites(images):
+    images["number_of_objects"] = 0
+    result = compute_diversity_curves(images)
+    assert result.empty
+    assert result.columns.tolist() == ["deployment_id", "q", "m", "method", "D"]
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    compute_diversity_curves(images)
+    pd.testing.assert_frame_equal(images_original, images)
@@ -0,0 +1,86 @@
+"""
+Test cases for the wiutils.summarizing.compute_effort function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_effort
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "placename": ["AAA", "AAA", "BBB"],
+            "start_date": ["2020-01-25", "2020-02-10", "2020-01-01"],
+            "end_date": ["2020-02-03", "2020-02-19", "2020-01-31"],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def malfunctions():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001"],
+            "start_date": ["2020-01-27", "2020-01-28"],
+            "end_date": ["2020-01-29", "2020-02-01"],
+        }
+    )
+
+
+def test_defaults(deployments):
+    result = compute_effort(deployments)
+    expected = pd.DataFrame(
+        {"deployment_id": ["001", "002", "003"], "effort": [10, 10, 31]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_groupby_location(deployments):
+    result = compute_effort(deployments, groupby="location")
+    expected = pd.DataFrame({"placename": ["AAA", "BBB"], "effort": [20, 31]})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_freq(deployments):
+    result = compute_effort(deployments, freq="M")
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "002", "002", "003", "003"],
+            "period": pd.PeriodIndex(
+                ["2020-01", "2020-02", "2020-01", "2020-02", "2020-01", "2020-02"],
+                freq="M",
+            ),
+            "effort": [7, 3, 0, 10, 31, 0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_freq_pivot(deployments):
+    result = compute_effort(deployments, groupby="location", freq="M", pivot=True)
+    expected = pd.DataFrame(
+        {"placename": ["AAA", "BBB"], "2020-01": [7, 31], "2020-02": [13, 0]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_malfunctions(deployments, malfunctions):
+    result = compute_effort(deployments, malfunctions=malfunctions)
+    expected = pd.DataFrame(
+        {"deployment_id": ["001", "002", "003"], "effort": [4, 10, 31]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_invalid_groupby(deployments):
+    with pytest.raises(ValueError):
+        compute_effort(deployments, groupby="month")
+
+
+def test_intact_input(deployments):
+    deployments_original = deployments.copy()
+    compute_effort(deployments, freq="M")
+    pd.testing.assert_frame_equal(deployments_original, deployments)
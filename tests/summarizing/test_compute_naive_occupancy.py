@@ -0,0 +1,110 @@
+"""
+Test cases for the wiutils.summarizing.compute_naive_occupancy function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_naive_occupancy
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "001"],
+            "class": ["Mammalia"] * 6,
+            "order": ["Carnivora"] * 6,
+            "family": ["Felidae"] * 6,
+            "genus": [
+                "Leopardus",
+                "Leopardus",
+                "Panthera",
+                "Panthera",
+                "Panthera",
+                "Panthera",
+            ],
+            "species": ["pardalis", "pardalis", "onca", "onca", "onca", "onca"],
+            "timestamp": [
+                "2020-11-25 06:45:57",
+                "2020-12-01 09:24:32",
+                "2020-11-27 14:41:52",
+                "2020-11-30 16:17:41",
+                "2020-12-11 08:51:01",
+                "2020-12-09 09:58:12",
+            ],
+            "number_of_objects": [1, 1, 1, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "start_date": ["2020-11-24", "2020-11-27", "2020-12-01"],
+            "end_date": ["2020-12-07", "2020-12-14", "2020-12-05"],
+        }
+    )
+
+
+def test_defaults(images, deployments):
+    result = compute_naive_occupancy(images, deployments, days=7)
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Leopardus pardalis", "Panthera onca"],
+            "sites": [3, 3],
+            "occupied": [1, 2],
+            "naive_occupancy": [1 / 3, 2 / 3],
+            "occasions": [2, 5],
+            "detections": [2, 3],
+            "naive_detection": [1.0, 0.6],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_by_occasion(images, deployments):
+    result = compute_naive_occupancy(images, deployments, days=7, by_occasion=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Leopardus pardalis"] * 3 + ["Panthera onca"] * 3,
+            "timestamp": pd.to_datetime(
+                [
+                    "2020-11-24",
+                    "2020-12-01",
+                    "2020-12-08",
+                    "2020-11-24",
+                    "2020-12-01",
+                    "2020-12-08",
+                ]
+            ),
+            "sites": [2, 3, 1, 2, 3, 1],
+            "detections": [1, 1, 0, 2, 0, 1],
+            "naive_detection": [1 / 2, 1 / 3, 0.0, 1.0, 0.0, 1.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_occasions(images, deployments):
+    result = compute_naive_occupancy(
+        images, deployments, occasions=["2020-11-24", "2020-12-01"]
+    )
+    assert result["sites"].tolist() == [2, 2]
+    assert result["occupied"].tolist() == [1, 2]
+    assert result["detections"].tolist() == [1, 2]
+
+
+def test_zero_objects(images, deployments):
+    images.loc[1, "number_of_objects"] = 0
+    result = compute_naive_occupancy(images, deployments, days=7, by_occasion=True)
+    assert result["detections"].tolist() == [1, 0, 0, 2, 0, 1]
+
+
+def test_intact_input(images, deployments):
+    images_original = images.copy()
+    deployments_original = deployments.copy()
+    compute_naive_occupancy(images, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
@@ -0,0 +1,181 @@
+"""
+Test cases for the wiutils.summarizing.compute_rai function.
+"""
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_rai
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "001", "002", "002", "002"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Aves",
+                "No CV Result",
+                "Mammalia",
+            ],
+            "order": [
+                "Carnivora",
+                "Carnivora",
+                "Carnivora",
+                "Passeriformes",
+                "Passeriformes",
+                "No CV Result",
+                "Carnivora",
+            ],
+            "family": [
+                "Felidae",
+                "Felidae",
+                "Felidae",
+                "Corvidae",
+                "Corvidae",
+                "No CV Result",
+                "Felidae",
+            ],
+            "genus": [
+                "Leopardus",
+                "Leopardus",
+                "Leopardus",
+                "Cyanocorax",
+                "Cyanocorax",
+                "No CV Result",
+                "Leopardus",
+            ],
+            "species": [
+                "pardalis",
+                "pardalis",
+                "pardalis",
+                "violaceus",
+                "violaceus",
+                "No CV Result",
+                "pardalis",
+            ],
+            "timestamp": [
+                "2020-01-26 00:06:26",
+                "2020-01-26 00:10:12",
+                "2020-02-02 22:16:10",
+                "2020-01-28 16:48:04",
+                "2020-02-12 07:26:33",
+                "2020-02-13 08:09:32",
+                "2020-02-25 09:15:01",
+            ],
+            "number_of_objects": [1, 2, 1, 3, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002"],
+            "placename": ["AAA", "AAA"],
+            "start_date": ["2020-01-25", "2020-02-10"],
+            "end_date": ["2020-02-03", "2020-02-19"],
+        }
+    )
+
+
+def test_defaults(images, deployments):
+    result = compute_rai(images, deployments)
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+            ],
+            "deployment_id": ["001", "002", "001"],
+            "records": [1, 1, 2],
+            "effort": [10, 10, 10],
+            "rai": [10.0, 10.0, 20.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_groupby_location_freq(images, deployments):
+    result = compute_rai(images, deployments, groupby="location", freq="M")
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+            ],
+            "placename": ["AAA", "AAA", "AAA", "AAA"],
+            "period": pd.PeriodIndex(
+                ["2020-01", "2020-02", "2020-01", "2020-02"], freq="M"
+            ),
+            "records": [1, 1, 1, 1],
+            "effort": [7, 13, 7, 13],
+            "rai": [100 / 7, 100 / 13, 100 / 7, 100 / 13],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_compute_abundance(images, deployments):
+    result = compute_rai(images, deployments, compute_abundance=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+            ],
+            "deployment_id": ["001", "002", "001"],
+            "records": [3, 1, 2],
+            "effort": [10, 10, 10],
+            "rai": [30.0, 10.0, 20.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_malfunctions(images, deployments):
+    malfunctions = pd.DataFrame(
+        {
+            "deployment_id": ["001"],
+            "start_date": ["2020-02-01"],
+            "end_date": ["2020-02-03"],
+        }
+    )
+    result = compute_rai(images, deployments, malfunctions=malfunctions)
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+            ],
+            "deployment_id": ["001", "002", "001"],
+            "records": [1, 1, 1],
+            "effort": [7, 10, 7],
+            "rai": [100 / 7, 10.0, 100 / 7],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_remove_duplicates_kws(images, deployments):
+    result = compute_rai(
+        images, deployments, remove_duplicates_kws={"interval": 1, "unit": "minutes"}
+    )
+    assert result.loc[result["taxon"] == "Leopardus pardalis", "records"].item() == 3
+
+
+def test_intact_input(images, deployments):
+    images_original = images.copy()
+    deployments_original = deployments.copy()
+    compute_rai(images, deployments)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
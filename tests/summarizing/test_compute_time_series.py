@@ -0,0 +1,191 @@
+"""
+Test cases for the wiutils.summarizing.compute_time_series function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import compute_time_series
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "001", "002", "002", "002"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "Aves",
+                "No CV Result",
+                "Mammalia",
+            ],
+            "order": [
+                "Carnivora",
+                "Carnivora",
+                "Carnivora",
+                "Passeriformes",
+                "Passeriformes",
+                "No CV Result",
+                "Carnivora",
+            ],
+            "family": [
+                "Felidae",
+                "Felidae",
+                "Felidae",
+                "Corvidae",
+                "Corvidae",
+                "No CV Result",
+                "Felidae",
+            ],
+            "genus": [
+                "Leopardus",
+                "Leopardus",
+                "Leopardus",
+                "Cyanocorax",
+                "Cyanocorax",
+                "No CV Result",
+                "Leopardus",
+            ],
+            "species": [
+                "pardalis",
+                "pardalis",
+                "pardalis",
+                "violaceus",
+                "violaceus",
+                "No CV Result",
+                "pardalis",
+            ],
+            "timestamp": [
+                "2020-01-26 00:06:26",
+                "2020-01-26 00:10:12",
+                "2020-02-02 22:16:10",
+                "2020-01-28 16:48:04",
+                "2020-02-12 07:26:33",
+                "2020-02-13 08:09:32",
+                "2020-02-25 09:15:01",
+            ],
+            "number_of_objects": [1, 2, 1, 3, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002"],
+            "placename": ["AAA", "AAA"],
+            "start_date": ["2020-01-25", "2020-02-10"],
+            "end_date": ["2020-02-03", "2020-02-19"],
+        }
+    )
+
+
+def test_defaults(images):
+    result = compute_time_series(images)
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+            ],
+            "deployment_id": ["001", "002", "001", "001", "002"],
+            "period": pd.PeriodIndex(
+                ["2020-01", "2020-02", "2020-01", "2020-02", "2020-02"], freq="M"
+            ),
+            "records": [1, 1, 1, 1, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_groupby_location_abundance(images, deployments):
+    result = compute_time_series(
+        images, deployments, groupby="location", compute_abundance=True
+    )
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+            ],
+            "placename": ["AAA", "AAA", "AAA", "AAA"],
+            "period": pd.PeriodIndex(
+                ["2020-01", "2020-02", "2020-01", "2020-02"], freq="M"
+            ),
+            "records": [3, 1, 1, 2],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_freq(images):
+    result = compute_time_series(images, freq="Y")
+    assert result["records"].tolist() == [1, 1, 2, 1]
+    assert result["period"].astype(str).unique().tolist() == ["2020"]
+
+
+def test_normalize(images, deployments):
+    result = compute_time_series(images, deployments, normalize=True)
+    expected = pd.DataFrame(
+        {
+            "taxon": [
+                "Cyanocorax violaceus",
+                "Cyanocorax violaceus",
+                "Leopardus pardalis",
+                "Leopardus pardalis",
+            ],
+            "deployment_id": ["001", "002", "001", "001"],
+            "period": pd.PeriodIndex(
+                ["2020-01", "2020-02", "2020-01", "2020-02"], freq="M"
+            ),
+            "records": [1, 1, 1, 1],
+            "effort": [7, 10, 7, 3],
+            "rai": [100 / 7, 10.0, 100 / 7, 100 / 3],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_dense(images):
+    values, taxa, groups, periods = compute_time_series(images, dense=True)
+    np.testing.assert_array_equal(values, [[[1, 0], [0, 1]], [[1, 1], [0, 1]]])
+    assert taxa.tolist() == ["Cyanocorax violaceus", "Leopardus pardalis"]
+    assert groups.tolist() == ["001", "002"]
+    assert periods.astype(str).tolist() == ["2020-01", "2020-02"]
+
+
+def test_dense_normalize(images, deployments):
+    values, _, _, _ = compute_time_series(
+        images, deployments, normalize=True, dense=True
+    )
+    np.testing.assert_allclose(
+        values,
+        [[[100 / 7, 0], [np.nan, 10]], [[100 / 7, 100 / 3], [np.nan, 0]]],
+    )
+
+
+def test_normalize_no_deployments(images):
+    with pytest.raises(ValueError):
+        compute_time_series(images, normalize=True)
+
+
+def test_invalid_groupby(images, deployments):
+    with pytest.raises(ValueError):
+        compute_time_series(images, deployments, groupby="month")
+
+
+def test_intact_input(images, deployments):
+    images_original = images.copy()
+    deployments_original = deployments.copy()
+    compute_time_series(images, deployments, normalize=True)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
@@ -0,0 +1,199 @@
+"""
+Test cases for the wiutils.summarizing.SummaryState class.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import (
+    SummaryState,
+    compute_count_summary,
+    compute_detection,
+    compute_general_count,
+)
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002", "002", "003"],
+            "class": [
+                "Mammalia",
+                "Mammalia",
+                "Mammalia",
+                "Aves",
+                "No CV Result",
+                "Mammalia",
+                "Aves",
+            ],
+            "order": [
+                "Carnivora",
+                "Carnivora",
+                "Carnivora",
+                "Passeriformes",
+                "No CV Result",
+                "Primates",
+                "Passeriformes",
+            ],
+            "family": [
+                "Felidae",
+                "Felidae",
+                "Felidae",
+                "Turdidae",
+                "No CV Result",
+                "Cebidae",
+                "Turdidae",
+            ],
+            "genus": [
+                "Panthera",
+                "Panthera",
+                "Panthera",
+                "Turdus",
+                "No CV Result",
+                np.nan,
+                "Turdus",
+            ],
+            "species": [
+                "onca",
+                "onca",
+                "onca",
+                np.nan,
+                "No CV Result",
+                np.nan,
+                np.nan,
+            ],
+            "timestamp": [
+                "2020-12-01 10:13:13",
+                "2020-12-01 10:25:48",
+                "2020-12-01 11:02:11",
+                "2020-12-03 08:15:57",
+                "2020-12-03 09:01:02",
+                "2020-12-04 13:48:12",
+                "2020-12-05 21:31:49",
+            ],
+            "number_of_objects": [1, 1, 2, 1, 1, 3, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "placename": ["AAA", "AAA", "BBB"],
+        }
+    )
+
+
+def test_count_summary(images):
+    state = SummaryState().update(images)
+    result = state.compute_count_summary(add_records_by_class=True)
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "total_images": [3, 3, 1],
+            "identified_images": [3, 2, 1],
+            "records": [3, 4, 1],
+            "records_mammalia": [3, 3, 0],
+            "records_aves": [0, 1, 1],
+            "taxa": [1, 2, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_batches(images, deployments):
+    state = SummaryState(groupby="location")
+    state.update(images.iloc[:2], deployments)
+    state.update(images.iloc[2:], deployments)
+    result = state.compute_count_summary(add_records_by_class=True)
+    expected = compute_count_summary(
+        images, deployments, groupby="location", add_records_by_class=True
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_batches_duplicates(images):
+    state = SummaryState(interval=40, unit="minutes")
+    state.update(images.iloc[:1])
+    state.update(images.iloc[1:])
+    result = state.compute_count_summary()
+    expected = pd.DataFrame(
+        {
+            "deployment_id": ["001", "002", "003"],
+            "total_images": [3, 3, 1],
+            "identified_images": [3, 2, 1],
+            "records": [1, 4, 1],
+            "taxa": [1, 2, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_detection(images, deployments):
+    state = SummaryState(groupby="location")
+    state.update(images.iloc[:4], deployments)
+    state.update(images.iloc[4:], deployments)
+    result = state.compute_detection(compute_abundance=False, pivot=True)
+    expected = compute_detection(
+        images, deployments, "location", compute_abundance=False, pivot=True
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_general_count(images):
+    state = SummaryState().update(images.iloc[:3]).update(images.iloc[3:])
+    result = state.compute_general_count(add_taxonomy=True, rank="family")
+    expected = compute_general_count(images, add_taxonomy=True, rank="family")
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge(images):
+    first = SummaryState().update(images[images["deployment_id"] == "001"])
+    second = SummaryState().update(images[images["deployment_id"] != "001"])
+    result = first.merge(second).compute_count_summary(add_taxa_by_class=True)
+    expected = compute_count_summary(images, add_taxa_by_class=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge_shared_deployments(images):
+    first = SummaryState().update(images.iloc[:2])
+    second = SummaryState().update(images.iloc[2:])
+    with pytest.raises(ValueError):
+        first.merge(second)
+
+
+def test_merge_different_settings(images):
+    first = SummaryState().update(images.iloc[:3])
+    second = SummaryState(interval=5).update(images.iloc[3:])
+    with pytest.raises(ValueError):
+        first.merge(second)
+
+
+def test_json(images, tmp_path):
+    state = SummaryState().update(images.iloc[:2])
+    state.to_json(tmp_path / "state.json")
+    state = SummaryState.from_json(tmp_path / "state.json")
+    state.update(images.iloc[2:])
+    result = state.compute_count_summary()
+    expected = compute_count_summary(images)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_older_images(images):
+    state = SummaryState().update(images.iloc[1:])
+    with pytest.raises(ValueError):
+        state.update(images.iloc[:1])
+
+
+def test_invalid_groupby():
+    with pytest.raises(ValueError):
+        SummaryState(groupby="month")
+
+
+def test_intact_input(images):
+    images_original = images.copy()
+    SummaryState().update(images)
+    pd.testing.assert_frame_equal(images_original, images)
@@ -0,0 +1,147 @@
+"""
+Test cases for the wiutils.summarizing.write_occupancy_data function.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wiutils.summarizing import write_occupancy_data
+
+
+@pytest.fixture(scope="function")
+def images():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "001", "001", "002", "002"],
+            "class": ["Mammalia", "Mammalia", "Mammalia", "Mammalia", "Aves"],
+            "order": ["Carnivora", "Carnivora", "Carnivora", "Carnivora", np.nan],
+            "family": ["Felidae", "Felidae", "Felidae", "Felidae", np.nan],
+            "genus": ["Panthera", "Leopardus", "Panthera", "Panthera", np.nan],
+            "species": ["onca", np.nan, "onca", "onca", np.nan],
+            "timestamp": [
+                "2020-11-25 06:45:57",
+                "2020-11-25 09:58:12",
+                "2020-12-04 14:41:52",
+                "2020-12-05 16:17:41",
+                "2020-12-11 07:53:07",
+            ],
+            "number_of_objects": [1, 2, 1, 1, 1],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def deployments():
+    return pd.DataFrame(
+        {
+            "deployment_id": ["001", "002"],
+            "placename": ["AAA", np.nan],
+            "start_date": ["2020-11-24", "2020-11-27"],
+            "end_date": ["2020-12-07", "2020-12-14"],
+            "camera_id": [1, 2],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def cameras():
+    return pd.DataFrame({"camera_id": [1, 2], "make": ["Bushnell", "Reconyx"]})
+
+
+def test_detections(images, deployments, tmp_path):
+    write_occupancy_data(images, deployments, tmp_path, days=7)
+    with np.load(tmp_path / "detections.npz") as data:
+        np.testing.assert_array_equal(
+            data["y"],
+            [
+                [[0, 0, np.nan], [0, 0, 1]],
+                [[1, 0, np.nan], [0, 0, 0]],
+                [[1, 1, np.nan], [0, 1, 0]],
+            ],
+        )
+        np.testing.assert_array_equal(
+            data["taxa"], ["Aves", "Leopardus", "Panthera onca"]
+        )
+        np.testing.assert_array_equal(data["sites"], ["001", "002"])
+        np.testing.assert_array_equal(
+            data["occasions"], ["2020-11-24", "2020-12-01", "2020-12-08"]
+        )
+
+
+def test_detections_abundance(images, deployments, tmp_path):
+    write_occupancy_data(
+        images, deployments, tmp_path, occasions="M", compute_abundance=True
+    )
+    with np.load(tmp_path / "detections.npz") as data:
+        np.testing.assert_array_equal(
+            data["y"], [[[0, 0], [0, 1]], [[2, 0], [0, 0]], [[1, 1], [0, 1]]]
+        )
+
+
+def test_observation_covariates(images, deployments, tmp_path):
+    write_occupancy_data(images, deployments, tmp_path, days=7)
+    with np.load(tmp_path / "observation_covariates.npz") as data:
+        np.testing.assert_allclose(data["effort"], [[1, 1, 0], [4 / 7, 1, 1]])
+
+
+def test_site_covariates(images, deployments, cameras, tmp_path):
+    write_occupancy_data(images, deployments, tmp_path, cameras=cameras)
+    with np.load(tmp_path / "site_covariates.npz") as data:
+        np.testing.assert_array_equal(data["deployment_id"], ["001", "002"])
+        np.testing.assert_array_equal(data["placename"], ["AAA", ""])
+        np.testing.assert_array_equal(data["make"], ["Bushnell", "Reconyx"])
+
+
+def test_site_covariates_columns(images, deployments, cameras, tmp_path):
+    write_occupancy_data(
+        images, deployments, tmp_path, cameras=cameras, site_covariates=["make"]
+    )
+    with np.load(tmp_path / "site_covariates.npz") as data:
+        assert list(data.keys()) == ["deployment_id", "make"]
+
+
+def test_manifest(images, deployments, tmp_path):
+    write_occupancy_data(images, deployments, tmp_path, days=7)
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    assert manifest["shape"] == {"taxa": 3, "deployments": 2, "occasions": 3}
+    assert manifest["occasions"] == [
+        "2020-11-24",
+        "2020-12-01",
+        "2020-12-08",
+        "2020-12-15",
+    ]
+    for name in manifest["files"].values():
+        assert (tmp_path / name).exists()
+
+
+def test_parquet(images, deployments, tmp_path):
+    pytest.importorskip("pyarrow")
+    write_occupancy_data(images, deployments, tmp_path, days=7, file_format="parquet")
+    result = pd.read_parquet(tmp_path / "detections.parquet")
+    expected = pd.DataFrame(
+        {
+            "taxon": ["Aves", "Aves", "Leopardus", "Leopardus"]
+            + ["Panthera onca", "Panthera onca"],
+            "deployment_id": ["001", "002", "001", "002", "001", "002"],
+            "2020-11-24": [0.0, 0.0, 1.0, 0.0, 1.0, 0.0],
+            "2020-12-01": [0.0, 0.0, 0.0, 0.0, 1.0, 1.0],
+            "2020-12-08": [np.nan, 1, np.nan, 0, np.nan, 0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_invalid_file_format(images, deployments, tmp_path):
+    with pytest.raises(ValueError):
+        write_occupancy_data(images, deployments, tmp_path, file_format="csv")
+
+
+def test_intact_input(images, deployments, tmp_path):
+    images_original = images.copy()
+    deployments_original = deployments.copy()
+    write_occupancy_data(images, deployments, tmp_path)
+    pd.testing.assert_frame_equal(images_original, images)
+    pd.testing.assert_frame_equal(deployments_original, deployments)
@@ -4,8 +4,17 @@ from wiutils.darwincore import (
     create_dwc_measurement,
     create_dwc_multimedia,
     create_dwc_occurrence,
+    diff_dwc_archive,
+    validate_dwc_archive,
+    write_dwc_archive,
+    write_dwc_batch,
+)
+from wiutils.extraction import (
+    get_date_ranges,
+    get_detection_latency,
+    get_lowest_taxon,
+    get_scientific_name,
 )
-from wiutils.extraction import get_date_ranges, get_lowest_taxon, get_scientific_name
 from wiutils.filtering import (
     remove_domestic,
     remove_duplicates,
@@ -30,10 +39,23 @@ from wiutils.reading import (
     read_images,
     read_projects,
 )
+from wiutils.spatial import compute_nearest_neighbors, get_grid_cells
 from wiutils.summarizing import (
+    SummaryState,
+    compute_accumulation_curve,
+    compute_activity_overlap,
+    compute_beta_diversity,
+    compute_codetections,
+    compute_cooccurrence,
     compute_count_summary,
     compute_detection,
     compute_detection_history,
+    compute_diversity_curves,
+    compute_effort,
     compute_general_count,
     compute_hill_numbers,
+    compute_naive_occupancy,
+    compute_rai,
+    compute_time_series,
+    write_occupancy_data,
 )
@@ -1 +1 @@
-from wiutils._dwc import event, measurement, multimedia, occurrence
+from wiutils._dwc import countries, event, measurement, multimedia, occurrence, terms
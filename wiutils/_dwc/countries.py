@@ -0,0 +1,12 @@
+"""
+Mapping from ISO 3166-1 alpha-3 to ISO 3166-1 alpha-2 country codes for
+the Darwin Core Event dataframe creation. The table is loaded once, when
+the module is first imported.
+"""
+import json
+import pathlib
+
+with open(
+    pathlib.Path(__file__).parent.joinpath("countries.json"), encoding="utf-8"
+) as f:
+    codes = {country["alpha-3"]: country["alpha-2"] for country in json.load(f)}
@@ -1,5 +1,6 @@
 """
-Mapping from WI fields to DwC terms, constant values and term order for
+Mapping from WI fields to DwC terms, constant values, term order,
+required terms, record keys, categorical terms and output columns for
 the Darwin Core Event dataframe creation.
 """
 constants = {
@@ -36,3 +37,40 @@ order = [
     "geodeticDatum",
     "institutionCode",
 ]
+
+required = [
+    "eventID",
+    "eventDate",
+]
+
+key = [
+    "eventID",
+]
+
+categories = [
+    "institutionCode",
+    "sampleSizeUnit",
+    "samplingProtocol",
+    "countryCode",
+    "geodeticDatum",
+]
+
+columns = [
+    "eventID",
+    "institutionCode",
+    "sampleSizeValue",
+    "sampleSizeUnit",
+    "samplingProtocol",
+    "samplingEffort",
+    "eventDate",
+    "continent",
+    "country",
+    "countryCode",
+    "county",
+    "minimumElevationInMeters",
+    "maximumElevationInMeters",
+    "decimalLongitude",
+    "decimalLatitude",
+    "geodeticDatum",
+    "eventRemarks",
+]
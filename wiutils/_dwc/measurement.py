@@ -1,5 +1,6 @@
 """
-Mapping from WI fields to DwC terms for the Darwin Core Measurement or
+Mapping from WI fields to DwC terms, required terms, record keys,
+categorical terms and output columns for the Darwin Core Measurement or
 Facts dataframe creation.
 """
 import numpy as np
@@ -66,3 +67,27 @@ mapping = [
         "remarks": None,
     },
 ]
+
+required = [
+    "eventID",
+    "measurementType",
+    "measurementValue",
+]
+
+key = [
+    "eventID",
+    "measurementType",
+]
+
+categories = [
+    "measurementType",
+    "measurementUnit",
+]
+
+columns = [
+    "eventID",
+    "measurementType",
+    "measurementValue",
+    "measurementUnit",
+    "measurementRemarks",
+]
@@ -1,5 +1,6 @@
 """
-Mapping from WI fields to DwC terms, constant values and term order for
+Mapping from WI fields to DwC terms, constant values, term order,
+required terms, record keys, categorical terms and output columns for
 the Darwin Core Simple Multimedia dataframe creation.
 """
 constants = {
@@ -31,3 +32,21 @@ order = [
     "publisher",
     "license",
 ]
+
+required = [
+    "eventID",
+    "identifier",
+]
+
+key = [
+    "identifier",
+]
+
+categories = [
+    "type",
+    "format",
+    "publisher",
+    "license",
+]
+
+columns = order
@@ -1,5 +1,6 @@
 """
-Mapping from WI fields to DwC terms, constant values and term order for
+Mapping from WI fields to DwC terms, constant values, term order,
+required terms, record keys, categorical terms and output columns for
 the Darwin Core Occurrence dataframe creation.
 """
 constants = {
@@ -63,3 +64,61 @@ order = [
     "taxonRank",
     "vernacularName",
 ]
+
+required = [
+    "occurrenceID",
+    "eventID",
+    "basisOfRecord",
+    "scientificName",
+]
+
+key = [
+    "recordNumber",
+]
+
+categories = [
+    "basisOfRecord",
+    "type",
+    "institutionCode",
+    "organismQuantityType",
+    "preparations",
+    "kingdom",
+    "phylum",
+    "class",
+    "order",
+    "family",
+    "taxonRank",
+    "accessRights",
+]
+
+columns = [
+    "occurrenceID",
+    "eventID",
+    "basisOfRecord",
+    "type",
+    "institutionCode",
+    "collectionCode",
+    "recordNumber",
+    "recordedBy",
+    "organismQuantity",
+    "organismQuantityType",
+    "preparations",
+    "eventDate",
+    "eventTime",
+    "identifiedBy",
+    "dateIdentified",
+    "scientificName",
+    "kingdom",
+    "phylum",
+    "class",
+    "order",
+    "family",
+    "genus",
+    "specificEpithet",
+    "infraspecificEpithet",
+    "taxonRank",
+    "scientificNameAuthorship",
+    "vernacularName",
+    "accessRights",
+    "associatedMedia",
+]
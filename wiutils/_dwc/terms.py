@@ -0,0 +1,29 @@
+"""
+Term namespaces and row types used to describe the Darwin Core Archive
+files in the archive's metafile (meta.xml).
+"""
+namespaces = {
+    "dwc": "http://rs.tdwg.org/dwc/terms/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+
+dcterms = [
+    "accessRights",
+    "contributor",
+    "created",
+    "creator",
+    "format",
+    "identifier",
+    "license",
+    "publisher",
+    "references",
+    "title",
+    "type",
+]
+
+row_types = {
+    "event": "http://rs.tdwg.org/dwc/terms/Event",
+    "occurrence": "http://rs.tdwg.org/dwc/terms/Occurrence",
+    "measurement": "http://rs.tdwg.org/dwc/terms/MeasurementOrFact",
+    "multimedia": "http://rs.gbif.org/terms/1.0/Multimedia",
+}
@@ -7,3 +7,5 @@ location = "placename"
 start = "start_date"
 end = "end_date"
 camera_id = "camera_id"
+latitude = "latitude"
+longitude = "longitude"
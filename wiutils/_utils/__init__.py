@@ -1 +1 @@
-from wiutils._utils import taxonomy
+from wiutils._utils import effort, taxonomy
@@ -0,0 +1,99 @@
+"""
+Sampling effort utilities.
+"""
+import numpy as np
+import pandas as pd
+
+from .. import _labels
+
+
+def _mark_periods(
+    rows: np.ndarray,
+    starts: pd.Series,
+    ends: pd.Series,
+    shape: tuple,
+    origin: pd.Timestamp,
+) -> np.ndarray:
+    # Each period adds one at its first day and subtracts one after its
+    # last day, so the cumulative sum over days is positive only inside
+    # (possibly overlapping) periods.
+    day = pd.Timedelta(days=1)
+    first = (pd.to_datetime(starts).dt.floor("D") - origin) // day
+    last = (pd.to_datetime(ends).dt.floor("D") - origin) // day
+    first = np.clip(first.to_numpy(), 0, shape[1])
+    last = np.clip(last.to_numpy() + 1, 0, shape[1])
+    counts = np.zeros((shape[0], shape[1] + 1), dtype=np.int32)
+    np.add.at(counts, (rows, first), 1)
+    np.add.at(counts, (rows, last), -1)
+
+    return counts.cumsum(axis=1)[:, : shape[1]] > 0
+
+
+def compute_effort_matrix(
+    deployments: pd.DataFrame,
+    malfunctions: pd.DataFrame = None,
+    start: pd.Timestamp = None,
+    end: pd.Timestamp = None,
+) -> tuple:
+    """
+    Computes a day-level effort bitmap with the days each deployment was
+    active. Both start and end dates are considered active days.
+
+    Parameters
+    ----------
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    malfunctions : DataFrame
+        DataFrame with the periods where cameras were not functioning.
+        Must have deployment_id, start_date and end_date columns. These
+        periods are subtracted from the deployments' effort.
+    start : Timestamp
+        First day of the matrix. If None, the earliest deployment start
+        date is used.
+    end : Timestamp
+        Last day of the matrix. If None, the latest deployment end date
+        is used.
+
+    Returns
+    -------
+    ndarray
+        Boolean array with shape (deployments, days).
+    Index
+        Deployment ids for the rows of the array.
+    DatetimeIndex
+        Days for the columns of the array.
+
+    """
+    deployments = deployments.drop_duplicates(_labels.deployments.deployment_id)
+    deployments = deployments.dropna(
+        subset=[_labels.deployments.start, _labels.deployments.end]
+    )
+    starts = pd.to_datetime(deployments[_labels.deployments.start])
+    ends = pd.to_datetime(deployments[_labels.deployments.end])
+    if start is None:
+        start = starts.min()
+    if end is None:
+        end = ends.max()
+    days = pd.date_range(
+        pd.Timestamp(start).floor("D"), pd.Timestamp(end).floor("D"), freq="D"
+    )
+    ids = pd.Index(deployments[_labels.deployments.deployment_id])
+    shape = (len(ids), len(days))
+
+    matrix = _mark_periods(np.arange(len(ids)), starts, ends, shape, days[0])
+
+    if malfunctions is not None:
+        malfunctions = malfunctions.dropna(
+            subset=[_labels.deployments.start, _labels.deployments.end]
+        )
+        rows = ids.get_indexer(malfunctions[_labels.deployments.deployment_id])
+        malfunctions = malfunctions[rows >= 0]
+        matrix &= ~_mark_periods(
+            rows[rows >= 0],
+            malfunctions[_labels.deployments.start],
+            malfunctions[_labels.deployments.end],
+            shape,
+            days[0],
+        )
+
+    return matrix, ids, days
@@ -2,22 +2,571 @@
 Functions to create different core and extension tables following the
 Darwin Core (DwC) standard from a Wildlife Insights data.
 """
-import json
+import collections
+import concurrent.futures
+import csv
+import io
+import os
 import pathlib
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Union
 
 import numpy as np
 import pandas as pd
 
-from . import _dwc, _labels
+from . import _dwc, _labels, _utils
 from .extraction import get_lowest_taxon
-from .filtering import remove_duplicates, remove_unidentified
+from .filtering import _sort_records, remove_unidentified
+from .reading import read_bundle
+
+
+def _add_event_ids(table: pd.DataFrame, deployment_ids: np.ndarray) -> pd.DataFrame:
+    # Occurrences refer to their event through the deployment id of the
+    # image at each of the table's positions (see _build_dwc_event).
+    return table.assign(eventID=deployment_ids[table.index])
+
+
+def _add_project_ids(
+    table: pd.DataFrame, terms: list, project_ids: np.ndarray
+) -> pd.DataFrame:
+    # Prefixes the ids in terms with the project id of each record so
+    # they are unique across projects. Missing ids are kept as missing.
+    prefixes = pd.Series(project_ids, index=table.index).astype(str) + ":"
+    for term in terms:
+        ids = prefixes + table[term].astype(str)
+        table[term] = ids.where(table[term].notna())
+
+    return table
+
+
+def _build_dwc_event(deployments: pd.DataFrame, projects: pd.DataFrame) -> pd.DataFrame:
+    # Events are built one per deployment, with the deployment id as
+    # eventID, rather than per placename (which several deployments can
+    # share) so their ids are unique and every extension record joins the
+    # core through its deployment id.
+    projects = projects.drop_duplicates(_labels.deployments.project_id)
+    event = create_dwc_event(deployments, projects)
+    event["eventID"] = deployments[_labels.deployments.deployment_id].to_numpy()
+
+    return event
+
+
+def _build_dwc_multimedia(prepared: dict) -> pd.DataFrame:
+    extension = prepared["images"].rename(columns=_dwc.multimedia.mapping)
+    extension = extension[
+        extension.columns[extension.columns.isin(_dwc.multimedia.order)]
+    ]
+
+    for term, value in _dwc.multimedia.constants.items():
+        extension[term] = value
+
+    extension["references"] = prepared["urls"]
+    extension["title"] = prepared["taxa"].fillna("Blank or unidentified")
+
+    extension = extension.reindex(columns=_dwc.multimedia.order)
+
+    return extension
+
+
+def _build_dwc_occurrence(
+    prepared: dict,
+    projects: pd.DataFrame,
+    remove_duplicate_kws: dict = None,
+    max_media: int = None,
+) -> pd.DataFrame:
+    kws = dict(remove_duplicate_kws or {})
+    kws.pop("reset_index", None)
+
+    identified = remove_unidentified(prepared["images"], rank="class")
+    order, starts = _sort_records(
+        identified, prepared["taxa"].loc[identified.index], **kws
+    )
+    first = np.empty(len(identified), dtype=bool)
+    first[order] = starts
+    filtered = identified[first]
+
+    # Projects are deduplicated so every record is merged with a single row.
+    projects = projects.drop_duplicates(_labels.images.project_id)
+    df = pd.merge(filtered, projects, on=_labels.images.project_id, how="left")
+    df[_labels.images.date] = pd.to_datetime(df[_labels.images.date])
+
+    core = df.rename(columns=_dwc.occurrence.mapping)
+    core = core[core.columns[core.columns.isin(_dwc.occurrence.order)]]
+
+    for term, value in _dwc.occurrence.constants.items():
+        core[term] = value
+
+    core["eventDate"] = df[_labels.images.date].dt.strftime("%Y-%m-%d")
+    core["eventTime"] = df[_labels.images.date].dt.strftime("%H:%M:%S")
+
+    # Records are ordered as in the images, while their media are
+    # contiguous runs in the sorted order.
+    urls = prepared["urls"].loc[identified.index].to_numpy()
+    media = _join_media(urls[order], starts, max_media)
+    positions = np.empty(len(identified), dtype=np.int64)
+    positions[first] = np.arange(len(filtered))
+    core["associatedMedia"] = pd.Series(media, index=positions[order[starts]])
+
+    core["scientificName"] = prepared["taxa"].loc[filtered.index].to_numpy()
+    core["taxonRank"] = prepared["ranks"].loc[filtered.index].to_numpy()
+    positions = filtered.index
+    filtered = filtered.reset_index(drop=True)
+    epithets = filtered[_labels.images.species].str.split(" ", expand=True)
+    epithets = epithets.reindex(columns=[0, 1])
+    core["specificEpithet"] = epithets[0]
+    core["infraspecificEpithet"] = epithets[1]
+
+    core = core.reindex(columns=_dwc.occurrence.order)
+
+    # Update March 23' version
+
+    core["type"] = "Imagen"
+
+    core[["dateIdentified", "collectionCode", "scientificNameAuthorship"]] = None
+
+    # Image ids are prefixed with their project id so occurrence ids are
+    # the same whether the project is published alone or with others.
+    core["occurrenceID"] = core["recordNumber"]
+    core = _add_project_ids(
+        core, ["occurrenceID"], df[_labels.images.project_id].to_numpy()
+    )
+
+    core["eventID"] = core["parentEventID"]
+
+    core["accessRights"] = df["metadata_license"].to_numpy()
+
+    core = core[_dwc.occurrence.columns]
+    core.index = positions
+
+    return core
+
+
+def _check_dwc_table(
+    kind: str,
+    table: pd.DataFrame,
+    index: pd.Index,
+    event_ids: set,
+    check_columns: bool = True,
+) -> list:
+    # Runs every check that applies to a (chunk of a) core or extension
+    # and returns one report dataframe per failed check. event_ids holds
+    # the ids seen so far in the Event core and is updated in place when
+    # checking it.
+    reports = []
+
+    def _add(check, term, mask):
+        if mask.any():
+            reports.append(
+                pd.DataFrame(
+                    {
+                        "table": kind,
+                        "check": check,
+                        "term": term,
+                        "row": index[mask],
+                    }
+                )
+            )
+
+    for term in getattr(_dwc, kind).required:
+        if term not in table.columns:
+            if check_columns:
+                reports.append(
+                    pd.DataFrame(
+                        {
+                            "table": [kind],
+                            "check": ["required"],
+                            "term": [term],
+                            "row": [np.nan],
+                        }
+                    )
+                )
+            continue
+        _add("required", term, table[term].isna().to_numpy())
+
+    if "eventID" in table.columns:
+        ids = table["eventID"]
+        if kind == "event":
+            repeated = ids.duplicated() | ids.isin(event_ids)
+            _add("unique", "eventID", (repeated & ids.notna()).to_numpy())
+            event_ids.update(ids.dropna())
+        else:
+            missing = ~ids.isin(event_ids) & ids.notna()
+            _add("reference", "eventID", missing.to_numpy())
+
+    if "eventDate" in table.columns:
+        _add("date", "eventDate", _get_invalid_dates(table["eventDate"]))
+
+    for term, limit in (("decimalLatitude", 90), ("decimalLongitude", 180)):
+        if term in table.columns:
+            values = pd.to_numeric(table[term], errors="coerce")
+            invalid = (values.abs() > limit) | (values.isna() & table[term].notna())
+            _add("coordinates", term, invalid.to_numpy())
+
+    return reports
+
+
+def _create_dwc_partition(
+    kind: str,
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    projects: pd.DataFrame = None,
+    remove_duplicate_kws: dict = None,
+    max_media: int = None,
+) -> pd.DataFrame:
+    prepared = _prepare_dwc_images(images, deployments)
+    if kind == "occurrence":
+        table = _build_dwc_occurrence(
+            prepared, projects, remove_duplicate_kws, max_media
+        )
+    else:
+        table = _build_dwc_multimedia(prepared)
+    # Builders return tables indexed by the position of the source image
+    # in the prepared images, which are mapped back to the images' labels
+    # so partial results can be put back in order.
+    table.index = images.index[table.index]
+
+    return table
+
+
+def _create_dwc_partitioned(
+    kind: str, images: pd.DataFrame, deployments: pd.DataFrame, n_jobs: int, *args
+):
+    # Images are split into partitions of whole deployments (a few per
+    # process to balance the load) that are built in parallel and put
+    # back in the images' order.
+    images = images.reset_index(drop=True)
+    chunksize = max(int(np.ceil(len(images) / (4 * n_jobs))), 1)
+    tables = _map_dwc_partitions(kind, images, deployments, chunksize, n_jobs, *args)
+
+    return pd.concat(list(tables)).sort_index().reset_index(drop=True)
+
+
+def _get_deployment_chunks(images: pd.DataFrame, chunksize: int):
+    # Whole deployments are assigned to each chunk so duplicates are
+    # still removed correctly. A single deployment with more images than
+    # chunksize makes up a chunk by itself. Images without a deployment
+    # are grouped as another deployment.
+    ids = images[_labels.images.deployment_id]
+    counts = ids.value_counts(dropna=False).reindex(ids.unique())
+    offsets = counts.cumsum() - counts
+    labels = ids.map(offsets // chunksize)
+    if images.empty:
+        yield images
+    for _, chunk in images.groupby(labels, sort=True, dropna=False):
+        yield chunk
+
+
+def _get_dwc_parquet_schema(kind: str, table: pd.DataFrame):
+    # Categorical terms are dictionary encoded strings, numeric columns
+    # keep their type and everything else (including columns without
+    # any value, whose type is unknown) is written as text.
+    import pyarrow as pa
+
+    fields = []
+    for column, values in table.items():
+        if column in getattr(_dwc, kind).categories:
+            dtype = pa.dictionary(pa.int32(), pa.string())
+        elif pd.api.types.is_bool_dtype(values) and values.notna().any():
+            dtype = pa.bool_()
+        elif pd.api.types.is_integer_dtype(values) and values.notna().any():
+            dtype = pa.int64()
+        elif pd.api.types.is_float_dtype(values) and values.notna().any():
+            dtype = pa.float64()
+        else:
+            dtype = pa.string()
+        fields.append(pa.field(column, dtype))
+
+    return pa.schema(fields)
+
+
+def _get_invalid_dates(dates: pd.Series) -> np.ndarray:
+    # Dates must be ISO 8601 calendar dates (YYYY, YYYY-MM or YYYY-MM-DD)
+    # or intervals of two of them separated by a slash, where the start
+    # is not after the end. Partial dates are completed with the first
+    # month and day and times, if any, are ignored.
+    date = r"(\d{4}(?:-\d{2}){0,2})(?:T\d{2}:\d{2}(?::\d{2})?)?"
+    parts = dates.astype(str).str.extract(f"^{date}(?:/{date})?$")
+    parts[1] = parts[1].fillna(parts[0])
+    bounds = []
+    for part in (parts[0], parts[1]):
+        suffix = part.str.len().map({4: "-01-01", 7: "-01", 10: ""})
+        bound = pd.to_datetime(part + suffix, format="%Y-%m-%d", errors="coerce")
+        bounds.append(bound)
+    invalid = bounds[0].isna() | bounds[1].isna() | (bounds[0] > bounds[1])
+
+    return (invalid & dates.notna()).to_numpy()
+
+
+def _get_term_iri(term: str) -> str:
+    if term in _dwc.terms.dcterms:
+        return _dwc.terms.namespaces["dcterms"] + term
+    return _dwc.terms.namespaces["dwc"] + term
+
 
 def _gs_to_https(location: pd.Series) -> pd.Series:
+    # Locations are gs://<bucket>/<path> URIs, so only the scheme has to
+    # be sliced off. Categorical locations are converted once per
+    # category.
     base_url = "https://console.cloud.google.com/storage/browser/"
-    bucket = location.str.split("/").str[2]
-    uri = location.str.split("/").str[3:].str.join("/")
+    if isinstance(location.dtype, pd.CategoricalDtype):
+        categories = location.cat.categories
+        return location.cat.rename_categories(base_url + categories.str[5:])
+
+    return base_url + location.str[5:]
+
+
+def _hash_dwc_table(kind: str, table: pd.DataFrame) -> tuple:
+    # Identifies each record by its key terms (plus a counter for
+    # repeated keys) joined by a unit separator, with missing terms as
+    # empty strings, and hashes the record's values as text (or missing)
+    # so hashes do not depend on dtypes (e.g. an all-missing column read
+    # as float in one export and as object in the next).
+    separator = "\x1f"
+    keys = pd.Series("", index=table.index)
+    for term in getattr(_dwc, kind).key:
+        keys = keys + table[term].astype(str).where(table[term].notna(), "")
+        keys = keys + separator
+    keys = keys + keys.groupby(keys).cumcount().astype(str)
+    values = table.astype(str).where(table.notna())
+    hashes = pd.util.hash_pandas_object(values, index=False)
+
+    return pd.Index(keys), hashes.to_numpy()
+
+
+def _join_media(urls: np.ndarray, starts: np.ndarray, max_media: int) -> np.ndarray:
+    # Joins the URLs of each run (starting where starts is True) with
+    # pipes. Missing URLs and those beyond max_media in each run are
+    # skipped.
+    runs = np.cumsum(starts) - 1
+    ranks = np.arange(len(urls)) - np.flatnonzero(starts)[runs]
+    mask = pd.notna(urls)
+    if max_media is not None:
+        mask &= ranks < max_media
+
+    media = np.full(starts.sum(), np.nan, dtype=object)
+    if mask.any():
+        # All URLs are joined once and each run is sliced out of the
+        # result using the cumulative lengths as offsets.
+        urls = urls[mask]
+        runs = runs[mask]
+        offsets = np.flatnonzero(np.r_[True, runs[1:] != runs[:-1], True])
+        ends = np.r_[0, np.cumsum(pd.Series(urls).str.len().to_numpy() + 1)]
+        joined = "|".join(urls)
+        media[runs[offsets[:-1]]] = [
+            joined[i:j] for i, j in zip(ends[offsets[:-1]], ends[offsets[1:]] - 1)
+        ]
+
+    return media
+
+
+def _map_dwc_partitions(
+    kind: str,
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    chunksize: int,
+    n_jobs: int,
+    *args,
+):
+    # Yields the tables built from chunks of whole deployments, in the
+    # order their deployments first appear in the images. Each chunk is sent with its own deployments only.
+    # In parallel, at most two chunks per process are pending at a time
+    # so results can be written as they arrive.
+    ids = deployments[_labels.deployments.deployment_id]
+    partitions = (
+        (chunk, deployments[ids.isin(chunk[_labels.images.deployment_id].unique())])
+        for chunk in _get_deployment_chunks(images, chunksize)
+    )
+    if n_jobs == 1:
+        for chunk, chunk_deployments in partitions:
+            yield _create_dwc_partition(kind, chunk, chunk_deployments, *args)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        pending = collections.deque()
+        for chunk, chunk_deployments in partitions:
+            pending.append(
+                executor.submit(
+                    _create_dwc_partition, kind, chunk, chunk_deployments, *args
+                )
+            )
+            if len(pending) > 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _prepare_dwc_images(images: pd.DataFrame, deployments: pd.DataFrame) -> dict:
+    # Intermediate results shared by the Occurrence and Simple Multimedia
+    # builders: the images joined with their deployments, the lowest
+    # taxon and rank of each image and the images' HTTPS URLs.
+    df = pd.merge(
+        images.reset_index(drop=True),
+        deployments.drop(columns=_labels.deployments.project_id, errors="ignore"),
+        on=_labels.images.deployment_id,
+        how="left",
+    )
+    taxonomy = df[_utils.taxonomy.taxonomy_columns]
+    taxa, ranks = get_lowest_taxon(taxonomy, return_rank=True)
+
+    return {
+        "images": df,
+        "taxa": taxa,
+        "ranks": ranks,
+        "urls": _gs_to_https(df[_labels.images.url]),
+    }
+
+
+def _read_dwc_meta(archive: zipfile.ZipFile) -> list:
+    # Returns the kind, location, separator and terms of every file in
+    # the archive, starting with the core.
+    namespace = {"dwca": "http://rs.tdwg.org/text/"}
+    kinds = {row_type: kind for kind, row_type in _dwc.terms.row_types.items()}
+    root = ET.fromstring(archive.read("meta.xml"))
+    files = []
+    for element in root.findall("dwca:core", namespace) + root.findall(
+        "dwca:extension", namespace
+    ):
+        fields = element.findall("dwca:field", namespace)
+        files.append(
+            {
+                "kind": kinds.get(element.get("rowType")),
+                "location": element.find("dwca:files/dwca:location", namespace).text,
+                "sep": element.get("fieldsTerminatedBy", ",").replace("\\t", "\t"),
+                "skiprows": int(element.get("ignoreHeaderLines", 0)),
+                "names": [field.get("term").rsplit("/", 1)[-1] for field in fields],
+            }
+        )
+
+    return files
+
+
+def _to_dwc_parquet_table(table: pd.DataFrame, schema) -> pd.DataFrame:
+    # Values of text columns are converted to strings (as in the CSV
+    # files), keeping missing values as missing.
+    import pyarrow as pa
+
+    table = table.copy()
+    for field in schema:
+        if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type):
+            values = table[field.name]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                table[field.name] = values.astype(str).where(values.notna())
+
+    return table
+
+
+def _write_dwc_archive(path: Union[str, pathlib.Path], members: dict, compression: str):
+    # Writes every member (a kind and an iterable of tables, consumed one
+    # table at a time) and the metafile describing them. The first member
+    # is the core.
+    methods = {
+        "stored": zipfile.ZIP_STORED,
+        "deflated": zipfile.ZIP_DEFLATED,
+        "bzip2": zipfile.ZIP_BZIP2,
+        "lzma": zipfile.ZIP_LZMA,
+    }
+    if compression not in methods:
+        raise ValueError(
+            "compression must be one of ['stored', 'deflated', 'bzip2', 'lzma']"
+        )
+
+    files = {}
+    with zipfile.ZipFile(path, "w", compression=methods[compression]) as archive:
+        for name, (kind, tables) in members.items():
+            columns = _write_dwc_member(archive, name, kind, tables)
+            files[name] = (kind, columns)
+        _write_dwc_meta(archive, files)
+
+
+def _write_dwc_member(archive: zipfile.ZipFile, name: str, kind: str, tables) -> list:
+    # Only the first table is written with a header. If there are no
+    # tables, the header is written from the kind's output columns.
+    columns = None
+    with archive.open(name, "w", force_zip64=True) as member:
+        f = io.TextIOWrapper(member, encoding="utf-8", newline="")
+        writer = csv.writer(f, lineterminator="\n")
+        for table in tables:
+            if columns is None:
+                columns = table.columns.tolist()
+                writer.writerow(columns)
+            table = table.astype(object).where(table.notna(), None)
+            writer.writerows(table.itertuples(index=False, name=None))
+        if columns is None:
+            columns = list(getattr(_dwc, kind).columns)
+            writer.writerow(columns)
+        f.flush()
+        f.detach()
+
+    return columns
+
+
+def _write_dwc_meta(archive: zipfile.ZipFile, files: dict) -> None:
+    root = ET.Element("archive", xmlns="http://rs.tdwg.org/text/")
+    for i, (name, (kind, columns)) in enumerate(files.items()):
+        element = ET.SubElement(
+            root,
+            "core" if i == 0 else "extension",
+            encoding="UTF-8",
+            fieldsTerminatedBy=",",
+            linesTerminatedBy="\\n",
+            fieldsEnclosedBy='"',
+            ignoreHeaderLines="1",
+            rowType=_dwc.terms.row_types[kind],
+        )
+        location = ET.SubElement(ET.SubElement(element, "files"), "location")
+        location.text = name
+        ET.SubElement(
+            element, "id" if i == 0 else "coreid", index=str(columns.index("eventID"))
+        )
+        for j, term in enumerate(columns):
+            ET.SubElement(element, "field", index=str(j), term=_get_term_iri(term))
+
+    archive.writestr("meta.xml", ET.tostring(root, encoding="unicode"))
+
+
+def _write_dwc_parquet(
+    path: Union[str, pathlib.Path], members: dict, compression: str
+) -> None:
+    # Writes every member as a Parquet file with one row group per table,
+    # so only one table is held in memory at a time. The schema is fixed
+    # by the first table and every other table is cast to it.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, (kind, tables) in members.items():
+        writer = None
+        for table in tables:
+            if writer is None:
+                schema = _get_dwc_parquet_schema(kind, table)
+                writer = pq.ParquetWriter(
+                    path.joinpath(name).with_suffix(".parquet"),
+                    schema,
+                    compression=compression,
+                )
+            writer.write_table(
+                pa.Table.from_pandas(
+                    _to_dwc_parquet_table(table, schema),
+                    schema=schema,
+                    preserve_index=False,
+                )
+            )
+        if writer is None:
+            columns = getattr(_dwc, kind).columns
+            table = pd.DataFrame(columns=columns, dtype=object)
+            schema = _get_dwc_parquet_schema(kind, table)
+            writer = pq.ParquetWriter(
+                path.joinpath(name).with_suffix(".parquet"),
+                schema,
+                compression=compression,
+            )
+            writer.write_table(
+                pa.Table.from_pandas(table, schema=schema, preserve_index=False)
+            )
+        writer.close()
 
-    return base_url + bucket + "/" + uri
 
 def create_dwc_archive(
     cameras: pd.DataFrame,
@@ -25,11 +574,14 @@ def create_dwc_archive(
     images: pd.DataFrame,
     projects: pd.DataFrame,
     remove_duplicate_kws: dict = None,
+    max_media: int = None,
 ) -> tuple:
     """
     Creates a Darwin Core Archive consisting of four different cores and
     extensions: Event, Occurrence, Measurement or Facts and Simple
-    Multimedia.
+    Multimedia. Events are created one per deployment, with the
+    deployment id as eventID, so core ids are unique and every extension
+    record refers to an event in the core.
 
     Parameters
     ----------
@@ -44,6 +596,9 @@ def create_dwc_archive(
     remove_duplicate_kws : dict
         Keyword arguments passed to the wiutils.remove_duplicate function.
         Used for the creation of the Occurrence Core.
+    max_media : int
+        Maximum number of images listed in the associatedMedia term of
+        each occurrence. If None, all the images are listed.
 
     Returns
     -------
@@ -57,15 +612,20 @@ def create_dwc_archive(
         Darwin Core Simple Multimedia dataframe.
 
     """
-    event = create_dwc_event(deployments, projects)
-    occurrence = create_dwc_occurrence(
-        images, deployments, projects, remove_duplicate_kws
-    )
-    measurement = create_dwc_measurement(cameras, deployments)
-    multimedia = create_dwc_multimedia(images, deployments)
+    prepared = _prepare_dwc_images(images, deployments)
+    deployment_ids = prepared["images"][_labels.images.deployment_id].to_numpy()
+
+    event = _build_dwc_event(deployments, projects)
+    occurrence = _add_event_ids(
+        _build_dwc_occurrence(prepared, projects, remove_duplicate_kws, max_media),
+        deployment_ids,
+    ).reset_index(drop=True)
+    measurement = create_dwc_measurement(deployments, cameras)
+    multimedia = _build_dwc_multimedia(prepared)
 
     return event, occurrence, measurement, multimedia
 
+
 def create_dwc_event(
     deployments: pd.DataFrame,
     projects: pd.DataFrame,
@@ -107,32 +667,28 @@ def create_dwc_event(
         + df[_labels.deployments.end].dt.strftime("%Y-%m-%d")
     )
 
-    with open(pathlib.Path(__file__).parent.joinpath("_dwc/countries.json")) as f:
-        countries = pd.DataFrame(json.load(f))
-        core["countryCode"] = core["countryCode"].map(
-            countries.set_index("alpha-3")["alpha-2"]
-        )
+    core["countryCode"] = core["countryCode"].map(_dwc.countries.codes)
 
     core = core.reindex(columns=_dwc.event.order)
 
     # Update March 23' version
-    core[['continent',
-            'country',
-            'county',
-            'maximumElevationInMeters',
-            'minimumElevationInMeters']] = None
+    core[
+        [
+            "continent",
+            "country",
+            "county",
+            "maximumElevationInMeters",
+            "minimumElevationInMeters",
+        ]
+    ] = None
 
-    core['eventID'] = core['parentEventID']
+    core["eventID"] = core["parentEventID"]
 
-    core = core[['eventID', 'institutionCode', 'sampleSizeValue', 'sampleSizeUnit',
-       'samplingProtocol', 'samplingEffort', 'eventDate', 'continent',
-       'country', 'countryCode',  'county',
-       'minimumElevationInMeters', 'maximumElevationInMeters',
-       'decimalLongitude', 'decimalLatitude', 'geodeticDatum',
-       'eventRemarks']]
+    core = core[_dwc.event.columns]
 
     return core
 
+
 def create_dwc_measurement(
     deployments: pd.DataFrame,
     cameras: pd.DataFrame,
@@ -157,25 +713,35 @@ def create_dwc_measurement(
     """
     df = pd.merge(deployments, cameras, on=_labels.deployments.camera_id, how="left")
 
-    extension = pd.DataFrame()
-    for item in _dwc.measurement.mapping:
-        temp = pd.DataFrame()
-        temp["eventID"] = df.loc[:, _labels.deployments.deployment_id]
-        temp["measurementType"] = item["type"]
-        temp["measurementValue"] = df.loc[:, item["value"]]
-        temp["measurementUnit"] = item["unit"]
-        if item["remarks"]:
-            temp["measurementRemarks"] = df.loc[:, item["remarks"]]
-        else:
-            temp["measurementRemarks"] = np.nan
-        extension = pd.concat([extension, temp], ignore_index=True)
+    # Facts are stacked item by item (i.e. in column-major order) and
+    # missing values are discarded before building the dataframe.
+    mapping = _dwc.measurement.mapping
+    values = df[[item["value"] for item in mapping]].to_numpy()
+    remarks = np.full(values.shape, np.nan, dtype=object)
+    has_remarks = [i for i, item in enumerate(mapping) if item["remarks"]]
+    if has_remarks:
+        columns = [mapping[i]["remarks"] for i in has_remarks]
+        remarks[:, has_remarks] = df[columns].to_numpy()
+    mask = pd.notna(values).ravel(order="F")
 
-    extension = extension.dropna(subset=["measurementValue"]).reset_index(drop=True)
+    ids = df[_labels.deployments.deployment_id].to_numpy()
+    types = np.array([item["type"] for item in mapping], dtype=object)
+    units = np.array([item["unit"] for item in mapping], dtype=object)
+    extension = pd.DataFrame(
+        {
+            "eventID": np.tile(ids, len(mapping))[mask],
+            "measurementType": np.repeat(types, len(df))[mask],
+            "measurementValue": values.ravel(order="F")[mask],
+            "measurementUnit": np.repeat(units, len(df))[mask],
+            "measurementRemarks": remarks.ravel(order="F")[mask],
+        }
+    ).infer_objects()
 
     return extension
 
+
 def create_dwc_multimedia(
-    images: pd.DataFrame, deployments: pd.DataFrame
+    images: pd.DataFrame, deployments: pd.DataFrame, n_jobs: int = 1
 ) -> pd.DataFrame:
     """
     Creates a Darwin Core Simple Multimedia dataframe from images and
@@ -189,6 +755,11 @@ def create_dwc_multimedia(
         Dataframe with the bundle's images.
     deployments : DataFrame
         Dataframe with the bundle's deployments.
+    n_jobs : int
+        Number of processes used to build the extension in parallel. Images
+        are split into partitions of whole deployments, so duplicates
+        are still removed correctly. If -1, all available processors are
+        used.
 
     Returns
     -------
@@ -196,30 +767,23 @@ def create_dwc_multimedia(
         Darwin Core Simple Multimedia dataframe.
 
     """
-    df = pd.merge(images, deployments, on=_labels.images.deployment_id, how="left")
-    df[_labels.images.url] = _gs_to_https(df[_labels.images.url])
-
-    extension = df.rename(columns=_dwc.multimedia.mapping)
-    extension = extension[
-        extension.columns[extension.columns.isin(_dwc.multimedia.order)]
-    ]
-
-    for term, value in _dwc.multimedia.constants.items():
-        extension[term] = value
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
 
-    extension["title"] = get_lowest_taxon(images, return_rank=False).fillna(
-        "Blank or unidentified"
-    )
+    if n_jobs == 1:
+        prepared = _prepare_dwc_images(images, deployments)
+        return _build_dwc_multimedia(prepared)
 
-    extension = extension.reindex(columns=_dwc.multimedia.order)
+    return _create_dwc_partitioned("multimedia", images, deployments, n_jobs)
 
-    return extension
 
 def create_dwc_occurrence(
     images: pd.DataFrame,
     deployments: pd.DataFrame,
     projects: pd.DataFrame,
     remove_duplicate_kws: dict = None,
+    max_media: int = None,
+    n_jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Creates a Darwin Core Occurrence dataframe from images, deployments
@@ -237,6 +801,14 @@ def create_dwc_occurrence(
         Dataframe with the bundle's projects.
     remove_duplicate_kws : dict
         Keyword arguments passed to the wiutils.remove_duplicate function.
+    max_media : int
+        Maximum number of images listed in the associatedMedia term of
+        each occurrence. If None, all the images are listed.
+    n_jobs : int
+        Number of processes used to build the core in parallel. Images
+        are split into partitions of whole deployments, so duplicates
+        are still removed correctly. If -1, all available processors are
+        used.
 
     Returns
     -------
@@ -244,70 +816,429 @@ def create_dwc_occurrence(
         Darwin Core Occurrence dataframe.
 
     """
-    if remove_duplicate_kws is None:
-        remove_duplicate_kws = {}
-    remove_duplicate_kws.update({"reset_index": False})
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
 
-    images = images.copy()
-    images = remove_unidentified(images, rank="class", reset_index=True)
-    filtered = remove_duplicates(images, **remove_duplicate_kws)
+    if n_jobs == 1:
+        prepared = _prepare_dwc_images(images, deployments)
+        core = _build_dwc_occurrence(
+            prepared, projects, remove_duplicate_kws, max_media
+        )
+        return core.reset_index(drop=True)
 
-    df = pd.merge(
-        filtered,
-        deployments.drop(columns=_labels.deployments.project_id),
-        on=_labels.images.deployment_id,
-        how="left",
+    return _create_dwc_partitioned(
+        "occurrence",
+        images,
+        deployments,
+        n_jobs,
+        projects,
+        remove_duplicate_kws,
+        max_media,
     )
-    df = pd.merge(df, projects, on=_labels.images.project_id, how="left")
-    df[_labels.images.date] = pd.to_datetime(df[_labels.images.date])
 
-    core = df.rename(columns=_dwc.occurrence.mapping)
-    core = core[core.columns[core.columns.isin(_dwc.occurrence.order)]]
 
-    for term, value in _dwc.occurrence.constants.items():
-        core[term] = value
+def diff_dwc_archive(archive: tuple, manifest: dict = None) -> tuple:
+    """
+    Compares the cores and extensions of a Darwin Core Archive with a
+    previous publication and keeps only the records that were added,
+    changed or removed since then. Records are compared through a
+    manifest of hashes of their values, identified by their key terms
+    (eventID for events, recordNumber for occurrences, eventID and
+    measurementType for measurements or facts and identifier for
+    multimedia). Values are compared as text, so the same values with
+    different dtypes are not reported as changes. Notice that the whole
+    archive is hashed on every call, so the cost is proportional to the
+    size of the archive rather than to the number of changes.
 
-    core["eventDate"] = df[_labels.images.date].dt.strftime("%Y-%m-%d")
-    core["eventTime"] = df[_labels.images.date].dt.strftime("%H:%M:%S")
+    Parameters
+    ----------
+    archive : tuple
+        (event, occurrence, measurement, multimedia) tuple of dataframes
+        as returned by wiutils.create_dwc_archive.
+    manifest : dict
+        Manifest of the previous publication, as returned by a previous
+        call to this function. If None, every record is considered as
+        added.
+
+    Returns
+    -------
+    tuple
+        (event, occurrence, measurement, multimedia) tuple of dataframes
+        with the added, changed and removed records and a 'change'
+        column with one of 'added', 'changed' or 'removed'. Removed
+        records only have their key terms.
+    dict
+        Manifest of the current publication. It can be serialized to
+        JSON and passed to the next call to this function.
+
+    """
+    if manifest is None:
+        manifest = {}
+
+    changes = []
+    current = {}
+    kinds = ["event", "occurrence", "measurement", "multimedia"]
+    for kind, table in zip(kinds, archive):
+        keys, hashes = _hash_dwc_table(kind, table)
+        current[kind] = {"keys": keys.tolist(), "hashes": hashes.tolist()}
+
+        previous = manifest.get(kind, {"keys": [], "hashes": []})
+        previous_keys = pd.Index(previous["keys"], dtype=object)
+        # The trailing sentinel is picked by the -1 positions of new keys.
+        previous_hashes = np.append(np.array(previous["hashes"], dtype=np.uint64), 0)
+        positions = previous_keys.get_indexer(keys)
+        added = positions == -1
+        changed = ~added & (previous_hashes[positions] != hashes)
+
+        result = table[added | changed].reset_index(drop=True)
+        result["change"] = np.where(added[added | changed], "added", "changed")
+
+        removed = previous_keys[~previous_keys.isin(keys)]
+        if len(removed):
+            removed = removed.str.split("\x1f", expand=True).to_frame(index=False)
+            removed = removed.iloc[:, :-1].replace("", np.nan)
+            removed.columns = getattr(_dwc, kind).key
+            removed["change"] = "removed"
+            result = pd.concat([result, removed], ignore_index=True)
+
+        changes.append(result)
+
+    return tuple(changes), current
+
+
+def validate_dwc_archive(
+    archive: Union[tuple, str, pathlib.Path], chunksize: int = 100000
+) -> pd.DataFrame:
+    """
+    Validates a Darwin Core Archive before publishing it. The following
+    checks are run:
+
+        - 'required': required terms are present and not empty.
+        - 'unique': eventID values are unique in the Event core.
+        - 'reference': eventID values of the extensions exist in the
+        Event core.
+        - 'date': eventDate values are ISO 8601 dates or date intervals.
+        - 'coordinates': decimalLatitude and decimalLongitude values are
+        numbers within [-90, 90] and [-180, 180] respectively.
+
+    Parameters
+    ----------
+    archive : tuple, str or Path
+        Either the (event, occurrence, measurement, multimedia) tuple of
+        dataframes returned by wiutils.create_dwc_archive (extensions can
+        be None) or the path of a zip file written by
+        wiutils.write_dwc_archive. Written archives are read in chunks.
+    chunksize : int
+        Number of rows read at a time from each file of a written
+        archive. Only has effect if archive is a path.
+
+    Returns
+    -------
+    DataFrame
+        Report with one row per failed check with the table, the check,
+        the term and the offending row (i.e. the index label in the
+        dataframe or the position of the record in the file). Terms
+        missing altogether are reported without a row. An empty report
+        means the archive is valid.
+
+    """
+    reports = []
+    event_ids = set()
+
+    if isinstance(archive, (str, pathlib.Path)):
+        with zipfile.ZipFile(archive) as z:
+            for file in _read_dwc_meta(z):
+                if file["kind"] is None:
+                    continue
+                chunks = pd.read_csv(
+                    z.open(file["location"]),
+                    sep=file["sep"],
+                    skiprows=file["skiprows"],
+                    header=None,
+                    names=file["names"],
+                    dtype=str,
+                    chunksize=chunksize,
+                )
+                offset = 0
+                for chunk in chunks:
+                    index = pd.RangeIndex(offset, offset + len(chunk))
+                    reports += _check_dwc_table(
+                        file["kind"], chunk, index, event_ids, offset == 0
+                    )
+                    offset += len(chunk)
+    else:
+        kinds = ["event", "occurrence", "measurement", "multimedia"]
+        for kind, table in zip(kinds, archive):
+            if table is not None:
+                reports += _check_dwc_table(kind, table, table.index, event_ids)
 
-    images.loc[filtered.index, "__seq"] = np.arange(len(filtered))
-    images["__seq"] = images["__seq"].fillna(method="ffill")
-    images[_labels.images.url] = _gs_to_https(images[_labels.images.url])
-    core["associatedMedia"] = images.groupby("__seq").agg(
-        {_labels.images.url: "|".join}
+    columns = ["table", "check", "term", "row"]
+    if not reports:
+        return pd.DataFrame(columns=columns).astype({"row": "Int64"})
+
+    report = pd.concat(reports, ignore_index=True)[columns]
+    if pd.api.types.is_numeric_dtype(report["row"]):
+        report["row"] = report["row"].astype("Int64")
+
+    # Chunks interleave the results of different terms, so the report is
+    # sorted to be the same regardless of how the archive was read.
+    order = {
+        "table": ["event", "occurrence", "measurement", "multimedia"],
+        "check": ["required", "unique", "reference", "date", "coordinates"],
+    }
+    keys = report.assign(
+        table=pd.Categorical(report["table"], order["table"], ordered=True),
+        check=pd.Categorical(report["check"], order["check"], ordered=True),
     )
+    keys = keys.sort_values(["table", "check", "term", "row"], kind="mergesort")
+    report = report.loc[keys.index].reset_index(drop=True)
 
-    filtered = filtered.reset_index(drop=True)
-    taxa, ranks = get_lowest_taxon(filtered, return_rank=True)
-    epithets = filtered[_labels.images.species].str.split(" ", expand=True)
-    core["scientificName"] = taxa
-    core["taxonRank"] = ranks
-    core["specificEpithet"] = epithets[0]
-    core["infraspecificEpithet"] = epithets.get(1, np.nan)
+    return report
 
-    core = core.reindex(columns=_dwc.occurrence.order)
 
-    #Update March 23' version
-
-    core["type"] = 'Imagen'
-
-    core[['dateIdentified',
-            'collectionCode',
-            'occurrenceID',
-            'scientificNameAuthorship']] = None
-    
-    core['eventID'] = core['parentEventID']
-
-    core['accessRights'] = projects['metadata_license'].values[0]
-    
-    core = core[[
-                'occurrenceID', 'eventID', 'basisOfRecord', 'type', 'institutionCode',
-                'collectionCode', 'recordNumber', 'recordedBy', 'organismQuantity',
-                'organismQuantityType', 'preparations', 'eventDate', 'eventTime',
-                'identifiedBy', 'dateIdentified', 'scientificName', 'kingdom', 'phylum',
-                'class', 'order', 'family', 'genus', 'specificEpithet',
-                'infraspecificEpithet', 'taxonRank', 'scientificNameAuthorship',
-                'vernacularName', 'accessRights', 'associatedMedia'
-                ]]
+def write_dwc_archive(
+    bundle: Union[tuple, str, pathlib.Path],
+    path: Union[str, pathlib.Path],
+    remove_duplicate_kws: dict = None,
+    max_media: int = None,
+    chunksize: int = 100000,
+    compression: str = None,
+    file_format: str = "csv",
+) -> None:
+    """
+    Writes a Darwin Core Archive zip file with the Event core and the
+    Occurrence, Measurement or Facts and Simple Multimedia extensions,
+    plus the archive's metafile (meta.xml). Events are written one per
+    deployment, with the deployment id as eventID, so core ids are unique
+    and every extension record refers to an event in the core.
+    Occurrences and multimedia are built and written in chunks of whole
+    deployments, so only one chunk of each table is held in memory at a
+    time. The records written do not depend on chunksize, but they are
+    grouped by chunk (in the order their deployments first appear in
+    images) rather than kept in the images' order.
 
-    return core
+    Parameters
+    ----------
+    bundle : tuple, str or Path
+        Either a (cameras, deployments, images, projects) tuple of
+        dataframes or the path of a project bundle (see
+        wiutils.read_bundle).
+    path : str or Path
+        Path of the zip file to write. If file_format is 'parquet', path
+        of the output directory. It is created if it does not exist.
+    remove_duplicate_kws : dict
+        Keyword arguments passed to the wiutils.remove_duplicate function.
+        Used for the creation of the Occurrence Core.
+    max_media : int
+        Maximum number of images listed in the associatedMedia term of
+        each occurrence. If None, all the images are listed.
+    chunksize : int
+        Approximate number of images processed in each chunk. Chunks
+        always contain complete deployments.
+    compression : str
+        Compression method. For CSV files, the method for the archive
+        members. Possible values are:
+
+            - 'stored'
+            - 'deflated'
+            - 'bzip2'
+            - 'lzma'
+
+        For Parquet files, any codec supported by pandas.to_parquet
+        (e.g. 'snappy' or 'zstd'). If None, 'deflated' is used for CSV
+        files and 'zstd' for Parquet files.
+    file_format : str
+        Format of the files. Possible values are:
+
+            - 'csv' to write a Darwin Core Archive zip file with CSV
+            files and its metafile (meta.xml)
+            - 'parquet' to write one Parquet file per core / extension
+            in the path directory, with categorical terms (e.g.
+            basisOfRecord or taxonRank) dictionary encoded
+
+    Returns
+    -------
+    None
+
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ValueError("file_format must be one of ['csv', 'parquet'].")
+
+    if isinstance(bundle, (str, pathlib.Path)):
+        bundle = read_bundle(bundle)
+    cameras, deployments, images, projects = bundle
+
+    images = images.reset_index(drop=True)
+    deployment_ids = images[_labels.images.deployment_id].to_numpy()
+
+    event = _build_dwc_event(deployments, projects)
+    occurrences = (
+        _add_event_ids(table, deployment_ids)
+        for table in _map_dwc_partitions(
+            "occurrence",
+            images,
+            deployments,
+            chunksize,
+            1,
+            projects,
+            remove_duplicate_kws,
+            max_media,
+        )
+    )
+    multimedia = _map_dwc_partitions("multimedia", images, deployments, chunksize, 1)
+    members = {
+        "event.csv": ("event", [event]),
+        "occurrence.csv": ("occurrence", occurrences),
+        "measurementorfact.csv": (
+            "measurement",
+            [create_dwc_measurement(deployments, cameras)],
+        ),
+        "multimedia.csv": ("multimedia", multimedia),
+    }
+    if file_format == "csv":
+        _write_dwc_archive(path, members, compression or "deflated")
+    else:
+        _write_dwc_parquet(path, members, compression or "zstd")
+
+
+def write_dwc_batch(
+    bundles: Union[list, tuple],
+    path: Union[str, pathlib.Path],
+    remove_duplicate_kws: dict = None,
+    max_media: int = None,
+    chunksize: int = 100000,
+    compression: str = None,
+    file_format: str = "csv",
+    n_jobs: int = 1,
+) -> None:
+    """
+    Writes a single Darwin Core Archive zip file with the information of
+    several projects. Tables from all the projects are concatenated and
+    every core and extension is built once for all of them. To keep ids
+    unique across projects, eventID values are prefixed with the project
+    id of each record (e.g. '2003123:CTCAJ103744'), as occurrenceID values
+    always are.
+    Occurrences and multimedia are built and written in chunks of whole
+    deployments, so only a few chunks are held in memory at a time. As in
+    wiutils.write_dwc_archive, records are grouped by chunk rather than
+    kept in the images' order.
+
+    Parameters
+    ----------
+    bundles : list or tuple
+        Either a list of (cameras, deployments, images, projects) tuples
+        of dataframes or paths of project bundles (see
+        wiutils.read_bundle), or a single tuple of dataframes with the
+        concatenated tables of several projects.
+    path : str or Path
+        Path of the zip file to write. If file_format is 'parquet', path
+        of the output directory. It is created if it does not exist.
+    remove_duplicate_kws : dict
+        Keyword arguments passed to the wiutils.remove_duplicate function.
+        Used for the creation of the Occurrence Core.
+    max_media : int
+        Maximum number of images listed in the associatedMedia term of
+        each occurrence. If None, all the images are listed.
+    chunksize : int
+        Approximate number of images processed in each chunk. Chunks
+        always contain complete deployments.
+    compression : str
+        Compression method. For CSV files, the method for the archive
+        members. Possible values are:
+
+            - 'stored'
+            - 'deflated'
+            - 'bzip2'
+            - 'lzma'
+
+        For Parquet files, any codec supported by pandas.to_parquet
+        (e.g. 'snappy' or 'zstd'). If None, 'deflated' is used for CSV
+        files and 'zstd' for Parquet files.
+    file_format : str
+        Format of the files. Possible values are:
+
+            - 'csv' to write a Darwin Core Archive zip file with CSV
+            files and its metafile (meta.xml)
+            - 'parquet' to write one Parquet file per core / extension
+            in the path directory, with categorical terms (e.g.
+            basisOfRecord or taxonRank) dictionary encoded
+    n_jobs : int
+        Number of processes used to build the chunks of occurrences and
+        multimedia in parallel. If -1, all available processors are used.
+
+    Returns
+    -------
+    None
+
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ValueError("file_format must be one of ['csv', 'parquet'].")
+
+    if isinstance(bundles, tuple) and all(
+        isinstance(table, pd.DataFrame) for table in bundles
+    ):
+        bundles = [bundles]
+    bundles = [
+        read_bundle(bundle) if isinstance(bundle, (str, pathlib.Path)) else bundle
+        for bundle in bundles
+    ]
+    cameras, deployments, images, projects = (
+        pd.concat(tables, ignore_index=True) for tables in zip(*bundles)
+    )
+    projects = projects.drop_duplicates(_labels.deployments.project_id)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    event = _build_dwc_event(deployments, projects)
+    event = _add_project_ids(
+        event, ["eventID"], deployments[_labels.deployments.project_id].to_numpy()
+    )
+
+    # Camera ids are only unique within a project, so facts are built for
+    # each project separately.
+    measurement = []
+    for project_id, group in deployments.groupby(
+        _labels.deployments.project_id, sort=False
+    ):
+        mask = cameras[_labels.deployments.project_id] == project_id
+        table = create_dwc_measurement(group, cameras[mask])
+        measurement.append(
+            _add_project_ids(table, ["eventID"], np.full(len(table), project_id))
+        )
+
+    project_ids = images[_labels.images.project_id].to_numpy()
+    deployment_ids = images[_labels.images.deployment_id].to_numpy()
+    occurrences = (
+        _add_project_ids(
+            _add_event_ids(table, deployment_ids),
+            ["eventID"],
+            project_ids[table.index],
+        )
+        for table in _map_dwc_partitions(
+            "occurrence",
+            images,
+            deployments,
+            chunksize,
+            n_jobs,
+            projects,
+            remove_duplicate_kws,
+            max_media,
+        )
+    )
+    multimedia = (
+        _add_project_ids(table, ["eventID"], project_ids[table.index])
+        for table in _map_dwc_partitions(
+            "multimedia", images, deployments, chunksize, n_jobs
+        )
+    )
+    members = {
+        "event.csv": ("event", [event]),
+        "occurrence.csv": ("occurrence", occurrences),
+        "measurementorfact.csv": ("measurement", measurement),
+        "multimedia.csv": ("multimedia", multimedia),
+    }
+    if file_format == "csv":
+        _write_dwc_archive(path, members, compression or "deflated")
+    else:
+        _write_dwc_parquet(path, members, compression or "zstd")
@@ -98,6 +98,69 @@ def get_date_ranges(
     return df
 
 
+def get_detection_latency(
+    images: pd.DataFrame, deployments: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Gets the number of days from the start date of each deployment to
+    the first detection of each taxon. Taxa that were not detected in a
+    deployment are censored at its end date. Images outside the date
+    range of the corresponding deployment are ignored.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+
+    Returns
+    -------
+    DataFrame
+        Censored survival table with the duration (in days) until the
+        first detection (or until the end date if the taxon was not
+        detected) and whether the taxon was detected for every
+        deployment and taxon.
+
+    """
+    deployments = deployments.drop_duplicates(_labels.deployments.deployment_id)
+    deployments = deployments.dropna(
+        subset=[_labels.deployments.start, _labels.deployments.end]
+    )
+    deployments = deployments.sort_values(_labels.deployments.deployment_id)
+    ids = pd.Index(deployments[_labels.deployments.deployment_id])
+    starts = pd.to_datetime(deployments[_labels.deployments.start]).dt.floor("D")
+    ends = pd.to_datetime(deployments[_labels.deployments.end]).dt.floor("D")
+    durations = ((ends - starts) // pd.Timedelta(days=1)).to_numpy()
+
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+    positions = ids.get_indexer(images[_labels.images.deployment_id])
+    dates = pd.to_datetime(images[_labels.images.date]).dt.floor("D")
+    days = dates - starts.reset_index(drop=True).reindex(positions).to_numpy()
+    days = (days // pd.Timedelta(days=1)).fillna(-1).astype(int).to_numpy()
+    valid = (positions >= 0) & (taxon_codes >= 0) & (days >= 0)
+    valid[valid] = days[valid] <= durations[positions[valid]]
+
+    # The first detection of each (deployment, taxon) pair is the minimum
+    # number of days over the images with the same flattened code.
+    n_taxa = len(taxa)
+    first = np.full(len(ids) * n_taxa, np.iinfo(np.int64).max)
+    np.minimum.at(first, positions[valid] * n_taxa + taxon_codes[valid], days[valid])
+    detected = first < np.iinfo(np.int64).max
+    result = pd.DataFrame(
+        {
+            _labels.deployments.deployment_id: np.repeat(ids, n_taxa),
+            "taxon": np.tile(taxa, len(ids)),
+            "duration": np.where(detected, first, np.repeat(durations, n_taxa)),
+            "detected": detected,
+        }
+    )
+
+    return result
+
+
 def get_lowest_taxon(
     images: pd.DataFrame, return_rank: bool = False
 ) -> Union[pd.Series, tuple]:
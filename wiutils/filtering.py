@@ -8,6 +8,35 @@ from . import _domestic, _labels, _utils
 from .extraction import get_lowest_taxon, get_scientific_name
 
 
+def _sort_records(
+    images: pd.DataFrame, taxa: pd.Series, interval: int = 30, unit: str = "minutes"
+) -> tuple:
+    # Sorts the images by deployment, taxon and date and flags the ones
+    # that start a new record, i.e. those taken at least interval after
+    # the previous image of the same taxon in the same deployment. The
+    # duplicates of each record follow it in the sorted order. Images
+    # without taxon always start a new record.
+    if unit not in ("weeks", "days", "hours", "minutes", "seconds"):
+        raise ValueError(
+            "unit must be one of ['weeks', 'days', 'hours', 'minutes', 'seconds']"
+        )
+
+    df = pd.DataFrame(
+        {
+            _labels.images.deployment_id: images[_labels.images.deployment_id].values,
+            "taxon": np.asarray(taxa),
+            _labels.images.date: pd.to_datetime(images[_labels.images.date]).values,
+        }
+    )
+    df = df.sort_values([_labels.images.deployment_id, "taxon", _labels.images.date])
+    delta = df.groupby([_labels.images.deployment_id, "taxon"])[
+        _labels.images.date
+    ].diff()
+    starts = (delta >= pd.Timedelta(**{unit: interval})) | (delta.isna())
+
+    return df.index.to_numpy(), starts.to_numpy()
+
+
 def remove_domestic(
     images: pd.DataFrame, broad: bool = False, reset_index: bool = False
 ) -> pd.DataFrame:
@@ -86,36 +115,15 @@ def remove_duplicates(
         Copy of images with removed duplicates.
 
     """
-    if unit not in ("weeks", "days", "hours", "minutes", "seconds"):
-        raise ValueError(
-            "unit must be one of ['weeks', 'days', 'hours', 'minutes', 'seconds']"
-        )
-
-    images = images.copy()
-    images["taxon"] = get_lowest_taxon(images, return_rank=False)
-
-    df = images.copy()
-    df[_labels.images.date] = pd.to_datetime(df[_labels.images.date])
-
-    df = df.sort_values([_labels.images.deployment_id, "taxon", _labels.images.date])
-    delta = df.groupby([_labels.images.deployment_id, "taxon"])[
-        _labels.images.date
-    ].diff()
-    mask = (delta >= pd.Timedelta(**{unit: interval})) | (delta.isna())
-
-    images_reference = images.dropna(subset=["taxon"])
-    images_reference = images_reference.sort_values(
-        [_labels.images.deployment_id, "taxon", _labels.images.date]
-    )
-    df = images_reference.loc[mask]
-    df = pd.concat([df, images[images["taxon"].isna()]])
-    df = df.reindex(images.index.intersection(df.index))
+    taxa = get_lowest_taxon(images, return_rank=False)
+    order, starts = _sort_records(images, taxa, interval, unit)
+    keep = np.empty(len(images), dtype=bool)
+    keep[order] = starts
+    df = images[keep]
 
     if reset_index:
         df = df.reset_index(drop=True)
 
-    df = df.drop(columns="taxon")
-
     return df
 
 
@@ -214,7 +222,8 @@ def remove_unidentified(
 
     taxonomy_columns = _utils.taxonomy.get_taxonomy_columns(rank)
     exclude = ["No CV Result", "Unknown"]
-    images[taxonomy_columns] = images[taxonomy_columns].replace(exclude, np.nan)
+    taxonomy = images[taxonomy_columns]
+    images[taxonomy_columns] = taxonomy.where(~taxonomy.isin(exclude))
     images = images.dropna(subset=taxonomy_columns, how="all")
 
     if reset_index:
@@ -0,0 +1,179 @@
+"""
+Functions to summarize the spatial arrangement of deployments.
+"""
+import numpy as np
+import pandas as pd
+import scipy.spatial
+
+from . import _labels
+
+_earth_radius = 6371.0088
+
+
+def _get_coordinates(deployments: pd.DataFrame) -> tuple:
+    latitude = deployments[_labels.deployments.latitude].to_numpy(float)
+    longitude = deployments[_labels.deployments.longitude].to_numpy(float)
+
+    return np.radians(latitude), np.radians(longitude)
+
+
+def _project(latitude: np.ndarray, longitude: np.ndarray, origin: tuple) -> tuple:
+    # Local equirectangular projection (in km) around the origin, which is
+    # accurate enough for the extent of a camera trap survey.
+    origin_latitude, origin_longitude = np.radians(origin)
+    x = _earth_radius * (longitude - origin_longitude) * np.cos(origin_latitude)
+    y = _earth_radius * (latitude - origin_latitude)
+
+    return x, y
+
+
+def _to_unit_vectors(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    return np.column_stack(
+        [
+            np.cos(latitude) * np.cos(longitude),
+            np.cos(latitude) * np.sin(longitude),
+            np.sin(latitude),
+        ]
+    )
+
+
+def compute_nearest_neighbors(
+    deployments: pd.DataFrame, k: int = 1, method: str = "haversine"
+) -> pd.DataFrame:
+    """
+    Computes the distance from each deployment to its nearest neighbors
+    (e.g. to check the spacing between cameras).
+
+    Parameters
+    ----------
+    deployments : DataFrame
+        DataFrame with the project's deployments. Deployments without
+        coordinates are ignored.
+    k : int
+        Number of neighbors to find for each deployment.
+    method : str
+        Method to compute distances. Possible values are:
+
+            - 'haversine' for great-circle distances.
+            - 'projected' for euclidean distances on a local projection
+            centered on the deployments.
+
+    Returns
+    -------
+    DataFrame
+        Nearest neighbors (sorted from nearest to farthest) and distances
+        (in km) for each deployment.
+
+    """
+    if method not in ("haversine", "projected"):
+        raise ValueError("method must be one of ['haversine', 'projected']")
+
+    deployments = deployments.drop_duplicates(_labels.deployments.deployment_id)
+    deployments = deployments.dropna(
+        subset=[_labels.deployments.latitude, _labels.deployments.longitude]
+    )
+    if k >= len(deployments):
+        raise ValueError("k must be less than the number of deployments.")
+
+    latitude, longitude = _get_coordinates(deployments)
+    if method == "haversine":
+        points = _to_unit_vectors(latitude, longitude)
+    else:
+        origin = (np.degrees(latitude.mean()), np.degrees(longitude.mean()))
+        points = np.column_stack(_project(latitude, longitude, origin))
+
+    # The deployment itself is usually the first neighbor found, but it
+    # might not be when several deployments share the same coordinates,
+    # so it is removed explicitly (or the farthest neighbor otherwise).
+    tree = scipy.spatial.cKDTree(points)
+    distances, indices = tree.query(points, k=k + 1)
+    mask = indices != np.arange(len(points))[:, np.newaxis]
+    mask[mask.all(axis=1), -1] = False
+    distances = distances[mask].reshape(len(points), k)
+    indices = indices[mask].reshape(len(points), k)
+    if method == "haversine":
+        distances = 2 * _earth_radius * np.arcsin(np.minimum(distances / 2, 1))
+
+    ids = deployments[_labels.deployments.deployment_id].to_numpy()
+    result = pd.DataFrame(
+        {
+            f"{_labels.deployments.deployment_id}_x": np.repeat(ids, k),
+            f"{_labels.deployments.deployment_id}_y": ids[indices.ravel()],
+            "distance": distances.ravel(),
+        }
+    )
+
+    return result
+
+
+def get_grid_cells(
+    deployments: pd.DataFrame,
+    size: float,
+    shape: str = "square",
+    origin: tuple = None,
+) -> pd.Series:
+    """
+    Gets the grid cell of each deployment for a regular grid of square
+    or hexagonal cells. The result can be added as a column to the
+    deployments to use it as the groupby level of the summarizing
+    functions.
+
+    Parameters
+    ----------
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    size : float
+        Size of the cells (in km). For square cells it is the length of
+        their sides and for hexagonal cells the distance between the
+        centers of adjacent cells.
+    shape : str
+        Shape of the cells. Possible values are:
+
+            - 'square'
+            - 'hexagon'
+    origin : tuple
+        Latitude and longitude of the origin of the grid. If None, the
+        minimum latitude and longitude of the deployments are used.
+
+    Returns
+    -------
+    Series
+        Grid cell of each deployment, labeled with its column and row
+        indices (or axial coordinates for hexagonal cells). Deployments
+        without coordinates get NaN.
+
+    """
+    if shape not in ("square", "hexagon"):
+        raise ValueError("shape must be one of ['square', 'hexagon']")
+
+    latitude, longitude = _get_coordinates(deployments)
+    if origin is None:
+        origin = (np.degrees(np.nanmin(latitude)), np.degrees(np.nanmin(longitude)))
+    x, y = _project(latitude, longitude, origin)
+
+    if shape == "square":
+        columns = np.floor(x / size)
+        rows = np.floor(y / size)
+    else:
+        # Pointy-top hexagons in axial coordinates, rounded to the nearest
+        # cell through cube coordinates.
+        radius = size / np.sqrt(3)
+        q = (np.sqrt(3) / 3 * x - y / 3) / radius
+        r = (2 / 3 * y) / radius
+        s = -q - r
+        rounded_q, rounded_r, rounded_s = np.round(q), np.round(r), np.round(s)
+        delta_q = np.abs(rounded_q - q)
+        delta_r = np.abs(rounded_r - r)
+        delta_s = np.abs(rounded_s - s)
+        fix_q = (delta_q > delta_r) & (delta_q > delta_s)
+        fix_r = ~fix_q & (delta_r > delta_s)
+        rounded_q[fix_q] = -rounded_r[fix_q] - rounded_s[fix_q]
+        rounded_r[fix_r] = -rounded_q[fix_r] - rounded_s[fix_r]
+        columns, rows = rounded_q, rounded_r
+
+    columns = pd.Series(columns, index=deployments.index).astype("Int64")
+    rows = pd.Series(rows, index=deployments.index).astype("Int64")
+    cells = columns.astype(str) + "_" + rows.astype(str)
+    cells[columns.isna() | rows.isna()] = np.nan
+
+    return cells.rename("cell")
@@ -1,15 +1,32 @@
 """
 Functions to create new tables or modify existing ones from WI data.
 """
+import concurrent.futures
+import json
+import os
+import pathlib
 from typing import Union
 
 import numpy as np
 import pandas as pd
+import scipy.sparse
 
 from . import _labels, _utils
 from .extraction import get_lowest_taxon
 from .filtering import remove_duplicates, remove_unidentified
 
+_deployment_levels = {
+    "location": _labels.deployments.location,
+    "camera": _labels.deployments.camera_id,
+}
+_period_levels = {"year": "Y", "month": "M", "week": "W", "day": "D"}
+_popcount = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_reserved_columns = [
+    _labels.deployments.deployment_id,
+    _labels.deployments.project_id,
+    *_deployment_levels.values(),
+]
+
 
 def _compute_q_diversity_index(p: Union[list, tuple, np.ndarray], q: int) -> float:
     if q == 1:
@@ -18,31 +35,1115 @@ def _compute_q_diversity_index(p: Union[list, tuple, np.ndarray], q: int) -> flo
         return np.sum(p**q) ** (1 / (1 - q))
 
 
-def _process_groupby_arg(
+def _compute_log_binomial(
+    log_factorials: np.ndarray, n: np.ndarray, k: np.ndarray
+) -> np.ndarray:
+    n, k = np.broadcast_arrays(n, k)
+    valid = (k >= 0) & (k <= n)
+    result = np.full(n.shape, -np.inf)
+    result[valid] = (
+        log_factorials[n[valid]]
+        - log_factorials[k[valid]]
+        - log_factorials[n[valid] - k[valid]]
+    )
+
+    return result
+
+
+def _compute_chao_entropy(x: np.ndarray) -> float:
+    # Shannon entropy estimator from Chao et al. (2013). The tail of the
+    # second term is rewritten as a convergent series to avoid overflow
+    # of (1 - A) ** (1 - n) for large samples.
+    n = x.sum()
+    f1 = np.sum(x == 1)
+    f2 = np.sum(x == 2)
+    harmonic = np.concatenate([[0.0], np.cumsum(1 / np.arange(1, n))])
+    observed = x[x <= n - 1]
+    entropy = np.sum(observed / n * (harmonic[n - 1] - harmonic[observed - 1]))
+
+    if f2 > 0:
+        a = 2 * f2 / ((n - 1) * f1 + 2 * f2)
+    elif f1 > 0:
+        a = 2 / ((n - 1) * (f1 - 1) + 2)
+    else:
+        a = 1
+    if f1 > 0 and a < 1:
+        terms = int(min(np.ceil(np.log(1e-12) / np.log(1 - a)), 1e6))
+        j = np.arange(1, terms + 1)
+        entropy += f1 / n * np.sum((1 - a) ** j / (j + n - 1))
+
+    return entropy
+
+
+def _compute_scaled_bessel(
+    order: int, x: Union[float, np.ndarray], size: int = 2048
+) -> np.ndarray:
+    # Modified Bessel function of the first kind scaled by exp(-x),
+    # computed from its integral representation to avoid overflow.
+    t = (np.arange(size) + 0.5) * np.pi / size
+    x = np.asarray(x, dtype=float)[..., np.newaxis]
+    values = np.exp(x * (np.cos(t) - 1)) * np.cos(order * t)
+
+    return values.mean(axis=-1)
+
+
+def _compute_activity_bandwidth(
+    histograms: np.ndarray, theta: np.ndarray
+) -> np.ndarray:
+    # Rule-of-thumb concentration for von Mises kernels from Taylor
+    # (2008), using a moment estimate of the concentration of the best
+    # fitting von Mises distribution (Best and Fisher, 1981).
+    n = histograms.sum(axis=-1)
+    c = histograms @ np.cos(theta) / n
+    s = histograms @ np.sin(theta) / n
+    r = np.clip(np.sqrt(c**2 + s**2), 1e-8, 1 - 1e-8)
+    kappa = np.where(
+        r < 0.53,
+        2 * r + r**3 + 5 * r**5 / 6,
+        np.where(
+            r < 0.85,
+            -0.4 + 1.39 * r + 0.43 / (1 - r),
+            1 / (r**3 - 4 * r**2 + 3 * r),
+        ),
+    )
+    ratio = _compute_scaled_bessel(2, 2 * kappa) / _compute_scaled_bessel(0, kappa) ** 2
+
+    return (3 * n * kappa**2 * ratio / (4 * np.pi**0.5)) ** (2 / 5)
+
+
+def _compute_activity_densities(
+    histograms: np.ndarray, theta: np.ndarray, adjust: float
+) -> np.ndarray:
+    # Binned von Mises kernel density estimates on a regular circular
+    # grid, computed as a circular convolution of the histograms with
+    # their kernels through the FFT.
+    bandwidth = _compute_activity_bandwidth(histograms, theta) / adjust
+    kernels = np.exp(bandwidth[..., np.newaxis] * (np.cos(theta) - 1))
+    kernels /= kernels.sum(axis=-1, keepdims=True)
+    densities = np.fft.irfft(
+        np.fft.rfft(histograms, axis=-1) * np.fft.rfft(kernels, axis=-1),
+        n=len(theta),
+        axis=-1,
+    )
+    densities = np.clip(densities, 0, None)
+    densities /= densities.sum(axis=-1, keepdims=True) * (2 * np.pi / len(theta))
+
+    return densities
+
+
+def _compute_activity_overlap_matrix(
+    histograms: np.ndarray, densities: np.ndarray, estimator: str
+) -> np.ndarray:
+    size = len(histograms)
+    result = np.empty((size, size))
+    if estimator == "dhat1":
+        step = 2 * np.pi / densities.shape[-1]
+        for i in range(size):
+            result[i] = np.minimum(densities[i], densities).sum(axis=-1) * step
+    else:
+        # Average over the observations of each taxon of the ratio
+        # between densities, using the histograms as observation weights.
+        n = histograms.sum(axis=-1)
+        for i in range(size):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.minimum(1, densities / densities[i])
+            ratio = np.nan_to_num(ratio, nan=1.0)
+            result[i] = ratio @ histograms[i] / n[i]
+        result = (result + result.T) / 2
+
+    return result
+
+
+def _compute_diversity_curve(
+    x: np.ndarray, q_values: Union[list, tuple], sizes: np.ndarray
+) -> np.ndarray:
+    # Analytic rarefaction (m < n) and extrapolation (m > n) estimators
+    # of Hill numbers from Chao et al. (2014) for a single assemblage.
+    x = x[x > 0].astype(int)
+    n = x.sum()
+    f1 = np.sum(x == 1)
+    f2 = np.sum(x == 2)
+    log_factorials = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n + 1)))])
+    interpolated = sizes[sizes <= n]
+    extrapolated = sizes[sizes > n]
+    result = np.empty((len(q_values), len(sizes)))
+
+    if f2 > 0:
+        f0 = (n - 1) / n * f1**2 / (2 * f2)
+    else:
+        f0 = (n - 1) / n * f1 * (f1 - 1) / 2
+    simpson = np.sum(x * (x - 1)) / (n * (n - 1)) if n > 1 else 1
+
+    for i, q in enumerate(q_values):
+        if q == 0:
+            log_total = _compute_log_binomial(log_factorials, n, interpolated)
+            log_missing = _compute_log_binomial(
+                log_factorials, n - x[:, np.newaxis], interpolated[np.newaxis, :]
+            )
+            rarefied = np.sum(1 - np.exp(log_missing - log_total), axis=0)
+            if f1 > 0 and f0 > 0:
+                ratio = 1 - f1 / (n * f0 + f1)
+                extended = len(x) + f0 * (1 - ratio ** (extrapolated - n))
+            else:
+                extended = np.full(len(extrapolated), float(len(x)))
+        elif q == 1:
+            # Expected abundance frequency counts for every (size, k) pair.
+            # Taxa sharing the same abundance are evaluated only once.
+            m = interpolated[:, np.newaxis]
+            k = np.arange(1, interpolated.max(initial=0) + 1)[np.newaxis, :]
+            log_total = _compute_log_binomial(log_factorials, n, m)
+            fk = np.zeros((len(interpolated), k.shape[1]))
+            for value, count in zip(*np.unique(x, return_counts=True)):
+                log_prob = (
+                    _compute_log_binomial(log_factorials, value, k)
+                    + _compute_log_binomial(log_factorials, n - value, m - k)
+                    - log_total
+                )
+                fk += count * np.exp(log_prob)
+            rarefied = np.exp(-np.sum(k / m * np.log(k / m) * fk, axis=1))
+            p = x / n
+            observed_entropy = -np.sum(p * np.log(p))
+            estimated_entropy = _compute_chao_entropy(x)
+            extended = np.exp(
+                n / extrapolated * observed_entropy
+                + (extrapolated - n) / extrapolated * estimated_entropy
+            )
+        elif q == 2:
+            rarefied = 1 / (
+                1 / interpolated + (interpolated - 1) / interpolated * simpson
+            )
+            extended = 1 / (
+                1 / extrapolated + (extrapolated - 1) / extrapolated * simpson
+            )
+        else:
+            raise ValueError("q_values must be a subset of [0, 1, 2].")
+        result[i] = np.concatenate([rarefied, extended])
+
+    return result
+
+
+def _count_followups(
+    keys: np.ndarray,
+    taxon_codes: np.ndarray,
+    batch_codes: np.ndarray,
+    n_taxa: int,
+    n_batches: int,
+    window: int,
+    max_pairs: int = 10_000_000,
+) -> np.ndarray:
+    # Keys encode the batch, deployment and time of each record, so after
+    # sorting them the records at or after each record within the window
+    # are a contiguous range found with two searchsorted calls (records
+    # with the same key are simultaneous and count as following each
+    # other). Every record of the leading taxon is counted once per
+    # following taxon. Pairs are expanded for blocks of records with at
+    # most max_pairs pairs at a time.
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    taxon_codes = taxon_codes[order]
+    batch_codes = batch_codes[order]
+    lo = np.searchsorted(keys, keys, side="left")
+    hi = np.searchsorted(keys, keys + window, side="right")
+    counts = hi - lo
+    ends = np.cumsum(counts)
+    result = np.zeros(n_batches * n_taxa * n_taxa, dtype=np.int64)
+    block_start = 0
+    while block_start < len(keys):
+        block_end = np.searchsorted(
+            ends, ends[block_start] - counts[block_start] + max_pairs, side="right"
+        )
+        block_end = max(block_end, block_start + 1)
+        block_counts = counts[block_start:block_end]
+        first = np.repeat(np.arange(block_start, block_end), block_counts)
+        offsets = np.arange(block_counts.sum()) - np.repeat(
+            np.cumsum(block_counts) - block_counts, block_counts
+        )
+        second = np.repeat(lo[block_start:block_end], block_counts) + offsets
+        # Different taxa also excludes each record from following itself.
+        mask = taxon_codes[first] != taxon_codes[second]
+        pairs = np.unique(first[mask] * n_taxa + taxon_codes[second[mask]])
+        first, following = np.divmod(pairs, n_taxa)
+        index = (batch_codes[first] * n_taxa + taxon_codes[first]) * n_taxa + following
+        result += np.bincount(index, minlength=len(result))
+        block_start = block_end
+
+    return result.reshape(n_batches, n_taxa, n_taxa)
+
+
+def _count_by_code(
+    codes: np.ndarray,
+    size: int,
+    weights: np.ndarray = None,
+    valid: np.ndarray = None,
+) -> np.ndarray:
+    mask = codes >= 0
+    if valid is not None:
+        mask &= valid
+    if weights is not None:
+        weights = weights[mask]
+
+    return np.bincount(codes[mask], weights=weights, minlength=size)
+
+
+def _count_distinct_by_code(
+    codes: np.ndarray, values: np.ndarray, size: int
+) -> np.ndarray:
+    mask = (codes >= 0) & (values >= 0)
+    base = values.max(initial=0) + 1
+    pairs = np.unique(codes[mask].astype(np.int64) * base + values[mask])
+
+    return np.bincount(pairs // base, minlength=size)
+
+
+def _compute_incidence(
     images: pd.DataFrame, deployments: pd.DataFrame, groupby: str
 ) -> tuple:
+    # Sparse site by taxon presence/absence matrix built from the unique
+    # (site, taxon) code pairs of the identified images.
+    images = remove_unidentified(images, rank="class", reset_index=True)
+    site_codes, sites, groupby_label = _get_group_codes(images, deployments, groupby)
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+    valid = (site_codes >= 0) & (taxon_codes >= 0)
+    pairs = np.unique(
+        site_codes[valid].astype(np.int64) * len(taxa) + taxon_codes[valid]
+    )
+    rows, columns = np.divmod(pairs, len(taxa))
+    incidence = scipy.sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (rows, columns)),
+        shape=(len(sites), len(taxa)),
+    )
+
+    return incidence, sites, taxa, groupby_label
+
+
+def _get_group_codes(
+    images: pd.DataFrame, deployments: pd.DataFrame, groupby: str
+) -> tuple:
+    # Resolves the group of each image as an integer code (-1 for images
+    # without a group) along with the sorted unique groups and their
+    # label. Deployment-level groups are computed once per deployment and
+    # then mapped to the images by position, avoiding a merge.
     if groupby == "deployment":
         groupby_label = _labels.images.deployment_id
-    elif groupby == "location":
-        groupby_label = _labels.deployments.location
-        if deployments is not None:
-            images = pd.merge(
-                images,
-                deployments[
-                    [_labels.deployments.deployment_id, _labels.deployments.location]
-                ],
-                left_on=_labels.images.deployment_id,
-                right_on=_labels.deployments.deployment_id,
-                how="left",
-            )
+        codes, groups = pd.factorize(images[groupby_label], sort=True)
+    elif groupby == "project":
+        groupby_label = _labels.images.project_id
+        codes, groups = pd.factorize(images[groupby_label], sort=True)
+    elif groupby in _period_levels:
+        groupby_label = groupby
+        dates = pd.to_datetime(images[_labels.images.date])
+        codes, groups = pd.factorize(
+            dates.dt.to_period(_period_levels[groupby]), sort=True
+        )
+    else:
+        if groupby in _deployment_levels:
+            groupby_label = _deployment_levels[groupby]
+        elif (
+            deployments is not None
+            and groupby in deployments.columns
+            and groupby not in _reserved_columns
+        ):
+            groupby_label = groupby
         else:
-            raise ValueError("deployments must be passed if groupby is 'location'")
+            raise ValueError(
+                "groupby must be one of ['deployment', 'location', 'project', "
+                "'camera', 'year', 'month', 'week', 'day'] or the name of "
+                "another column in deployments"
+            )
+        if deployments is None:
+            raise ValueError(f"deployments must be passed if groupby is '{groupby}'")
+        deployments = deployments.drop_duplicates(_labels.deployments.deployment_id)
+        deployment_codes, groups = pd.factorize(deployments[groupby_label], sort=True)
+        positions = pd.Index(
+            deployments[_labels.deployments.deployment_id]
+        ).get_indexer(images[_labels.images.deployment_id])
+        codes = np.where(positions >= 0, deployment_codes[positions], -1)
+
+    return codes, groups, groupby_label
+
+
+def _compute_group_effort(
+    deployments: pd.DataFrame,
+    groupby: str,
+    freq: str = None,
+    malfunctions: pd.DataFrame = None,
+) -> tuple:
+    # Sums the day-level effort bitmap into (group, period) totals. Days
+    # are sorted, so the days of each period are contiguous and can be
+    # reduced with a single reduceat call.
+    if groupby in _period_levels:
+        raise ValueError(
+            "groupby must be a deployment level. Use freq to aggregate by time"
+            " periods."
+        )
+    matrix, ids, days = _utils.effort.compute_effort_matrix(deployments, malfunctions)
+
+    table = deployments.drop_duplicates(_labels.deployments.deployment_id)
+    codes, groups, groupby_label = _get_group_codes(table, deployments, groupby)
+    positions = pd.Index(table[_labels.deployments.deployment_id]).get_indexer(ids)
+    deployment_codes = codes[positions]
+
+    if freq is None:
+        periods = None
+        day_codes = np.zeros(len(days), dtype=int)
+    else:
+        periods = pd.period_range(days[0], days[-1], freq=freq)
+        day_codes = periods.get_indexer(days.to_period(freq))
+    boundaries = np.flatnonzero(np.diff(day_codes, prepend=-1))
+    deployment_effort = np.add.reduceat(matrix, boundaries, axis=1, dtype=np.int64)
+
+    valid = deployment_codes >= 0
+    effort = np.zeros((len(groups), deployment_effort.shape[1]), dtype=np.int64)
+    np.add.at(effort, deployment_codes[valid], deployment_effort[valid])
+
+    return {
+        "matrix": matrix,
+        "ids": ids,
+        "days": days,
+        "day_codes": day_codes,
+        "deployment_codes": deployment_codes,
+        "effort": effort,
+        "groups": groups,
+        "groupby_label": groupby_label,
+        "periods": periods,
+    }
+
+
+def _get_occasion_edges(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    days: int = 1,
+    occasions: Union[str, list, tuple, np.ndarray, pd.DatetimeIndex] = None,
+) -> pd.DatetimeIndex:
+    # Returns the boundaries of the occasions, so occasion i spans from
+    # edges[i] (inclusive) to edges[i + 1] (exclusive).
+    if occasions is None:
+        edges = pd.date_range(
+            pd.Timestamp(start).floor("D"), end, freq=pd.Timedelta(days=days)
+        )
+        edges = edges.append(pd.DatetimeIndex([edges[-1] + pd.Timedelta(days=days)]))
+    elif isinstance(occasions, str):
+        periods = pd.period_range(start, end, freq=occasions)
+        edges = periods.start_time.append(
+            pd.DatetimeIndex([(periods[-1] + 1).start_time])
+        )
     else:
-        raise ValueError("groupby must be one of ['deployment', 'location']")
+        edges = pd.DatetimeIndex(pd.to_datetime(occasions))
+        if len(edges) < 2 or not edges.is_monotonic_increasing or not edges.is_unique:
+            raise ValueError(
+                "occasions must have at least two unique boundaries sorted in "
+                "ascending order."
+            )
+
+    return edges
+
+
+def _compute_detection_cube(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    date_range: str = "deployments",
+    days: int = 1,
+    occasions: Union[str, list, tuple, np.ndarray, pd.DatetimeIndex] = None,
+    all_deployments: bool = False,
+) -> dict:
+    # Assigns each image with objects to a (taxon, deployment, occasion)
+    # cell using integer codes and sums the objects of each cell, so the
+    # detection history is kept as sparse coded triples. The fraction of days each
+    # deployment was active in each occasion comes from the effort bitmap.
+    # Deployments come from images unless all_deployments is True, in
+    # which case deployments without any detection are also included.
+    images = remove_unidentified(images, rank="class", reset_index=True)
+
+    if date_range == "deployments":
+        start = pd.to_datetime(deployments[_labels.deployments.start]).min()
+        end = pd.to_datetime(deployments[_labels.deployments.end]).max()
+    elif date_range == "images":
+        dates = pd.to_datetime(images[_labels.images.date]).dt.floor("D")
+        start = dates.min()
+        end = dates.max()
+    else:
+        raise ValueError("date_range must be one of ['deployments', 'images'].")
+    edges = _get_occasion_edges(start, end, days, occasions)
+
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+    if all_deployments:
+        sites = pd.Index(
+            deployments[_labels.deployments.deployment_id].unique()
+        ).sort_values()
+        site_codes = sites.get_indexer(images[_labels.images.deployment_id])
+    else:
+        site_codes, sites = pd.factorize(
+            images[_labels.images.deployment_id], sort=True
+        )
+    dates = pd.to_datetime(images[_labels.images.date]).dt.floor("D")
+    occasion_codes = (
+        np.searchsorted(edges.asi8, dates.to_numpy().view(np.int64), side="right") - 1
+    )
+    shape = (len(taxa), len(sites), len(edges) - 1)
+
+    objects = images[_labels.images.objects].to_numpy()
+    valid = (
+        (taxon_codes >= 0)
+        & (site_codes >= 0)
+        & (occasion_codes >= 0)
+        & (occasion_codes < shape[2])
+        & (objects > 0)
+    )
+    flat = np.ravel_multi_index(
+        (taxon_codes[valid], site_codes[valid], occasion_codes[valid]), shape
+    )
+    cells, inverse = np.unique(flat, return_inverse=True)
+    values = np.bincount(inverse, weights=objects[valid])
+
+    edges_days = edges.floor("D")
+    matrix, ids, days = _utils.effort.compute_effort_matrix(
+        deployments, start=edges_days[0], end=edges_days[-1]
+    )
+    positions = (edges_days - days[0]) // pd.Timedelta(days=1)
+    cumulative = np.zeros((len(ids), len(days) + 1), dtype=np.int64)
+    np.cumsum(matrix, axis=1, out=cumulative[:, 1:])
+    active = cumulative[:, positions[1:]] - cumulative[:, positions[:-1]]
+    lengths = np.diff(positions)
+    rows = ids.get_indexer(sites)
+    effort = np.zeros(shape[1:])
+    effort[rows >= 0] = np.divide(
+        active[rows[rows >= 0]],
+        lengths,
+        out=np.zeros(active[rows[rows >= 0]].shape),
+        where=lengths > 0,
+    )
+
+    return {
+        "taxa": taxa,
+        "sites": sites,
+        "edges": edges,
+        "shape": shape,
+        "index": np.unravel_index(cells, shape),
+        "values": values,
+        "effort": effort,
+    }
+
+
+def _get_detection_array(cube: dict, compute_abundance: bool = True) -> np.ndarray:
+    # Occasions where the corresponding camera was not deployed at the
+    # time are assigned NaNs.
+    values = np.zeros(cube["shape"])
+    values[cube["index"]] = cube["values"]
+    if not compute_abundance:
+        values = (values > 0).astype(float)
+    values[:, cube["effort"] == 0] = np.nan
+
+    return values
+
+
+def _get_site_covariates(
+    deployments: pd.DataFrame,
+    cameras: pd.DataFrame,
+    sites: pd.Index,
+    columns: list = None,
+) -> pd.DataFrame:
+    table = deployments.drop_duplicates(_labels.deployments.deployment_id)
+    if cameras is not None:
+        cameras = cameras.drop_duplicates(_labels.deployments.camera_id)
+        extra = [column for column in cameras.columns if column not in table.columns]
+        table = pd.merge(
+            table,
+            cameras[[_labels.deployments.camera_id, *extra]],
+            on=_labels.deployments.camera_id,
+            how="left",
+        )
+    table = table.set_index(_labels.deployments.deployment_id).reindex(sites)
+    if columns is not None:
+        table = table[columns]
+
+    return table.rename_axis(_labels.deployments.deployment_id).reset_index()
+
+
+def _compute_period_records(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    groupby: str,
+    freq: str,
+    compute_abundance: bool,
+    use_effort: bool,
+    malfunctions: pd.DataFrame = None,
+    remove_duplicates_kws: dict = None,
+) -> dict:
+    # Counts independent records by (taxon, group, period) cell. Only
+    # cells with records are kept, as sparse codes, so long multi-year
+    # ranges never materialize the full cartesian product.
+    if groupby in _period_levels:
+        raise ValueError(
+            "groupby must be a deployment level. Use freq to aggregate by time"
+            " periods."
+        )
+    if remove_duplicates_kws is None:
+        remove_duplicates_kws = {}
+    remove_duplicates_kws = {**remove_duplicates_kws, "reset_index": True}
+
+    images = remove_unidentified(images, rank="class", reset_index=True)
+    images = remove_duplicates(images, **remove_duplicates_kws)
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+    dates = pd.to_datetime(images[_labels.images.date])
+    objects = images[_labels.images.objects].to_numpy()
+
+    if use_effort:
+        # Images are located in the effort bitmap by deployment position
+        # and day offset, so records from inactive days can be discarded
+        # and each record gets its group and period codes by indexing.
+        effort = _compute_group_effort(deployments, groupby, freq, malfunctions)
+        groupby_label = effort["groupby_label"]
+        groups = effort["groups"]
+        periods = effort["periods"]
+        days = effort["days"]
+        positions = effort["ids"].get_indexer(images[_labels.images.deployment_id])
+        offsets = ((dates.dt.floor("D") - days[0]) // pd.Timedelta(days=1)).to_numpy()
+        valid = (positions >= 0) & (offsets >= 0) & (offsets < len(days))
+        valid[valid] = effort["matrix"][positions[valid], offsets[valid]]
+        group_codes = np.full(len(images), -1)
+        group_codes[valid] = effort["deployment_codes"][positions[valid]]
+        period_codes = np.zeros(len(images), dtype=np.int64)
+        period_codes[valid] = effort["day_codes"][offsets[valid]]
+        effort = effort["effort"]
+    else:
+        # Periods are binned on their int64 ordinals, so codes are just
+        # the offsets from the first period with records.
+        group_codes, groups, groupby_label = _get_group_codes(
+            images, deployments, groupby
+        )
+        ordinals = pd.PeriodIndex(dates, freq=freq).asi8
+        valid = dates.notna().to_numpy()
+        if valid.any():
+            first = ordinals[valid].min()
+            n_periods = ordinals[valid].max() - first + 1
+        else:
+            first, n_periods = 0, 0
+        periods = pd.period_range(
+            pd.Period(ordinal=first, freq=freq), periods=n_periods, freq=freq
+        )
+        period_codes = ordinals - first
+        effort = None
+
+    valid &= (group_codes >= 0) & (taxon_codes >= 0)
+    weights = objects[valid] if compute_abundance else None
+    n_groups = len(groups)
+    n_periods = 1 if periods is None else len(periods)
+    keys = (
+        taxon_codes[valid].astype(np.int64) * n_groups + group_codes[valid]
+    ) * n_periods + period_codes[valid]
+    keys, inverse = np.unique(keys, return_inverse=True)
+    records = np.bincount(inverse, weights=weights, minlength=len(keys))
+    taxon_codes, rest = np.divmod(keys, n_groups * n_periods)
+    group_codes, period_codes = np.divmod(rest, n_periods)
+
+    return {
+        "taxa": taxa,
+        "groups": groups,
+        "periods": periods,
+        "groupby_label": groupby_label,
+        "taxon_codes": taxon_codes,
+        "group_codes": group_codes,
+        "period_codes": period_codes,
+        "records": records,
+        "effort": effort,
+    }
+
+
+def _process_groupby_arg(
+    images: pd.DataFrame, deployments: pd.DataFrame, groupby: str
+) -> tuple:
+    codes, groups, groupby_label = _get_group_codes(images, deployments, groupby)
+    if groupby not in ("deployment", "project"):
+        groupby_values = pd.Categorical.from_codes(codes, categories=groups)
+        images[groupby_label] = pd.Series(groupby_values, index=images.index).astype(
+            groups.dtype
+        )
 
     return images, groupby_label
 
 
+def compute_accumulation_curve(
+    detection: pd.DataFrame,
+    method: str = "random",
+    permutations: int = 100,
+    batch_size: int = 100,
+    ci: float = 0.95,
+    effort: pd.Series = None,
+    seed: int = None,
+) -> pd.DataFrame:
+    """
+    Computes the species (or taxa) accumulation curve, that is, the
+    expected number of taxa as sites are added.
+
+    Parameters
+    ----------
+    detection : DataFrame
+        Wide-format DataFrame with the presence/absence of each taxon by
+        site, as returned by wiutils.compute_detection with
+        compute_abundance=False and pivot=True. Abundances are also
+        accepted and converted to presence/absence.
+    method : str
+        Method used to compute the curve. Possible values are:
+
+            - 'random' to average the curves of random orderings of the
+            sites.
+            - 'exact' to compute the expected curve analytically (Kindt
+            et al., 2006).
+    permutations : int
+        Number of random orderings of the sites. Only has effect if
+        method is 'random'.
+    batch_size : int
+        Number of random orderings evaluated at once. Larger values are
+        faster but use more memory. Only has effect if method is
+        'random'.
+    ci : float
+        Confidence level of the percentile intervals of the curve. Only
+        has effect if method is 'random'.
+    effort : Series
+        Sampling effort (e.g. camera-days) of each site, indexed by the
+        site names. If passed, the expected cumulative effort is added
+        to the result.
+    seed : int
+        Seed for the random number generator. Only has effect if method
+        is 'random'.
+
+    Returns
+    -------
+    DataFrame
+        Accumulation curve with the number of sites and the expected
+        number of taxa. If method is 'random', the standard deviation
+        and the bounds of the percentile interval are also included.
+
+    """
+    sites = detection.columns[detection.columns != "taxon"]
+    incidence = (detection[sites].fillna(0).to_numpy() > 0).T
+    n_sites = incidence.shape[0]
+    result = pd.DataFrame({"sites": np.arange(1, n_sites + 1)})
+
+    if method == "random":
+        # Sites are bit-packed along taxa so each step of the curve is a
+        # cumulative bitwise OR over the permuted rows and the number of
+        # taxa is the number of set bits.
+        packed = np.packbits(incidence, axis=1)
+        rng = np.random.default_rng(seed)
+        curves = np.empty((permutations, n_sites), dtype=np.int64)
+        for start in range(0, permutations, batch_size):
+            size = min(batch_size, permutations - start)
+            orders = np.argsort(rng.random((size, n_sites)), axis=1)
+            accumulated = np.bitwise_or.accumulate(packed[orders], axis=1)
+            curves[start : start + size] = _popcount[accumulated].sum(axis=-1)
+        result["taxa"] = curves.mean(axis=0)
+        result["sd"] = curves.std(axis=0, ddof=1) if permutations > 1 else np.nan
+        result["lower"] = np.quantile(curves, (1 - ci) / 2, axis=0)
+        result["upper"] = np.quantile(curves, (1 + ci) / 2, axis=0)
+    elif method == "exact":
+        frequencies = incidence.sum(axis=0)
+        log_factorials = np.concatenate(
+            [[0.0], np.cumsum(np.log(np.arange(1, n_sites + 1)))]
+        )
+        k = result["sites"].to_numpy()
+        log_total = _compute_log_binomial(log_factorials, n_sites, k)
+        log_missing = _compute_log_binomial(
+            log_factorials, n_sites - frequencies[:, np.newaxis], k[np.newaxis, :]
+        )
+        result["taxa"] = np.sum(1 - np.exp(log_missing - log_total), axis=0)
+    else:
+        raise ValueError("method must be one of ['random', 'exact']")
+
+    if effort is not None:
+        result["effort"] = result["sites"] * effort.reindex(sites).mean()
+
+    return result
+
+
+def compute_activity_overlap(
+    images: pd.DataFrame,
+    estimator: str = "dhat4",
+    bootstrap: int = 0,
+    ci: float = 0.95,
+    grid_size: int = 512,
+    min_records: int = 2,
+    seed: int = None,
+    pivot: bool = False,
+    remove_duplicates_kws: dict = None,
+) -> pd.DataFrame:
+    """
+    Computes the coefficient of overlapping between the daily activity
+    patterns of every pair of taxa. Activity patterns are estimated with
+    von Mises kernel densities of the time of day of the independent
+    records (i.e. records after duplicate removal) of each taxon, as
+    described in Ridout and Linkie (2009).
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    estimator : str
+        Overlap estimator. Possible values are:
+
+            - 'dhat1' for the Dhat1 estimator (recommended for small
+            samples).
+            - 'dhat4' for the Dhat4 estimator (recommended for samples
+            with at least 75 records).
+    bootstrap : int
+        Number of bootstrap samples used to compute percentile confidence
+        intervals. If 0, confidence intervals are not computed.
+    ci : float
+        Confidence level of the confidence intervals. Only has effect if
+        bootstrap is greater than 0.
+    grid_size : int
+        Number of equally spaced points in the daily cycle where the
+        densities are evaluated.
+    min_records : int
+        Minimum number of records for a taxon to be included.
+    seed : int
+        Seed for the random number generator used for the bootstrap.
+    pivot : bool
+        Whether to pivot (reshape from long to wide format) the resulting
+        DataFrame into a square overlap matrix. Confidence intervals are
+        not included in the wide format.
+    remove_duplicates_kws : dict
+        Keyword arguments for the wiutils.remove_duplicates function.
+
+    Returns
+    -------
+    DataFrame
+        Overlap coefficient for every pair of taxa.
+
+    """
+    if estimator not in ("dhat1", "dhat4"):
+        raise ValueError("estimator must be one of ['dhat1', 'dhat4']")
+    if remove_duplicates_kws is None:
+        remove_duplicates_kws = {}
+    remove_duplicates_kws = {**remove_duplicates_kws, "reset_index": True}
+
+    images = remove_unidentified(images, rank="class", reset_index=True)
+    images = remove_duplicates(images, **remove_duplicates_kws)
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+
+    dates = pd.to_datetime(images[_labels.images.date])
+    valid = (taxon_codes >= 0) & dates.notna().to_numpy()
+    dates = dates[valid]
+    seconds = (dates - dates.dt.floor("D")).dt.total_seconds().to_numpy()
+    bins = np.round(seconds / 86400 * grid_size).astype(int) % grid_size
+    histograms = np.bincount(
+        taxon_codes[valid] * grid_size + bins,
+        minlength=len(taxa) * grid_size,
+    ).reshape(len(taxa), grid_size)
+    keep = histograms.sum(axis=1) >= max(min_records, 2)
+    histograms = histograms[keep]
+    taxa = taxa[keep]
+
+    theta = np.arange(grid_size) * 2 * np.pi / grid_size
+    adjust = 0.8 if estimator == "dhat1" else 1
+    densities = _compute_activity_densities(histograms, theta, adjust)
+    overlap = _compute_activity_overlap_matrix(histograms, densities, estimator)
+
+    if pivot:
+        result = pd.DataFrame(overlap, index=taxa, columns=taxa)
+        result = result.rename_axis("taxon").reset_index()
+        return result
+
+    i, j = np.triu_indices(len(taxa), k=1)
+    result = pd.DataFrame(
+        {"taxon_x": taxa.take(i), "taxon_y": taxa.take(j), "overlap": overlap[i, j]}
+    )
+
+    if bootstrap > 0:
+        rng = np.random.default_rng(seed)
+        n = histograms.sum(axis=1)
+        samples = np.empty((bootstrap, len(i)))
+        for k in range(bootstrap):
+            resampled = rng.multinomial(n, histograms / n[:, np.newaxis])
+            densities = _compute_activity_densities(resampled, theta, adjust)
+            samples[k] = _compute_activity_overlap_matrix(
+                resampled, densities, estimator
+            )[i, j]
+        result["lower"] = np.quantile(samples, (1 - ci) / 2, axis=0)
+        result["upper"] = np.quantile(samples, (1 + ci) / 2, axis=0)
+
+    return result
+
+
+def compute_beta_diversity(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame = None,
+    groupby: str = "deployment",
+    index: str = "jaccard",
+    pivot: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes the pairwise beta diversity (dissimilarity in terms of
+    taxa composition) between every pair of sites.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments. Must be passed only if
+        groupby is 'location', 'camera' or a deployments column.
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
+    index : str
+        Dissimilarity index. Possible values are:
+
+            - 'jaccard' for the Jaccard dissimilarity.
+            - 'sorensen' for the Sørensen dissimilarity.
+    pivot : bool
+        Whether to pivot (reshape from long to wide format) the resulting
+        DataFrame into a square dissimilarity matrix.
+
+    Returns
+    -------
+    DataFrame
+        Dissimilarity between every pair of sites.
+
+    """
+    if index not in ("jaccard", "sorensen"):
+        raise ValueError("index must be one of ['jaccard', 'sorensen']")
+
+    incidence, sites, _, groupby_label = _compute_incidence(
+        images, deployments, groupby
+    )
+
+    # The number of shared taxa between every pair of sites is the
+    # product of the incidence matrix with its transpose.
+    shared = (incidence @ incidence.T).toarray()
+    richness = np.diag(shared)
+    total = richness[:, np.newaxis] + richness[np.newaxis, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if index == "jaccard":
+            dissimilarity = 1 - shared / (total - shared)
+        else:
+            dissimilarity = 1 - 2 * shared / total
+
+    if pivot:
+        result = pd.DataFrame(dissimilarity, index=sites, columns=sites)
+        result = result.rename_axis(groupby_label).reset_index()
+        return result
+
+    i, j = np.triu_indices(len(sites), k=1)
+    result = pd.DataFrame(
+        {
+            f"{groupby_label}_x": sites.take(i),
+            f"{groupby_label}_y": sites.take(j),
+            "dissimilarity": dissimilarity[i, j],
+        }
+    )
+
+    return result
+
+
+def compute_codetections(
+    images: pd.DataFrame,
+    window: int = 60,
+    unit: str = "minutes",
+    permutations: int = 0,
+    seed: int = None,
+    pivot: bool = False,
+    remove_duplicates_kws: dict = None,
+) -> pd.DataFrame:
+    """
+    Computes the number of times each taxon was followed by every other
+    taxon at the same deployment within a given time window (e.g. to
+    study predator-prey interactions). Optionally, the observed counts
+    are compared against a null distribution built by randomly shifting
+    the records of each taxon in time within each deployment.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    window : int
+        Maximum time after a record of the leading taxon (taxon_x) for a
+        record of the following taxon (taxon_y) to be counted.
+    unit : str
+        Time unit of the window. Possible values are:
+
+            - 'weeks'
+            - 'days'
+            - 'hours'
+            - 'minutes'
+            - 'seconds'
+    permutations : int
+        Number of random shifts used to build the null distribution. If
+        0, the null distribution is not computed.
+    seed : int
+        Seed for the random number generator used for the random shifts.
+    pivot : bool
+        Whether to pivot (reshape from long to wide format) the resulting
+        DataFrame into a square matrix with leading taxa as rows and
+        following taxa as columns. Null distribution statistics are not
+        included in the wide format.
+    remove_duplicates_kws : dict
+        Keyword arguments for the wiutils.remove_duplicates function.
+
+    Returns
+    -------
+    DataFrame
+        Number of records of each taxon (taxon_x) followed by at least
+        one record of another taxon (taxon_y) within the window. If
+        permutations is greater than 0, the mean count under the null
+        distribution (expected) and the one-sided p-value of the
+        observed count (p_value) are added.
+
+    """
+    if unit not in ("weeks", "days", "hours", "minutes", "seconds"):
+        raise ValueError(
+            "unit must be one of ['weeks', 'days', 'hours', 'minutes', 'seconds']"
+        )
+    if remove_duplicates_kws is None:
+        remove_duplicates_kws = {}
+    remove_duplicates_kws = {**remove_duplicates_kws, "reset_index": True}
+
+    images = remove_unidentified(images, rank="class", reset_index=True)
+    images = remove_duplicates(images, **remove_duplicates_kws)
+    taxon_codes, taxa = pd.factorize(
+        get_lowest_taxon(images, return_rank=False), sort=True
+    )
+    deployment_codes, deployments = pd.factorize(images[_labels.images.deployment_id])
+    dates = pd.to_datetime(images[_labels.images.date])
+    valid = (taxon_codes >= 0) & (deployment_codes >= 0) & dates.notna().to_numpy()
+    taxon_codes = taxon_codes[valid]
+    deployment_codes = deployment_codes[valid]
+    seconds = dates[valid].to_numpy().astype("datetime64[s]").astype(np.int64)
+    n_taxa = len(taxa)
+    window = int(pd.Timedelta(**{unit: window}).total_seconds())
+
+    # Records from different deployments (and batches) are kept apart by
+    # spacing them by more than the window.
+    seconds = seconds - seconds.min() if seconds.size else seconds
+    span = int(seconds.max()) + window + 1 if seconds.size else 1
+    keys = deployment_codes * span + seconds
+    observed = _count_followups(
+        keys, taxon_codes, np.zeros(len(keys), dtype=int), n_taxa, 1, window
+    )[0]
+
+    if pivot:
+        result = pd.DataFrame(observed, index=taxa, columns=taxa)
+        result = result.rename_axis("taxon").reset_index()
+        return result
+
+    i, j = np.nonzero(~np.eye(n_taxa, dtype=bool))
+    result = pd.DataFrame(
+        {"taxon_x": taxa.take(i), "taxon_y": taxa.take(j), "n": observed[i, j]}
+    )
+
+    if permutations > 0:
+        # Each (deployment, taxon) series is shifted circularly by a
+        # random offset within the time span of the deployment's records.
+        rng = np.random.default_rng(seed)
+        series_codes, series = pd.factorize(deployment_codes * n_taxa + taxon_codes)
+        series_deployments = series // n_taxa
+        starts = np.full(len(deployments), np.iinfo(np.int64).max)
+        np.minimum.at(starts, deployment_codes, seconds)
+        ends = np.zeros(len(deployments), dtype=np.int64)
+        np.maximum.at(ends, deployment_codes, seconds)
+        lengths = ends - starts + 1
+        batch_size = max(1, 10_000_000 // max(len(keys), 1))
+        null = np.empty((permutations, n_taxa, n_taxa), dtype=np.int64)
+        for batch_start in range(0, permutations, batch_size):
+            n_batches = min(batch_size, permutations - batch_start)
+            shifts = rng.integers(
+                0, lengths[series_deployments], size=(n_batches, len(series))
+            )
+            shifted = starts[deployment_codes] + (
+                (seconds - starts[deployment_codes] + shifts[:, series_codes])
+                % lengths[deployment_codes]
+            )
+            batch_codes = np.repeat(np.arange(n_batches), len(keys))
+            batch_keys = (
+                batch_codes * len(deployments) + np.tile(deployment_codes, n_batches)
+            ) * span + shifted.ravel()
+            null[batch_start : batch_start + n_batches] = _count_followups(
+                batch_keys,
+                np.tile(taxon_codes, n_batches),
+                batch_codes,
+                n_taxa,
+                n_batches,
+                window,
+            )
+        result["expected"] = null.mean(axis=0)[i, j]
+        result["p_value"] = (1 + (null >= observed).sum(axis=0)[i, j]) / (
+            1 + permutations
+        )
+
+    return result
+
+
+def compute_cooccurrence(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame = None,
+    groupby: str = "deployment",
+    pivot: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes the number of sites where every pair of taxa was detected
+    together.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments. Must be passed only if
+        groupby is 'location', 'camera' or a deployments column.
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
+    pivot : bool
+        Whether to pivot (reshape from long to wide format) the resulting
+        DataFrame into a square co-occurrence matrix. The diagonal of the
+        matrix has the number of sites where each taxon was detected.
+
+    Returns
+    -------
+    DataFrame
+        Number of sites shared by every pair of taxa.
+
+    """
+    incidence, _, taxa, _ = _compute_incidence(images, deployments, groupby)
+    shared = (incidence.T @ incidence).toarray()
+
+    if pivot:
+        result = pd.DataFrame(shared, index=taxa, columns=taxa)
+        result = result.rename_axis("taxon").reset_index()
+        return result
+
+    i, j = np.triu_indices(len(taxa), k=1)
+    result = pd.DataFrame(
+        {"taxon_x": taxa.take(i), "taxon_y": taxa.take(j), "sites": shared[i, j]}
+    )
+
+    return result
+
+
 def compute_count_summary(
     images: pd.DataFrame,
     deployments: pd.DataFrame = None,
@@ -61,12 +1162,18 @@ def compute_count_summary(
         DataFrame with the project's images.
     deployments : DataFrame
         DataFrame with the project's deployments. Must be passed only if
-        groupby is 'location'.
+        groupby is 'location', 'camera' or a deployments column.
     groupby : str
         Level to group results by. Can be one of:
 
             - 'deployment' to group by deployment (deployment_id)
             - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
     add_records_by_class : bool
         Whether to add number of independent records (i.e. number of
         individuals after duplicate image removal).
@@ -83,55 +1190,57 @@ def compute_count_summary(
         Summary of images, records and species count by deployment.
 
     """
-    images = images.copy()
+    images = images.reset_index(drop=True)
 
     if remove_unidentified_kws is None:
         remove_unidentified_kws = {"rank": "class"}
     if remove_duplicates_kws is None:
         remove_duplicates_kws = {}
 
-    remove_unidentified_kws.update({"reset_index": True})
-    remove_duplicates_kws.update({"reset_index": True})
-
-    images, groupby_label = _process_groupby_arg(images, deployments, groupby)
-    result = pd.DataFrame(index=sorted(images[groupby_label].unique()))
-    result = result.join(images.groupby(groupby_label).size().rename("total_images"))
-    images = remove_unidentified(images, **remove_unidentified_kws)
-    result = result.join(
-        images.groupby(groupby_label).size().rename("identified_images")
-    )
-    images = remove_duplicates(images, **remove_duplicates_kws)
-
-    result = result.join(
-        images.groupby(groupby_label)[_labels.images.objects].sum().rename("records")
-    )
+    remove_unidentified_kws = {**remove_unidentified_kws, "reset_index": False}
+    remove_duplicates_kws = {**remove_duplicates_kws, "reset_index": False}
+
+    codes, groups, groupby_label = _get_group_codes(images, deployments, groupby)
+    size = len(groups)
+
+    # Every metric is computed from integer codes: the group of each image
+    # is looked up by position in the filtered tables (which keep the
+    # original index) and classes and taxa are factorized once so per-class
+    # metrics come from a single flattened (group, class) count.
+    identified = remove_unidentified(images, **remove_unidentified_kws)
+    records = remove_duplicates(identified, **remove_duplicates_kws)
+    record_codes = codes[records.index]
+    objects = records[_labels.images.objects].to_numpy()
+    class_codes, classes = pd.factorize(records[_labels.images.class_])
+    taxon_codes, _ = pd.factorize(get_lowest_taxon(records, return_rank=False))
+
+    columns = {
+        "total_images": _count_by_code(codes, size),
+        "identified_images": _count_by_code(codes[identified.index], size),
+        "records": _count_by_code(record_codes, size, weights=objects),
+    }
     if add_records_by_class:
-        classes = images[_labels.images.class_].dropna().unique()
-        for class_ in classes:
-            subset = images[images[_labels.images.class_] == class_]
-            result = result.join(
-                subset.groupby(groupby_label)[_labels.images.objects]
-                .sum()
-                .rename(f"records_{class_.lower()}")
-            )
-
-    images["taxon"] = get_lowest_taxon(images, return_rank=False)
-    result = result.join(
-        images.groupby(groupby_label)["taxon"].nunique().rename("taxa")
-    )
+        counts = _count_by_code(
+            record_codes * len(classes) + class_codes,
+            size * len(classes),
+            weights=objects,
+            valid=class_codes >= 0,
+        ).reshape(size, len(classes))
+        for i, class_ in enumerate(classes):
+            columns[f"records_{class_.lower()}"] = counts[:, i]
+
+    columns["taxa"] = _count_distinct_by_code(record_codes, taxon_codes, size)
     if add_taxa_by_class:
-        classes = images[_labels.images.class_].dropna().unique()
-        for class_ in classes:
-            subset = images[images[_labels.images.class_] == class_]
-            result = result.join(
-                subset.groupby(groupby_label)["taxon"]
-                .nunique()
-                .rename(f"taxa_{class_.lower()}")
-            )
+        counts = _count_distinct_by_code(
+            record_codes * len(classes) + class_codes,
+            np.where(class_codes >= 0, taxon_codes, -1),
+            size * len(classes),
+        ).reshape(size, len(classes))
+        for i, class_ in enumerate(classes):
+            columns[f"taxa_{class_.lower()}"] = counts[:, i]
 
-    result.index.name = groupby_label
-    result = result.reset_index()
-    result.iloc[:, 1:] = result.iloc[:, 1:].fillna(0).astype(int)
+    result = pd.DataFrame(columns, index=pd.Index(groups, name=groupby_label))
+    result = result.astype(int).reset_index()
 
     return result
 
@@ -153,12 +1262,18 @@ def compute_detection(
         DataFrame with the project's images.
     deployments : DataFrame
         DataFrame with the project's deployments. Must be passed only if
-        groupby is 'location'.
+        groupby is 'location', 'camera' or a deployments column.
     groupby : str
         Level to group results by. Can be one of:
 
             - 'deployment' to group by deployment (deployment_id)
             - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
     compute_abundance : bool
         Whether to compute the abundance for each deployment. If False,
         returns presence/absence for the deployments.
@@ -177,153 +1292,314 @@ def compute_detection(
 
     images, groupby_label = _process_groupby_arg(images, deployments, groupby)
     images["taxon"] = get_lowest_taxon(images, return_rank=False)
-    result = images.groupby(["taxon", groupby_label])[_labels.images.objects].sum()
-    taxa = images["taxon"].unique()
-    sites = images[groupby_label].unique()
-    idx = pd.MultiIndex.from_product([taxa, sites], names=["taxon", groupby_label])
-    result = result.reindex(idx, fill_value=0)
-    result.name = "value"
-    result = result.reset_index()
+    result = images.groupby(["taxon", groupby_label])[_labels.images.objects].sum()
+    taxa = images["taxon"].unique()
+    sites = images[groupby_label].unique()
+    idx = pd.MultiIndex.from_product([taxa, sites], names=["taxon", groupby_label])
+    result = result.reindex(idx, fill_value=0)
+    result.name = "value"
+    result = result.reset_index()
+
+    if not compute_abundance:
+        has_observations = result["value"] > 0
+        result.loc[has_observations, "value"] = 1
+
+    result = result.sort_values(["taxon", groupby_label], ignore_index=True)
+
+    if pivot:
+        result = result.pivot(index="taxon", columns=groupby_label, values="value")
+        result = result.rename_axis(None, axis=1).reset_index()
+
+    return result
+
+
+def compute_detection_history(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    date_range: str = "deployments",
+    days: int = 1,
+    compute_abundance: bool = True,
+    pivot: bool = False,
+    occasions: Union[str, list, tuple, np.ndarray, pd.DatetimeIndex] = None,
+    add_effort: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes the detection history (in terms of abundance or presence) by
+    taxon and deployment, grouping observations into specific days-long
+    intervals or into custom occasions.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    date_range : str
+        Table to compute the date range from. Possible values are:
+
+            - 'deployments'
+            - 'images'
+
+        Ignored if occasions is a sequence of boundaries.
+    days : int
+        Days interval to group observations into. Ignored if occasions
+        is passed.
+    compute_abundance : bool
+        Whether to compute the abundance for each interval. If False,
+        returns presence/absence for the intervals.
+    pivot : bool
+        Whether to pivot (reshape from long to wide format) the resulting
+        DataFrame.
+    occasions : str or array-like
+        Occasions to group observations into. Can be one of:
+
+            - a frequency alias (e.g. 'W' or 'M') to use calendar
+            periods (e.g. weeks or months) within the date range
+            - a sorted sequence of dates with the boundaries of the
+            occasions, where each occasion spans from one boundary
+            (inclusive) to the next (exclusive)
+
+        If None, days-long intervals starting at the beginning of the
+        date range are used.
+    add_effort : bool
+        Whether to add an effort column with the fraction of days of each
+        occasion the deployment was active. Cannot be used if pivot is
+        True.
+
+    Returns
+    -------
+    DataFrame
+        Detection history.
+
+    """
+    if add_effort and pivot:
+        raise ValueError("add_effort cannot be used if pivot is True.")
+
+    cube = _compute_detection_cube(images, deployments, date_range, days, occasions)
+
+    # The dense (taxon, deployment, occasion) array is already in the
+    # order of the result, so the long format is built by flattening it.
+    values = _get_detection_array(cube, compute_abundance).ravel()
+    if not np.isnan(values).any():
+        values = values.astype(int)
+
+    n_taxa, n_sites, n_occasions = cube["shape"]
+    result = pd.DataFrame(
+        {
+            "taxon": np.repeat(cube["taxa"], n_sites * n_occasions),
+            _labels.images.deployment_id: np.tile(
+                np.repeat(cube["sites"], n_occasions), n_taxa
+            ),
+            _labels.images.date: np.tile(cube["edges"][:-1], n_taxa * n_sites),
+            "value": values,
+        }
+    )
+    if add_effort:
+        result["effort"] = np.tile(cube["effort"].ravel(), n_taxa)
+
+    if pivot:
+        result[_labels.images.date] = result[_labels.images.date].astype(str)
+        result = result.pivot(
+            index=["taxon", _labels.images.deployment_id],
+            columns=_labels.images.date,
+            values="value",
+        )
+        result = result.rename_axis(None, axis=1).reset_index()
+
+    return result
+
+
+def compute_diversity_curves(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame = None,
+    groupby: str = "deployment",
+    q_values: Union[int, list, tuple, np.ndarray] = (0, 1, 2),
+    sizes: Union[list, tuple, np.ndarray] = None,
+    knots: int = 40,
+    endpoint: int = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Computes sample-size-based rarefaction and extrapolation curves of
+    Hill numbers of order q by site using the analytic estimators from
+    Chao et al. (2014), as implemented in the iNEXT R package.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments. Must be passed only if
+        groupby is 'location', 'camera' or a deployments column.
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
+    q_values : int, list, tuple or array
+        Value(s) of q to compute curves for. Must be a subset of
+        [0, 1, 2].
+    sizes : list, tuple or array
+        Sample sizes (i.e. number of individuals) to evaluate the curves
+        at. If None, knots evenly spaced sample sizes between 1 and
+        endpoint (plus the observed sample size) are used for each site.
+    knots : int
+        Number of sample sizes to evaluate the curves at. Only has
+        effect if sizes is None.
+    endpoint : int
+        Largest sample size to evaluate the curves at. If None, it is
+        twice the observed sample size of each site. Only has effect if
+        sizes is None.
+    n_jobs : int
+        Number of processes used to compute the curves of different
+        sites in parallel. If -1, all available processors are used.
+
+    Returns
+    -------
+    DataFrame
+        Rarefaction and extrapolation curves by site, with the sample
+        size (m), the method used to estimate each value ('interpolated',
+        'observed' or 'extrapolated') and the estimated diversity (D).
+
+    """
+    images = images.copy()
+
+    if isinstance(q_values, int):
+        q_values = [q_values]
+    q_values = list(q_values)
+    if not set(q_values).issubset({0, 1, 2}):
+        raise ValueError("q_values must be a subset of [0, 1, 2].")
+
+    if sizes is not None and np.any(np.asarray(sizes) <= 0):
+        raise ValueError("sizes must be positive.")
+    if endpoint is not None and endpoint <= 0:
+        raise ValueError("endpoint must be positive.")
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    images, groupby_label = _process_groupby_arg(images, deployments, groupby)
+    images["taxon"] = get_lowest_taxon(images, return_rank=False)
+    abundance = images.groupby([groupby_label, "taxon"])[_labels.images.objects].sum()
 
-    if not compute_abundance:
-        has_observations = result["value"] > 0
-        result.loc[has_observations, "value"] = 1
+    sites = []
+    arguments = []
+    for site, group in abundance.groupby(level=0):
+        x = group.to_numpy().astype(int)
+        n = x.sum()
+        if n == 0:
+            continue
+        if sizes is None:
+            site_endpoint = 2 * n if endpoint is None else endpoint
+            site_sizes = np.linspace(1, site_endpoint, knots).round().astype(int)
+            site_sizes = np.unique(np.append(site_sizes, n))
+        else:
+            site_sizes = np.unique(np.asarray(sizes, dtype=int))
+        sites.append((site, n, site_sizes))
+        arguments.append((x, q_values, site_sizes))
 
-    result = result.sort_values(["taxon", groupby_label], ignore_index=True)
+    if n_jobs == 1:
+        curves = [_compute_diversity_curve(*args) for args in arguments]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            curves = list(executor.map(_compute_diversity_curve, *zip(*arguments)))
 
-    if pivot:
-        result = result.pivot(index="taxon", columns=groupby_label, values="value")
-        result = result.rename_axis(None, axis=1).reset_index()
+    result = []
+    for (site, n, site_sizes), curve in zip(sites, curves):
+        method = np.where(
+            site_sizes < n,
+            "interpolated",
+            np.where(site_sizes == n, "observed", "extrapolated"),
+        )
+        for i, q in enumerate(q_values):
+            temp = pd.DataFrame(
+                {
+                    groupby_label: site,
+                    "q": q,
+                    "m": site_sizes,
+                    "method": method,
+                    "D": curve[i],
+                }
+            )
+            result.append(temp)
+
+    if not result:
+        return pd.DataFrame(columns=[groupby_label, "q", "m", "method", "D"])
+
+    result = pd.concat(result, ignore_index=True)
 
     return result
 
 
-def compute_detection_history(
-    images: pd.DataFrame,
+def compute_effort(
     deployments: pd.DataFrame,
-    date_range: str = "deployments",
-    days: int = 1,
-    compute_abundance: bool = True,
+    groupby: str = "deployment",
+    freq: str = None,
+    malfunctions: pd.DataFrame = None,
     pivot: bool = False,
 ) -> pd.DataFrame:
     """
-    Computes the detection history (in terms of abundance or presence) by
-    taxon and deployment, grouping observations into specific days-long
-    intervals.
+    Computes the sampling effort (i.e. number of days each camera was
+    active, also known as trap-nights) by deployment and, optionally, by
+    time period. Both the start and end dates of each deployment are
+    considered active days.
 
     Parameters
     ----------
-    images : DataFrame
-        DataFrame with the project's images.
     deployments : DataFrame
         DataFrame with the project's deployments.
-    date_range : str
-        Table to compute the date range from. Possible values are:
+    groupby : str
+        Level to group results by. Can be one of:
 
-            - 'deployments'
-            - 'images'
-    days : int
-        Days interval to group observations into.
-    compute_abundance : bool
-        Whether to compute the abundance for each interval. If False,
-        returns presence/absence for the intervals.
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - the name of any other column in deployments to group by
+            its values
+    freq : str
+        Pandas period alias (e.g. 'M' for months or 'W' for weeks) to
+        split the effort into time periods. If None, the effort is
+        computed for the whole duration of the deployments.
+    malfunctions : DataFrame
+        DataFrame with the periods where cameras were not functioning.
+        Must have deployment_id, start_date and end_date columns. These
+        periods are subtracted from the effort.
     pivot : bool
         Whether to pivot (reshape from long to wide format) the resulting
-        DataFrame.
+        DataFrame. Only has effect if freq is not None.
 
     Returns
     -------
     DataFrame
-        Detection history.
+        Sampling effort (in days) by deployment.
 
     """
-    images = images.copy()
-    deployments = deployments.copy()
-
-    images = remove_unidentified(images, rank="class", reset_index=True)
+    effort = _compute_group_effort(deployments, groupby, freq, malfunctions)
+    groupby_label = effort["groupby_label"]
 
-    images[_labels.images.date] = pd.to_datetime(images[_labels.images.date])
-    images[_labels.images.date] = pd.to_datetime(images[_labels.images.date].dt.date)
-    deployments[_labels.deployments.start] = pd.to_datetime(
-        deployments[_labels.deployments.start]
-    )
-    deployments[_labels.deployments.end] = pd.to_datetime(
-        deployments[_labels.deployments.end]
-    )
-    if date_range == "deployments":
-        start = deployments[_labels.deployments.start].min()
-        end = deployments[_labels.deployments.end].max()
-    elif date_range == "images":
-        start = images[_labels.images.date].min()
-        end = images[_labels.images.date].max()
+    if effort["periods"] is None:
+        result = pd.DataFrame(
+            {groupby_label: effort["groups"], "effort": effort["effort"][:, 0]}
+        )
     else:
-        raise ValueError("date_range must be one of ['deployments', 'images'].")
-
-    images["taxon"] = get_lowest_taxon(images, return_rank=False)
-    freq = pd.Timedelta(days=days)
-    groupers = [
-        pd.Grouper(key="taxon"),
-        pd.Grouper(key=_labels.images.deployment_id),
-        pd.Grouper(key=_labels.images.date, freq=freq, origin=start),
-    ]
-    result = images.groupby(groupers)[_labels.images.objects].sum()
-
-    # A new index with all the combinations of species, sites and dates
-    # is created to reindex the result and to assign zeros where there
-    # were no observations.
-    species = images["taxon"].unique()
-    sites = images[_labels.images.deployment_id].unique()
-    dates = pd.date_range(start, end, freq=freq)
-    idx = pd.MultiIndex.from_product(
-        [species, sites, dates],
-        names=["taxon", _labels.images.deployment_id, _labels.images.date],
-    )
-    result = result.reindex(idx, fill_value=0)
-    result.name = "value"
-    result = result.reset_index()
-
-    if not compute_abundance:
-        has_observations = result["value"] > 0
-        result.loc[has_observations, "value"] = 1
-
-    # Groups (i.e. days intervals) where the corresponding camera was not
-    # deployed at the time are assigned NaNs.
-    result = pd.merge(
-        result,
-        deployments[
-            [
-                _labels.images.deployment_id,
-                _labels.deployments.start,
-                _labels.deployments.end,
-            ]
-        ],
-        on=_labels.images.deployment_id,
-        how="left",
-    )
-    group_start = result[_labels.images.date]
-    group_end = result[_labels.images.date] + pd.Timedelta(days=days - 1)
-    inside_range_left = group_start.between(
-        result[_labels.deployments.start], result[_labels.deployments.end]
-    )
-    inside_range_right = group_end.between(
-        result[_labels.deployments.start], result[_labels.deployments.end]
-    )
-    inside_range = inside_range_left | inside_range_right
-    result.loc[~inside_range, "value"] = np.nan
-    result = result.drop(columns=[_labels.deployments.start, _labels.deployments.end])
-
-    result = result.sort_values(
-        ["taxon", _labels.images.deployment_id, _labels.images.date], ignore_index=True
-    )
-
-    if pivot:
-        result[_labels.images.date] = result[_labels.images.date].astype(str)
-        result = result.pivot(
-            index=["taxon", _labels.images.deployment_id],
-            columns=_labels.images.date,
-            values="value",
+        index = pd.MultiIndex.from_product(
+            [effort["groups"], effort["periods"]], names=[groupby_label, "period"]
         )
-        result = result.rename_axis(None, axis=1).reset_index()
+        result = pd.DataFrame({"effort": effort["effort"].ravel()}, index=index)
+        result = result.reset_index()
+        if pivot:
+            result["period"] = result["period"].astype(str)
+            result = result.pivot(
+                index=groupby_label, columns="period", values="effort"
+            )
+            result = result.rename_axis(None, axis=1).reset_index()
 
     return result
 
@@ -345,12 +1621,18 @@ def compute_general_count(
         DataFrame with the project's images.
     deployments : DataFrame
         DataFrame with the project's deployments. Must be passed only if
-        groupby is 'location'.
+        groupby is 'location', 'camera' or a deployments column.
     groupby : str
         Level to group results by. Can be one of:
 
             - 'deployment' to group by deployment (deployment_id)
             - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
     add_taxonomy : bool
         Whether to add the superior taxonomy of the species to the result.
     rank : str
@@ -409,12 +1691,18 @@ def compute_hill_numbers(
         DataFrame with the project's images.
     deployments : DataFrame
         DataFrame with the project's deployments. Must be passed only if
-        groupby is 'location'.
+        groupby is 'location', 'camera' or a deployments column.
     groupby : str
         Level to group results by. Can be one of:
 
             - 'deployment' to group by deployment (deployment_id)
             - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - 'year', 'month', 'week' or 'day' to group by the period
+            of the images' timestamp
+            - the name of any other column in deployments to group by
+            its values
     q_values : int, list, tuple or array
         Value(s) of q to compute Hill numbers for.
     pivot : bool
@@ -455,3 +1743,840 @@ def compute_hill_numbers(
         result = result.rename_axis(None, axis=1).reset_index()
 
     return result
+
+
+def compute_naive_occupancy(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    date_range: str = "deployments",
+    days: int = 1,
+    occasions: Union[str, list, tuple, np.ndarray, pd.DatetimeIndex] = None,
+    by_occasion: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes the naive occupancy (i.e. proportion of deployments where
+    the taxon was detected at least once) and the naive detection rate
+    of each taxon. Only deployments and occasions with sampling effort
+    are taken into account.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    date_range : str
+        Table to compute the date range from. Possible values are:
+
+            - 'deployments'
+            - 'images'
+
+        Ignored if occasions is a sequence of boundaries.
+    days : int
+        Days interval to group observations into. Ignored if occasions
+        is passed.
+    occasions : str or array-like
+        Occasions to group observations into. See
+        wiutils.compute_detection_history.
+    by_occasion : bool
+        Whether to compute the naive detection rate (i.e. proportion of
+        active deployments where the taxon was detected) for each
+        occasion instead of the metrics for the whole date range.
+
+    Returns
+    -------
+    DataFrame
+        Number of active deployments (sites), deployments with at least
+        one detection (occupied) and naive occupancy, together with the
+        number of active occasions at the occupied deployments
+        (occasions), occasions with detections (detections) and naive
+        detection rate for each taxon. If by_occasion is True, number of
+        active deployments (sites), deployments with detections
+        (detections) and naive detection rate for each taxon and
+        occasion.
+
+    """
+    cube = _compute_detection_cube(
+        images, deployments, date_range, days, occasions, all_deployments=True
+    )
+    n_taxa, n_sites, n_occasions = cube["shape"]
+    active = cube["effort"] > 0
+    taxon_codes, site_codes, occasion_codes = cube["index"]
+    keep = active[site_codes, occasion_codes]
+    taxon_codes = taxon_codes[keep]
+    site_codes = site_codes[keep]
+    occasion_codes = occasion_codes[keep]
+
+    # Cells are unique (taxon, deployment, occasion) triples, so every
+    # metric is a count over the cells (or over their unique taxon and
+    # deployment pairs) with the effort mask already applied.
+    if by_occasion:
+        sites = active.sum(axis=0)
+        detections = np.bincount(
+            taxon_codes * n_occasions + occasion_codes,
+            minlength=n_taxa * n_occasions,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = detections / np.tile(sites, n_taxa)
+        result = pd.DataFrame(
+            {
+                "taxon": np.repeat(cube["taxa"], n_occasions),
+                _labels.images.date: np.tile(cube["edges"][:-1], n_taxa),
+                "sites": np.tile(sites, n_taxa),
+                "detections": detections,
+                "naive_detection": rate,
+            }
+        )
+        return result
+
+    pairs = np.unique(taxon_codes.astype(np.int64) * n_sites + site_codes)
+    pair_taxa, pair_sites = np.divmod(pairs, n_sites)
+    occupied = np.bincount(pair_taxa, minlength=n_taxa)
+    active_occasions = np.bincount(
+        pair_taxa, weights=active.sum(axis=1)[pair_sites], minlength=n_taxa
+    ).astype(int)
+    detections = np.bincount(taxon_codes, minlength=n_taxa)
+    n_active = int(active.any(axis=1).sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = pd.DataFrame(
+            {
+                "taxon": cube["taxa"],
+                "sites": n_active,
+                "occupied": occupied,
+                "naive_occupancy": occupied / n_active,
+                "occasions": active_occasions,
+                "detections": detections,
+                "naive_detection": detections / active_occasions,
+            }
+        )
+
+    return result
+
+
+def compute_rai(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    groupby: str = "deployment",
+    freq: str = None,
+    compute_abundance: bool = False,
+    malfunctions: pd.DataFrame = None,
+    remove_duplicates_kws: dict = None,
+) -> pd.DataFrame:
+    """
+    Computes the relative abundance index (RAI) of each taxon by
+    deployment and, optionally, by time period. The RAI is computed as
+    the number of independent records (i.e. records after duplicate
+    removal) per 100 days of sampling effort (trap-nights).
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - the name of any other column in deployments to group by
+            its values
+    freq : str
+        Pandas period alias (e.g. 'M' for months or 'W' for weeks) to
+        split records and effort into time periods. If None, the RAI is
+        computed for the whole duration of the deployments.
+    compute_abundance : bool
+        Whether to use the number of individuals (i.e. the sum of the
+        number of objects) instead of the number of independent records.
+    malfunctions : DataFrame
+        DataFrame with the periods where cameras were not functioning.
+        Must have deployment_id, start_date and end_date columns. These
+        periods are subtracted from the effort.
+    remove_duplicates_kws : dict
+        Keyword arguments for the wiutils.remove_duplicates function.
+
+    Returns
+    -------
+    DataFrame
+        Records, effort (in days) and RAI by taxon and deployment. Only
+        combinations with at least one record are included. Images taken
+        on days where the camera was not active are ignored.
+
+    """
+    counts = _compute_period_records(
+        images,
+        deployments,
+        groupby,
+        freq,
+        compute_abundance,
+        True,
+        malfunctions,
+        remove_duplicates_kws,
+    )
+    groupby_label = counts["groupby_label"]
+    group_effort = counts["effort"][counts["group_codes"], counts["period_codes"]]
+
+    result = pd.DataFrame(
+        {
+            "taxon": counts["taxa"].take(counts["taxon_codes"]),
+            groupby_label: counts["groups"].take(counts["group_codes"]),
+        }
+    )
+    if freq is not None:
+        result["period"] = counts["periods"].take(counts["period_codes"])
+    result["records"] = counts["records"].astype(int)
+    result["effort"] = group_effort
+    result["rai"] = counts["records"] / group_effort * 100
+
+    return result
+
+
+def compute_time_series(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame = None,
+    groupby: str = "deployment",
+    freq: str = "M",
+    compute_abundance: bool = False,
+    normalize: bool = False,
+    malfunctions: pd.DataFrame = None,
+    dense: bool = False,
+    remove_duplicates_kws: dict = None,
+) -> Union[pd.DataFrame, tuple]:
+    """
+    Computes the number of independent records (i.e. records after
+    duplicate removal) of each taxon by deployment and time period.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments. Must be passed if
+        normalize is True or if groupby is 'location', 'camera' or a
+        deployments column.
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - the name of any other column in deployments to group by
+            its values
+    freq : str
+        Pandas period alias (e.g. 'M' for months, 'W' for weeks or 'Y'
+        for years) of the time periods.
+    compute_abundance : bool
+        Whether to use the number of individuals (i.e. the sum of the
+        number of objects) instead of the number of independent records.
+    normalize : bool
+        Whether to add the sampling effort (in days) of each group and
+        period and the number of records per 100 days of effort (RAI).
+        If True, images taken on days where the camera was not active
+        are ignored.
+    malfunctions : DataFrame
+        DataFrame with the periods where cameras were not functioning.
+        Must have deployment_id, start_date and end_date columns. These
+        periods are subtracted from the effort. Only has effect if
+        normalize is True.
+    dense : bool
+        Whether to return a dense array instead of a long-format
+        DataFrame.
+    remove_duplicates_kws : dict
+        Keyword arguments for the wiutils.remove_duplicates function.
+
+    Returns
+    -------
+    DataFrame
+        Records (and effort and RAI if normalize is True) by taxon, group
+        and period. Only combinations with at least one record are
+        included. Returned if dense is False.
+    ndarray
+        Array with shape (taxa, groups, periods) with the records (or the
+        RAI if normalize is True, where combinations without effort are
+        NaN).
+        Returned if dense is True.
+    Index
+        Taxa for the first axis of the array. Returned if dense is True.
+    Index
+        Groups for the second axis of the array. Returned if dense is
+        True.
+    PeriodIndex
+        Periods for the third axis of the array. Returned if dense is
+        True.
+
+    """
+    if freq is None:
+        raise ValueError("freq must be a pandas period alias.")
+    if normalize and deployments is None:
+        raise ValueError("deployments must be passed if normalize is True.")
+
+    counts = _compute_period_records(
+        images,
+        deployments,
+        groupby,
+        freq,
+        compute_abundance,
+        normalize,
+        malfunctions,
+        remove_duplicates_kws,
+    )
+    groupby_label = counts["groupby_label"]
+    taxon_codes = counts["taxon_codes"]
+    group_codes = counts["group_codes"]
+    period_codes = counts["period_codes"]
+
+    if dense:
+        shape = (len(counts["taxa"]), len(counts["groups"]), len(counts["periods"]))
+        values = np.zeros(shape)
+        values[taxon_codes, group_codes, period_codes] = counts["records"]
+        if normalize:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = values / counts["effort"] * 100
+            values[:, counts["effort"] == 0] = np.nan
+        return values, counts["taxa"], counts["groups"], counts["periods"]
+
+    result = pd.DataFrame(
+        {
+            "taxon": counts["taxa"].take(taxon_codes),
+            groupby_label: counts["groups"].take(group_codes),
+            "period": counts["periods"].take(period_codes),
+            "records": counts["records"].astype(int),
+        }
+    )
+    if normalize:
+        group_effort = counts["effort"][group_codes, period_codes]
+        result["effort"] = group_effort
+        result["rai"] = counts["records"] / group_effort * 100
+
+    return result
+
+
+def write_occupancy_data(
+    images: pd.DataFrame,
+    deployments: pd.DataFrame,
+    path: Union[str, pathlib.Path],
+    cameras: pd.DataFrame = None,
+    date_range: str = "deployments",
+    days: int = 1,
+    occasions: Union[str, list, tuple, np.ndarray, pd.DatetimeIndex] = None,
+    compute_abundance: bool = False,
+    site_covariates: list = None,
+    file_format: str = "npz",
+) -> None:
+    """
+    Writes the detection histories of all taxa, together with the site
+    and observation covariates, to files ready to fit occupancy models.
+
+    The following files are written to the output directory:
+
+        - detections: detection array with shape (taxa, deployments,
+        occasions). Occasions where the deployment was not active are
+        NaN.
+        - site_covariates: deployments (and cameras) information for
+        each deployment.
+        - observation_covariates: fraction of days of each occasion
+        the deployment was active, with shape (deployments, occasions).
+        - manifest.json: description of the files, including the taxa,
+        deployments and occasion boundaries along each dimension.
+
+    Parameters
+    ----------
+    images : DataFrame
+        DataFrame with the project's images.
+    deployments : DataFrame
+        DataFrame with the project's deployments.
+    path : str or Path
+        Path of the output directory. It is created if it does not
+        exist.
+    cameras : DataFrame
+        DataFrame with the project's cameras. If passed, its columns are
+        added to the site covariates.
+    date_range : str
+        Table to compute the date range from. Possible values are:
+
+            - 'deployments'
+            - 'images'
+
+        Ignored if occasions is a sequence of boundaries.
+    days : int
+        Days interval to group observations into. Ignored if occasions
+        is passed.
+    occasions : str or array-like
+        Occasions to group observations into. See
+        wiutils.compute_detection_history.
+    compute_abundance : bool
+        Whether to compute the abundance for each occasion. If False,
+        computes presence/absence for the occasions.
+    site_covariates : list
+        Columns from deployments (or cameras) to write as site
+        covariates. If None, all the columns are written.
+    file_format : str
+        Format of the files. Possible values are:
+
+            - 'npz' to write NumPy arrays (one array per column for
+            the site covariates)
+            - 'parquet' to write Parquet tables in wide format
+
+    Returns
+    -------
+    None
+
+    """
+    if file_format not in ("npz", "parquet"):
+        raise ValueError("file_format must be one of ['npz', 'parquet'].")
+
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    cube = _compute_detection_cube(images, deployments, date_range, days, occasions)
+    detections = _get_detection_array(cube, compute_abundance)
+    covariates = _get_site_covariates(
+        deployments, cameras, cube["sites"], site_covariates
+    )
+    taxa = cube["taxa"].astype(str)
+    sites = cube["sites"].astype(str)
+    labels = cube["edges"][:-1].astype(str)
+
+    files = {
+        "detections": f"detections.{file_format}",
+        "site_covariates": f"site_covariates.{file_format}",
+        "observation_covariates": f"observation_covariates.{file_format}",
+    }
+    if file_format == "npz":
+        np.savez_compressed(
+            path.joinpath(files["detections"]),
+            y=detections,
+            taxa=taxa.to_numpy(str),
+            sites=sites.to_numpy(str),
+            occasions=labels.to_numpy(str),
+        )
+        np.savez_compressed(
+            path.joinpath(files["observation_covariates"]), effort=cube["effort"]
+        )
+        # Missing strings are written as empty strings so every array has
+        # a fixed-width dtype and can be loaded without pickle.
+        arrays = {}
+        for column, values in covariates.items():
+            if values.dtype == object:
+                arrays[column] = values.fillna("").to_numpy(str)
+            else:
+                arrays[column] = values.to_numpy()
+        np.savez_compressed(path.joinpath(files["site_covariates"]), **arrays)
+    else:
+        n_taxa, n_sites, n_occasions = cube["shape"]
+        table = pd.DataFrame(
+            detections.reshape(n_taxa * n_sites, n_occasions), columns=labels
+        )
+        table.insert(0, "taxon", np.repeat(taxa, n_sites))
+        table.insert(1, _labels.images.deployment_id, np.tile(sites, n_taxa))
+        table.to_parquet(path.joinpath(files["detections"]), index=False)
+        table = pd.DataFrame(cube["effort"], columns=labels)
+        table.insert(0, _labels.images.deployment_id, sites)
+        table.to_parquet(path.joinpath(files["observation_covariates"]), index=False)
+        covariates.to_parquet(path.joinpath(files["site_covariates"]), index=False)
+
+    manifest = {
+        "format": file_format,
+        "files": files,
+        "shape": {
+            "taxa": cube["shape"][0],
+            "deployments": cube["shape"][1],
+            "occasions": cube["shape"][2],
+        },
+        "taxa": taxa.tolist(),
+        "deployments": sites.tolist(),
+        "occasions": cube["edges"].astype(str).tolist(),
+        "compute_abundance": compute_abundance,
+        "site_covariates": covariates.columns.tolist(),
+        "observation_covariates": ["effort"],
+    }
+    with open(path.joinpath("manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+
+class SummaryState:
+    """
+    Mergeable state with the counts needed to compute the
+    compute_count_summary, compute_detection and compute_general_count
+    summaries, which can be updated with new batches of images instead
+    of recomputing the summaries from scratch.
+
+    Duplicate removal (see wiutils.remove_duplicates) is carried across
+    batches by keeping the timestamp of the last image of each taxon in
+    each deployment, so the result of updating a state with consecutive
+    batches is the same as computing the summaries with all the images
+    at once. Thus, the images of each deployment must be added in
+    chronological order.
+
+    Parameters
+    ----------
+    groupby : str
+        Level to group results by. Can be one of:
+
+            - 'deployment' to group by deployment (deployment_id)
+            - 'location' to group by location (placename)
+            - 'project' to group by project (project_id)
+            - 'camera' to group by camera (camera_id)
+            - the name of any other column in deployments to group by
+            its values
+    rank : str
+        Taxonomic rank passed to the wiutils.remove_unidentified function
+        to compute the number of identified images and records.
+    interval : int
+        Time interval passed to the wiutils.remove_duplicates function.
+    unit : str
+        Time unit passed to the wiutils.remove_duplicates function.
+
+    """
+
+    _tables = {
+        "images": ["group", "total_images", "identified_images"],
+        "records": ["group", "class", "taxon", "records"],
+        "abundance": ["taxon", "group", "n"],
+        "taxonomy": ["taxon", *_utils.taxonomy.taxonomy_columns],
+        "last": [_labels.images.deployment_id, "taxon", _labels.images.date],
+    }
+
+    def __init__(
+        self,
+        groupby: str = "deployment",
+        rank: str = "class",
+        interval: int = 30,
+        unit: str = "minutes",
+    ):
+        if groupby in _period_levels:
+            raise ValueError("groupby cannot be a time period.")
+        self.groupby = groupby
+        self.rank = rank
+        self.interval = interval
+        self.unit = unit
+        self.groupby_label = None
+        for name, columns in self._tables.items():
+            setattr(self, f"_{name}", pd.DataFrame(columns=columns))
+
+    def update(
+        self, images: pd.DataFrame, deployments: pd.DataFrame = None
+    ) -> "SummaryState":
+        """
+        Updates the state with a new batch of images.
+
+        Parameters
+        ----------
+        images : DataFrame
+            DataFrame with the new images.
+        deployments : DataFrame
+            DataFrame with the project's deployments. Must be passed only
+            if groupby is 'location', 'camera' or a deployments column.
+
+        Returns
+        -------
+        SummaryState
+            The updated state.
+
+        """
+        images = images.reset_index(drop=True)
+        codes, groups, self.groupby_label = _get_group_codes(
+            images, deployments, self.groupby
+        )
+        images["__group"] = pd.Series(
+            pd.Categorical.from_codes(codes, categories=groups)
+        ).astype(groups.dtype)
+        images["__taxon"] = get_lowest_taxon(images, return_rank=False)
+        images[_labels.images.date] = pd.to_datetime(images[_labels.images.date])
+
+        counts = images.groupby("__group").size().rename("total_images")
+        identified = remove_unidentified(images, rank=self.rank)
+        counts = pd.concat(
+            [counts, identified.groupby("__group").size().rename("identified_images")],
+            axis=1,
+        )
+        counts = counts.fillna(0).rename_axis("group").reset_index()
+        self._images = self._combine(self._images, counts, ["group"])
+
+        # Consecutive images of the same taxon in the same deployment are
+        # compared with the last image from previous batches, so records
+        # that continue a previous burst are removed as duplicates.
+        identified = identified.dropna(subset=["__taxon"])
+        identified = identified.sort_values(
+            [_labels.images.deployment_id, "__taxon", _labels.images.date]
+        )
+        keys = [_labels.images.deployment_id, "__taxon"]
+        last = pd.merge(
+            identified[keys],
+            self._last.rename(columns={"taxon": "__taxon"}),
+            on=keys,
+            how="left",
+        )
+        last = pd.to_datetime(last[_labels.images.date]).set_axis(identified.index)
+        if (identified[_labels.images.date] < last).any():
+            raise ValueError(
+                "images must be newer than the images of previous updates for "
+                "each deployment."
+            )
+        delta = identified.groupby(keys)[_labels.images.date].diff()
+        delta = delta.fillna(identified[_labels.images.date] - last)
+        mask = (delta >= pd.Timedelta(**{self.unit: self.interval})) | delta.isna()
+        records = identified[mask].sort_index()
+
+        records = (
+            records.groupby(
+                ["__group", _labels.images.class_, "__taxon"], dropna=False, sort=False
+            )[_labels.images.objects]
+            .sum()
+            .rename("records")
+        )
+        records.index.names = ["group", "class", "taxon"]
+        self._records = self._combine(
+            self._records, records.reset_index(), ["group", "class", "taxon"]
+        )
+
+        last = identified.groupby(keys)[_labels.images.date].max().reset_index()
+        last = last.rename(columns={"__taxon": "taxon"})
+        self._last = pd.concat([self._last, last], ignore_index=True)
+        self._last = self._last.drop_duplicates(
+            [_labels.images.deployment_id, "taxon"], keep="last"
+        ).reset_index(drop=True)
+
+        abundance = images.groupby(["__taxon", "__group"])[_labels.images.objects]
+        abundance = abundance.sum().rename("n")
+        abundance.index.names = ["taxon", "group"]
+        self._abundance = self._combine(
+            self._abundance, abundance.reset_index(), ["taxon", "group"]
+        )
+
+        taxonomy = images.dropna(subset=["__taxon"]).drop_duplicates("__taxon")
+        taxonomy = taxonomy[["__taxon", *_utils.taxonomy.taxonomy_columns]]
+        taxonomy = taxonomy.rename(columns={"__taxon": "taxon"})
+        self._taxonomy = pd.concat([self._taxonomy, taxonomy], ignore_index=True)
+        self._taxonomy = self._taxonomy.drop_duplicates("taxon").reset_index(drop=True)
+
+        return self
+
+    def merge(self, other: "SummaryState") -> "SummaryState":
+        """
+        Merges the state with another state built from a different set
+        of deployments (e.g. states computed in parallel for different
+        partitions of a project).
+
+        Parameters
+        ----------
+        other : SummaryState
+            State to merge.
+
+        Returns
+        -------
+        SummaryState
+            New state with the counts of both states.
+
+        """
+        settings = ("groupby", "rank", "interval", "unit")
+        if any(getattr(self, name) != getattr(other, name) for name in settings):
+            raise ValueError(f"Both states must have the same {list(settings)}.")
+        shared = pd.merge(
+            self._last, other._last, on=[_labels.images.deployment_id, "taxon"]
+        )
+        if len(shared):
+            raise ValueError("Both states must be built from different deployments.")
+
+        result = SummaryState(self.groupby, self.rank, self.interval, self.unit)
+        result.groupby_label = self.groupby_label or other.groupby_label
+        result._images = self._combine(self._images, other._images, ["group"])
+        result._records = self._combine(
+            self._records, other._records, ["group", "class", "taxon"]
+        )
+        result._abundance = self._combine(
+            self._abundance, other._abundance, ["taxon", "group"]
+        )
+        result._taxonomy = pd.concat(
+            [self._taxonomy, other._taxonomy], ignore_index=True
+        ).drop_duplicates("taxon")
+        result._last = pd.concat([self._last, other._last], ignore_index=True)
+
+        return result
+
+    def to_json(self, path: Union[str, pathlib.Path]) -> None:
+        """
+        Writes the state to a JSON file.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the JSON file.
+
+        """
+        state = {
+            "groupby": self.groupby,
+            "rank": self.rank,
+            "interval": self.interval,
+            "unit": self.unit,
+            "groupby_label": self.groupby_label,
+            "tables": {},
+        }
+        for name in self._tables:
+            table = getattr(self, f"_{name}").copy()
+            if name == "last":
+                table[_labels.images.date] = table[_labels.images.date].astype(str)
+            state["tables"][name] = (
+                table.astype(object).where(table.notna(), None).values.tolist()
+            )
+        with open(path, "w") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def from_json(cls, path: Union[str, pathlib.Path]) -> "SummaryState":
+        """
+        Reads a state from a JSON file written with SummaryState.to_json.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the JSON file.
+
+        Returns
+        -------
+        SummaryState
+            State read from the file.
+
+        """
+        with open(path) as f:
+            state = json.load(f)
+        result = cls(state["groupby"], state["rank"], state["interval"], state["unit"])
+        result.groupby_label = state["groupby_label"]
+        for name, columns in cls._tables.items():
+            table = pd.DataFrame(state["tables"][name], columns=columns)
+            if name == "last":
+                table[_labels.images.date] = pd.to_datetime(table[_labels.images.date])
+            setattr(result, f"_{name}", table)
+
+        return result
+
+    def compute_count_summary(
+        self, add_records_by_class: bool = False, add_taxa_by_class: bool = False
+    ) -> pd.DataFrame:
+        """
+        Computes a summary of images, records and taxa count by
+        deployment. See wiutils.compute_count_summary.
+
+        Parameters
+        ----------
+        add_records_by_class : bool
+            Whether to add number of independent records by class.
+        add_taxa_by_class : bool
+            Whether to add number of unique taxa by class.
+
+        Returns
+        -------
+        DataFrame
+            Summary of images, records and species count by deployment.
+
+        """
+        result = self._images.set_index("group").sort_index()
+        records = self._records.groupby("group")["records"].sum()
+        result["records"] = records
+        by_class = self._records.dropna(subset=["class"])
+        classes = by_class["class"].unique()
+        if add_records_by_class:
+            counts = by_class.pivot_table(
+                index="group", columns="class", values="records", aggfunc="sum"
+            )
+            for class_ in classes:
+                result[f"records_{class_.lower()}"] = counts[class_]
+        result["taxa"] = self._records.groupby("group")["taxon"].nunique()
+        if add_taxa_by_class:
+            counts = by_class.pivot_table(
+                index="group", columns="class", values="taxon", aggfunc="nunique"
+            )
+            for class_ in classes:
+                result[f"taxa_{class_.lower()}"] = counts[class_]
+
+        result = result.fillna(0).astype(int)
+        result = result.rename_axis(self.groupby_label).reset_index()
+
+        return result
+
+    def compute_detection(
+        self, compute_abundance: bool = True, pivot: bool = False
+    ) -> pd.DataFrame:
+        """
+        Computes the detection (in terms of abundance or presence) of
+        each taxon by deployment. See wiutils.compute_detection.
+
+        Parameters
+        ----------
+        compute_abundance : bool
+            Whether to compute the abundance for each deployment. If
+            False, returns presence/absence for the deployments.
+        pivot : bool
+            Whether to pivot (reshape from long to wide format) the
+            resulting DataFrame.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with the detection of each species by deployment.
+
+        """
+        result = self._abundance.pivot_table(
+            index="taxon", columns="group", values="n", aggfunc="sum", fill_value=0
+        )
+        result = result.rename_axis(self.groupby_label, axis=1).stack()
+        result = result.rename("value").astype(int).reset_index()
+
+        if not compute_abundance:
+            has_observations = result["value"] > 0
+            result.loc[has_observations, "value"] = 1
+
+        result = result.sort_values(["taxon", self.groupby_label], ignore_index=True)
+
+        if pivot:
+            result = result.pivot(
+                index="taxon", columns=self.groupby_label, values="value"
+            )
+            result = result.rename_axis(None, axis=1).reset_index()
+
+        return result
+
+    def compute_general_count(
+        self, add_taxonomy: bool = False, rank: str = "class"
+    ) -> pd.DataFrame:
+        """
+        Computes the general abundance and number of deployments for each
+        taxon. See wiutils.compute_general_count.
+
+        Parameters
+        ----------
+        add_taxonomy : bool
+            Whether to add the superior taxonomy of the species to the
+            result.
+        rank : str
+            Upper taxonomic rank to extract classification for.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with abundance and number of deployments by species.
+
+        """
+        abundance = self._abundance.astype({"n": int})
+        result = abundance.groupby("taxon").agg(
+            n=("n", "sum"), groups=("group", "nunique")
+        )
+        result = result.rename(columns={"groups": f"{self.groupby}s"})
+        result = result.reset_index()
+
+        if add_taxonomy:
+            taxonomy_columns = _utils.taxonomy.get_taxonomy_columns(rank)
+            taxonomy = self._taxonomy[["taxon", *taxonomy_columns]]
+            result = pd.merge(result, taxonomy, on="taxon", how="left")
+
+        return result
+
+    @staticmethod
+    def _combine(current: pd.DataFrame, new: pd.DataFrame, keys: list) -> pd.DataFrame:
+        table = pd.concat([current, new], ignore_index=True)
+        table = table.groupby(keys, dropna=False, sort=False).sum().reset_index()
+
+        return table